@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""Objects to map data types from asyncio code.
+
+The asyncio support is provided by a separate data type map, instead of by
+coroutines of DataTypeMap, since the coroutine syntax is not supported by
+all Python versions that dtfabric supports and since mapping in a process
+pool executor requires the YAML formatted data type definitions, to create
+the data type map in the worker processes.
+
+This module requires Python 3.7 or later and is not installed for earlier
+versions.
+"""
+
+import asyncio
+import collections
+import functools
+
+from concurrent import futures
+
+from dtfabric import errors
+from dtfabric import fabric
+from dtfabric import parallel
+from dtfabric import runtime
+
+
+# Data type maps per YAML definition and definition name, which are created
+# once per worker process when mapping in a process pool.
+_data_type_maps = {}
+
+
+def _GetDataTypeMap(yaml_definition, definition_name):
+  """Retrieves a data type map in a worker process.
+
+  Args:
+    yaml_definition (bytes): YAML formatted data type definitions.
+    definition_name (str): name of the data type definition.
+
+  Returns:
+    DataTypeMap: data type map.
+  """
+  lookup_key = (yaml_definition, definition_name)
+  data_type_map = _data_type_maps.get(lookup_key, None)
+  if data_type_map is None:
+    data_type_fabric = fabric.DataTypeFabric(yaml_definition=yaml_definition)
+    data_type_map = data_type_fabric.CreateDataTypeMap(definition_name)
+    _data_type_maps[lookup_key] = data_type_map
+
+  return data_type_map
+
+
+def _MapByteStreamInProcess(
+    yaml_definition, definition_name, byte_stream, byte_offset):
+  """Maps a data type on a byte stream in a worker process.
+
+  Args:
+    yaml_definition (bytes): YAML formatted data type definitions.
+    definition_name (str): name of the data type definition.
+    byte_stream (bytes): byte stream.
+    byte_offset (int): offset into the byte stream where to start.
+
+  Returns:
+    tuple[object, int]: decomposed mapped value and its byte size.
+  """
+  data_type_map = _GetDataTypeMap(yaml_definition, definition_name)
+
+  context = runtime.DataTypeMapContext()
+  value = data_type_map.MapByteStream(
+      byte_stream, byte_offset=byte_offset, context=context)
+
+  return parallel.DecomposeValue(data_type_map, value), context.byte_size
+
+
+def _MapRecords(data_type_map, byte_stream, decompose=False):
+  """Maps the complete records at the start of a byte stream.
+
+  Args:
+    data_type_map (DataTypeMap): data type map of the records.
+    byte_stream (bytes): byte stream.
+    decompose (Optional[bool]): True if the records should be decomposed
+        so that they can be pickled.
+
+  Returns:
+    tuple[list[object], int]: mapped records and the number of bytes they
+        consumed, where the remainder of the byte stream contains a partial
+        record.
+
+  Raises:
+    MappingError: if the byte size of a record cannot be determined.
+  """
+  fixed_byte_size = data_type_map.GetByteSize()
+
+  records = []
+  byte_offset = 0
+  byte_stream_size = len(byte_stream)
+
+  while byte_offset < byte_stream_size:
+    if fixed_byte_size and byte_offset + fixed_byte_size > byte_stream_size:
+      break
+
+    context = runtime.DataTypeMapContext()
+    try:
+      record = data_type_map.MapByteStream(
+          byte_stream, byte_offset=byte_offset, context=context)
+    except errors.MappingError:
+      # A fixed-size record that fits in the byte stream is corrupt, otherwise
+      # the remainder of the byte stream is assumed to contain a partial
+      # record, which is mapped after more data has been read.
+      if fixed_byte_size:
+        raise
+      break
+
+    byte_size = fixed_byte_size or context.byte_size
+    if not byte_size:
+      raise errors.MappingError(
+          u'Unable to determine byte size of record at offset: {0:d}'.format(
+              byte_offset))
+
+    if decompose:
+      record = parallel.DecomposeValue(data_type_map, record)
+
+    records.append(record)
+    byte_offset += byte_size
+
+  return records, byte_offset
+
+
+def _MapRecordsInProcess(yaml_definition, definition_name, byte_stream):
+  """Maps the complete records at the start of a byte stream in a process.
+
+  Args:
+    yaml_definition (bytes): YAML formatted data type definitions.
+    definition_name (str): name of the data type definition of the records.
+    byte_stream (bytes): byte stream.
+
+  Returns:
+    tuple[list[object], int]: decomposed mapped records and the number of
+        bytes they consumed.
+  """
+  data_type_map = _GetDataTypeMap(yaml_definition, definition_name)
+  return _MapRecords(data_type_map, byte_stream, decompose=True)
+
+
+class AsyncDataTypeMap(object):
+  """Data type map for asyncio code.
+
+  Mapping is done by an executor, so that mapping large composite data types
+  does not block the event loop. A thread pool executor maps directly on the
+  data type map. A process pool executor creates the data type map once per
+  worker process from the data type definitions and passes the mapped values
+  back decomposed into tuples, which are composed into structure values again
+  in the event loop.
+  """
+
+  _DEFAULT_READ_SIZE = 65536
+
+  # Maximum number of bytes of a single record, to bound the amount of data
+  # buffered when a corrupt record cannot be mapped.
+  _MAXIMUM_RECORD_SIZE = 64 * 1024 * 1024
+
+  def __init__(
+      self, yaml_definition, definition_name, executor=None,
+      maximum_number_of_pending_batches=2, read_size=None):
+    """Initializes a data type map for asyncio code.
+
+    Args:
+      yaml_definition (bytes): YAML formatted data type definitions.
+      definition_name (str): name of the data type definition.
+      executor (Optional[concurrent.futures.Executor]): executor to map in,
+          where None represents the default executor of the event loop.
+      maximum_number_of_pending_batches (Optional[int]): maximum number of
+          batches of records that are read and mapped ahead of the records
+          that have been consumed.
+      read_size (Optional[int]): number of bytes to read per batch of
+          records, where None represents the default.
+
+    Raises:
+      FormatError: if the data type map cannot be created.
+    """
+    data_type_fabric = fabric.DataTypeFabric(yaml_definition=yaml_definition)
+    data_type_map = data_type_fabric.CreateDataTypeMap(definition_name)
+    if not data_type_map:
+      raise errors.FormatError(
+          u'Unable to create data type map for definition: {0:s}'.format(
+              definition_name))
+
+    super(AsyncDataTypeMap, self).__init__()
+    self._data_type_map = data_type_map
+    self._definition_name = definition_name
+    self._executor = executor
+    self._maximum_number_of_pending_batches = max(
+        maximum_number_of_pending_batches, 1)
+    self._read_size = read_size or self._DEFAULT_READ_SIZE
+    self._use_processes = isinstance(executor, futures.ProcessPoolExecutor)
+    self._yaml_definition = yaml_definition
+
+  async def _ReadData(self, source, read_size):
+    """Reads data from a source.
+
+    Args:
+      source (asyncio.StreamReader|file): asyncio stream or file-like object.
+      read_size (int): maximum number of bytes to read.
+
+    Returns:
+      bytes: data, which is empty if the end of the source was reached.
+    """
+    if asyncio.iscoroutinefunction(source.read):
+      return await source.read(read_size)
+
+    # Reading a file-like object blocks, hence it is read by the default
+    # executor of the event loop.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, source.read, read_size)
+
+  def _SubmitBatch(self, byte_stream):
+    """Submits a batch of records to be mapped.
+
+    Args:
+      byte_stream (bytes): byte stream of the batch.
+
+    Returns:
+      asyncio.Future: future of the mapped records and the number of bytes
+          they consumed.
+    """
+    if self._use_processes:
+      function = functools.partial(
+          _MapRecordsInProcess, self._yaml_definition, self._definition_name,
+          byte_stream)
+    else:
+      function = functools.partial(
+          _MapRecords, self._data_type_map, byte_stream)
+
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(self._executor, function)
+
+  async def IterateRecords(self, source):
+    """Iterates over the consecutive records in a source.
+
+    Batches of records are read and mapped ahead of the records that are
+    consumed, up to the maximum number of pending batches, after which
+    reading waits for the records to be consumed.
+
+    Args:
+      source (asyncio.StreamReader|file): asyncio stream or file-like object.
+
+    Yields:
+      object: mapped value of a record.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the source.
+    """
+    fixed_byte_size = self._data_type_map.GetByteSize()
+    if fixed_byte_size:
+      # Batches of fixed-size records can be mapped independently.
+      read_size = max(self._read_size // fixed_byte_size, 1) * fixed_byte_size
+      maximum_number_of_pending_batches = (
+          self._maximum_number_of_pending_batches)
+    else:
+      # The offset of the first record of a batch of variable-size records
+      # is only known after the preceding batch has been mapped.
+      read_size = self._read_size
+      maximum_number_of_pending_batches = 1
+
+    pending_batches = collections.deque()
+
+    # The data that has not been submitted is kept as a list of chunks, which
+    # are only joined when a batch is submitted, so that the data is not
+    # copied for every read.
+    pending_chunks = []
+    pending_size = 0
+
+    # Minimum number of bytes of a batch of variable-size records, which is
+    # twice the size of the partial record that remained of the preceding
+    # batch, so that a large record is not mapped again for every read.
+    minimum_batch_size = 0
+
+    end_of_source = False
+
+    while True:
+      while (not end_of_source and
+             len(pending_batches) < maximum_number_of_pending_batches):
+        data = await self._ReadData(source, read_size)
+        if data:
+          pending_chunks.append(data)
+          pending_size += len(data)
+        else:
+          end_of_source = True
+
+        if fixed_byte_size:
+          batch_size = pending_size - (pending_size % fixed_byte_size)
+        elif end_of_source or pending_size >= minimum_batch_size:
+          batch_size = pending_size
+        else:
+          batch_size = 0
+
+        if batch_size:
+          byte_stream = b''.join(pending_chunks)
+          if batch_size < pending_size:
+            pending_chunks = [byte_stream[batch_size:]]
+            byte_stream = byte_stream[:batch_size]
+          else:
+            pending_chunks = []
+
+          pending_size -= batch_size
+          pending_batches.append((self._SubmitBatch(byte_stream), byte_stream))
+
+      # Reading only stops without pending batches at the end of the source.
+      if not pending_batches:
+        if pending_size:
+          raise errors.MappingError(
+              u'Unable to map partial record of size: {0:d}'.format(
+                  pending_size))
+        break
+
+      batch, byte_stream = pending_batches.popleft()
+      records, byte_size = await batch
+
+      if not fixed_byte_size:
+        # The preceding batch contained all data that was read, hence there
+        # are no other pending chunks.
+        remaining_data = byte_stream[byte_size:]
+        if len(remaining_data) > self._MAXIMUM_RECORD_SIZE:
+          raise errors.MappingError(
+              u'Unable to map record within maximum size: {0:d}'.format(
+                  self._MAXIMUM_RECORD_SIZE))
+
+        if remaining_data:
+          pending_chunks = [remaining_data]
+        pending_size = len(remaining_data)
+        minimum_batch_size = 2 * pending_size
+
+      for record in records:
+        if self._use_processes:
+          record = parallel.ComposeValue(self._data_type_map, record)
+        yield record
+
+  async def MapByteStream(self, byte_stream, byte_offset=0, context=None):
+    """Maps the data type on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      object: mapped value.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    loop = asyncio.get_running_loop()
+
+    if not self._use_processes:
+      function = functools.partial(
+          self._data_type_map.MapByteStream, byte_stream,
+          byte_offset=byte_offset, context=context)
+      return await loop.run_in_executor(self._executor, function)
+
+    function = functools.partial(
+        _MapByteStreamInProcess, self._yaml_definition, self._definition_name,
+        bytes(byte_stream), byte_offset)
+    value, byte_size = await loop.run_in_executor(self._executor, function)
+
+    if context:
+      context.byte_size = byte_size
+
+    return parallel.ComposeValue(self._data_type_map, value)
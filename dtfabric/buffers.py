@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Buffers to read the byte streams of data types from."""
+
+import mmap
+import os
+
+
+class MemoryMappedFileBuffer(object):
+  """Memory-mapped file buffer.
+
+  Maps a file read-only into memory and serves reads as views of the mapped
+  memory, without copying the data or reading it with separate system
+  calls. It provides the same ReadAt method as the read-ahead buffer.
+  """
+
+  def __init__(self, file_object):
+    """Initializes a memory-mapped file buffer.
+
+    Args:
+      file_object (file): file-like object that has a file descriptor.
+
+    Raises:
+      IOError: if the file cannot be memory-mapped.
+      OSError: if the file cannot be memory-mapped.
+    """
+    file_descriptor = file_object.fileno()
+    file_size = os.fstat(file_descriptor).st_size
+
+    if file_size == 0:
+      # An empty file cannot be memory-mapped.
+      memory_map = None
+      view = memoryview(b'')
+    else:
+      memory_map = mmap.mmap(file_descriptor, 0, access=mmap.ACCESS_READ)
+      try:
+        view = memoryview(memory_map)
+      except TypeError:
+        # Python 2 memory maps do not support memoryview, in which case the
+        # data is copied out of the memory map.
+        view = None
+
+    super(MemoryMappedFileBuffer, self).__init__()
+    self._memory_map = memory_map
+    self._size = file_size
+    self._view = view
+
+  def Close(self):
+    """Closes the memory-mapped file buffer.
+
+    Views returned by ReadAt must be released before the buffer is closed.
+
+    Raises:
+      BufferError: if views of the memory-mapped file are still referenced.
+    """
+    if self._view is not None:
+      # Note that memoryview.release is not supported by Python 2.
+      if hasattr(self._view, u'release'):
+        self._view.release()
+      self._view = None
+
+    if self._memory_map is not None:
+      self._memory_map.close()
+      self._memory_map = None
+
+  def GetSize(self):
+    """Retrieves the size of the memory-mapped file.
+
+    Returns:
+      int: size of the memory-mapped file in bytes.
+    """
+    return self._size
+
+  def ReadAt(self, byte_offset, byte_size):
+    """Reads data at a specific offset.
+
+    Args:
+      byte_offset (int): offset of the data relative to the start of the
+          file.
+      byte_size (int): number of bytes to read.
+
+    Returns:
+      memoryview: view of the data, which contains fewer than the requested
+          number of bytes if the end of the file was reached.
+
+    Raises:
+      ValueError: if the byte offset or size is invalid or the buffer was
+          closed.
+    """
+    if byte_offset < 0:
+      raise ValueError(u'Invalid byte offset: {0:d}'.format(byte_offset))
+
+    if byte_size < 0:
+      raise ValueError(u'Invalid byte size: {0:d}'.format(byte_size))
+
+    byte_offset = min(byte_offset, self._size)
+    end_offset = min(byte_offset + byte_size, self._size)
+
+    if self._view is not None:
+      return self._view[byte_offset:end_offset]
+
+    if self._memory_map is None:
+      raise ValueError(u'Memory-mapped file buffer closed.')
+
+    return memoryview(self._memory_map[byte_offset:end_offset])
+
+
+class ReadAheadBuffer(object):
+  """Read-ahead buffer.
+
+  Reads data from a file-like object in blocks of at least the read-ahead
+  size and serves the reads that fall within the buffered data from memory.
+
+  Any object that provides a ReadAt method with the same signature can be
+  used instead, to read the byte streams of data types from another source.
+  """
+
+  _DEFAULT_READ_AHEAD_SIZE = 4096
+
+  def __init__(self, file_object, read_ahead_size=None):
+    """Initializes a read-ahead buffer.
+
+    Args:
+      file_object (file): file-like object.
+      read_ahead_size (Optional[int]): minimum number of bytes to read from
+          the file-like object at once, where None represents the default.
+
+    Raises:
+      ValueError: if the read-ahead size is invalid.
+    """
+    if read_ahead_size is None:
+      read_ahead_size = self._DEFAULT_READ_AHEAD_SIZE
+
+    if read_ahead_size <= 0:
+      raise ValueError(u'Invalid read-ahead size: {0:d}'.format(
+          read_ahead_size))
+
+    super(ReadAheadBuffer, self).__init__()
+    self._buffer = memoryview(b'')
+    self._buffer_offset = 0
+    self._file_object = file_object
+    self._read_ahead_size = read_ahead_size
+
+  def ReadAt(self, byte_offset, byte_size):
+    """Reads data at a specific offset.
+
+    Args:
+      byte_offset (int): offset of the data relative to the start of the
+          file-like object.
+      byte_size (int): number of bytes to read.
+
+    Returns:
+      memoryview: data, which contains fewer than the requested number of
+          bytes if the end of the file-like object was reached.
+
+    Raises:
+      ValueError: if the byte offset or size is invalid.
+    """
+    if byte_offset < 0:
+      raise ValueError(u'Invalid byte offset: {0:d}'.format(byte_offset))
+
+    if byte_size < 0:
+      raise ValueError(u'Invalid byte size: {0:d}'.format(byte_size))
+
+    buffer_start_offset = byte_offset - self._buffer_offset
+    buffer_end_offset = buffer_start_offset + byte_size
+    if buffer_start_offset < 0 or buffer_end_offset > len(self._buffer):
+      read_size = max(byte_size, self._read_ahead_size)
+
+      self._file_object.seek(byte_offset, os.SEEK_SET)
+      self._buffer = memoryview(self._file_object.read(read_size))
+      self._buffer_offset = byte_offset
+
+      buffer_start_offset = 0
+      buffer_end_offset = byte_size
+
+    return self._buffer[buffer_start_offset:buffer_end_offset]
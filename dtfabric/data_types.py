@@ -567,6 +567,7 @@ class StructureDefinition(DataTypeDefinition):
     self._attribute_names = None
     self._byte_size = None
     self._format_string = None
+    self._member_offsets = None
     self.members = []
 
   def AddMemberDefinition(self, member_definition):
@@ -579,6 +580,7 @@ class StructureDefinition(DataTypeDefinition):
     self._attribute_names = None
     self._byte_size = None
     self._format_string = None
+    self._member_offsets = None
     self.members.append(member_definition)
 
   def GetAttributeNames(self):
@@ -612,6 +614,28 @@ class StructureDefinition(DataTypeDefinition):
 
     return self._byte_size
 
+  def GetMemberOffsets(self):
+    """Determines the offsets of the members relative to the structure.
+
+    Returns:
+      dict[str, int]: offsets per member name, which only contains the members
+          that are not preceded by a member with a variable size.
+    """
+    if self._member_offsets is None and self.members:
+      self._member_offsets = {}
+
+      member_offset = 0
+      for member_definition in self.members:
+        self._member_offsets[member_definition.name] = member_offset
+
+        byte_size = member_definition.GetByteSize()
+        if byte_size is None:
+          break
+
+        member_offset += byte_size
+
+    return self._member_offsets or {}
+
   def GetStructFormatString(self):
     """Retrieves the Python struct format string.
 
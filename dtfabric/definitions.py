@@ -14,6 +14,17 @@ BYTE_ORDERS = frozenset([
 FORMAT_SIGNED = u'signed'
 FORMAT_UNSIGNED = u'unsigned'
 
+SEQUENCE_RESULT_TYPE_ARRAY = u'array'
+SEQUENCE_RESULT_TYPE_BYTES = u'bytes'
+SEQUENCE_RESULT_TYPE_MEMORYVIEW = u'memoryview'
+SEQUENCE_RESULT_TYPE_TUPLE = u'tuple'
+
+SEQUENCE_RESULT_TYPES = frozenset([
+    SEQUENCE_RESULT_TYPE_ARRAY,
+    SEQUENCE_RESULT_TYPE_BYTES,
+    SEQUENCE_RESULT_TYPE_MEMORYVIEW,
+    SEQUENCE_RESULT_TYPE_TUPLE])
+
 TYPE_INDICATOR_BOOLEAN = u'boolean'
 TYPE_INDICATOR_CHARACTER = u'character'
 TYPE_INDICATOR_CONSTANT = u'constant'
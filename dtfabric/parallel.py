@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""Objects to map records in parallel."""
+
+import collections
+import multiprocessing
+import os
+
+try:
+  from concurrent import futures
+except ImportError:
+  futures = None
+
+from dtfabric import buffers
+from dtfabric import errors
+from dtfabric import fabric
+from dtfabric import runtime
+
+
+# State of a worker process, which is initialized by the first task that
+# the process runs.
+_worker_process_state = {}
+
+
+def ComposeValue(data_type_map, value):
+  """Composes a mapped value from a decomposed value.
+
+  Args:
+    data_type_map (DataTypeMap): data type map of the value.
+    value (object): decomposed value.
+
+  Returns:
+    object: mapped value.
+  """
+  if isinstance(data_type_map, runtime.StructureMap):
+    structure_values_class = data_type_map.GetStructureValuesClass()
+    return structure_values_class(*[
+        ComposeValue(member_data_type_map, member_value)
+        for member_data_type_map, member_value in zip(
+            data_type_map.GetMemberDataTypeMaps(), value)])
+
+  if isinstance(data_type_map, runtime.SequenceMap) and isinstance(
+      value, tuple):
+    element_data_type_map = data_type_map.GetElementDataTypeMap()
+    return tuple([
+        ComposeValue(element_data_type_map, element_value)
+        for element_value in value])
+
+  return value
+
+
+def DecomposeValue(data_type_map, value):
+  """Decomposes a mapped value into values that can be pickled.
+
+  Args:
+    data_type_map (DataTypeMap): data type map of the value.
+    value (object): mapped value.
+
+  Returns:
+    object: value where structure values are replaced by tuples of their
+        member values and memoryviews by bytes.
+  """
+  if isinstance(data_type_map, runtime.StructureMap):
+    return tuple([
+        DecomposeValue(member_data_type_map, getattr(value, name))
+        for name, member_data_type_map in zip(
+            data_type_map.GetAttributeNames(),
+            data_type_map.GetMemberDataTypeMaps())])
+
+  if isinstance(data_type_map, runtime.SequenceMap) and isinstance(
+      value, tuple):
+    element_data_type_map = data_type_map.GetElementDataTypeMap()
+    return tuple([
+        DecomposeValue(element_data_type_map, element_value)
+        for element_value in value])
+
+  if isinstance(value, memoryview):
+    return value.tobytes()
+
+  return value
+
+
+def _InitializeWorkerProcess(yaml_definition, definition_name, path):
+  """Initializes a worker process.
+
+  The data type fabric is created once per worker process and the file is
+  memory-mapped, hence shared with the other processes by the page cache.
+  The worker process is only initialized again if a task maps records of
+  another data type definition or file, in which case the previous file is
+  closed.
+
+  Args:
+    yaml_definition (bytes): YAML formatted data type definitions.
+    definition_name (str): name of the data type definition of the records.
+    path (str): path of the file to map the records on.
+  """
+  lookup_key = (yaml_definition, definition_name, path)
+  if _worker_process_state.get(u'lookup_key', None) == lookup_key:
+    return
+
+  memory_mapped_file_buffer = _worker_process_state.pop(
+      u'memory_mapped_file_buffer', None)
+  if memory_mapped_file_buffer:
+    memory_mapped_file_buffer.Close()
+
+  data_type_fabric = fabric.DataTypeFabric(yaml_definition=yaml_definition)
+
+  with open(path, 'rb') as file_object:
+    memory_mapped_file_buffer = buffers.MemoryMappedFileBuffer(file_object)
+
+  _worker_process_state[u'data_type_map'] = (
+      data_type_fabric.CreateDataTypeMap(definition_name))
+  _worker_process_state[u'lookup_key'] = lookup_key
+  _worker_process_state[u'memory_mapped_file_buffer'] = (
+      memory_mapped_file_buffer)
+
+
+def _MapRecords(yaml_definition, definition_name, path, byte_offset,
+                number_of_records, until_byte_offset, record_function):
+  """Maps a range of records in a worker process.
+
+  Args:
+    yaml_definition (bytes): YAML formatted data type definitions.
+    definition_name (str): name of the data type definition of the records.
+    path (str): path of the file to map the records on.
+    byte_offset (int): offset of the first record.
+    number_of_records (int): maximum number of records, where None represents
+        no maximum.
+    until_byte_offset (int): offset where the records end, where None
+        represents the end of the file.
+    record_function (function): function to apply to every record in the
+        worker process, where None represents decomposing the records.
+
+  Returns:
+    list[object]: results of the records.
+  """
+  # The worker process is initialized by its first task, since not every
+  # version of concurrent.futures supports process initializers.
+  _InitializeWorkerProcess(yaml_definition, definition_name, path)
+
+  data_type_map = _worker_process_state[u'data_type_map']
+  memory_mapped_file_buffer = _worker_process_state[
+      u'memory_mapped_file_buffer']
+
+  records = data_type_map.IterateRecords(
+      memory_mapped_file_buffer, byte_offset=byte_offset,
+      number_of_records=number_of_records,
+      until_byte_offset=until_byte_offset)
+
+  if record_function:
+    return [record_function(record) for record in records]
+
+  return [DecomposeValue(data_type_map, record) for record in records]
+
+
+class ParallelMapper(object):
+  """Maps records in parallel using a pool of worker processes.
+
+  Every worker process creates the data type fabric once from the data type
+  definitions and maps ranges of records from a memory-mapped file.
+
+  Records are passed from the worker processes by pickling them. Since the
+  structure values classes are created at run-time the records are
+  decomposed into tuples, which are composed into structure values again in
+  the parent process. Alternatively a record function can be applied to the
+  records in the worker processes, for example to extract only the values
+  of interest, of which the results are passed as-is.
+  """
+
+  _DEFAULT_NUMBER_OF_RECORDS_PER_TASK = 4096
+
+  def __init__(
+      self, yaml_definition, definition_name, maximum_number_of_processes=None,
+      number_of_records_per_task=None):
+    """Initializes a parallel mapper.
+
+    Args:
+      yaml_definition (bytes): YAML formatted data type definitions.
+      definition_name (str): name of the data type definition of the records.
+      maximum_number_of_processes (Optional[int]): maximum number of worker
+          processes, where None represents the number of processors.
+      number_of_records_per_task (Optional[int]): number of fixed-size records
+          a worker process maps at once, where None represents the default.
+
+    Raises:
+      FormatError: if the data type map cannot be created or there is no
+          support for concurrent.futures.
+    """
+    if not futures:
+      raise errors.FormatError(u'Missing concurrent.futures support')
+
+    data_type_fabric = fabric.DataTypeFabric(yaml_definition=yaml_definition)
+    data_type_map = data_type_fabric.CreateDataTypeMap(definition_name)
+    if not data_type_map:
+      raise errors.FormatError(
+          u'Unable to create data type map for definition: {0:s}'.format(
+              definition_name))
+
+    super(ParallelMapper, self).__init__()
+    self._data_type_map = data_type_map
+    self._definition_name = definition_name
+    self._maximum_number_of_processes = maximum_number_of_processes
+    self._number_of_records_per_task = (
+        number_of_records_per_task or self._DEFAULT_NUMBER_OF_RECORDS_PER_TASK)
+    self._yaml_definition = yaml_definition
+
+  def _MapRanges(self, path, ranges, ordered, record_function):
+    """Maps ranges of records in parallel.
+
+    Args:
+      path (str): path of the file to map the records on.
+      ranges (iterable[tuple[int, int, int]]): offset of the first record,
+          maximum number of records and end offset per range.
+      ordered (bool): True if the results should be yielded in the order of
+          the records.
+      record_function (function): function to apply to every record in the
+          worker processes.
+
+    Yields:
+      object: result of a record.
+
+    Raises:
+      MappingError: if the records cannot be mapped.
+    """
+    maximum_number_of_processes = (
+        self._maximum_number_of_processes or multiprocessing.cpu_count())
+
+    # Only a limited number of tasks is submitted at a time, so that results
+    # do not accumulate if they are consumed slower than they are produced.
+    maximum_number_of_pending_tasks = 2 * maximum_number_of_processes
+
+    executor = futures.ProcessPoolExecutor(
+        max_workers=maximum_number_of_processes)
+
+    ranges = iter(ranges)
+    pending_tasks = collections.deque()
+
+    try:
+      while True:
+        for range_arguments in ranges:
+          task = executor.submit(
+              _MapRecords, self._yaml_definition, self._definition_name, path,
+              *range_arguments, record_function=record_function)
+          pending_tasks.append(task)
+          if len(pending_tasks) >= maximum_number_of_pending_tasks:
+            break
+
+        if not pending_tasks:
+          break
+
+        if ordered:
+          completed_task = pending_tasks.popleft()
+        else:
+          completed_tasks, _ = futures.wait(
+              pending_tasks, return_when=futures.FIRST_COMPLETED)
+          completed_task = completed_tasks.pop()
+          pending_tasks.remove(completed_task)
+
+        try:
+          results = completed_task.result()
+        except errors.MappingError:
+          raise
+        except Exception as exception:
+          raise errors.MappingError(
+              u'Unable to map records with error: {0!s}'.format(exception))
+
+        for result in results:
+          if not record_function:
+            result = ComposeValue(self._data_type_map, result)
+          yield result
+
+    finally:
+      for task in pending_tasks:
+        task.cancel()
+      executor.shutdown(wait=True)
+
+  def MapChunks(self, path, chunks, ordered=True, record_function=None):
+    """Maps records from chunks of a file in parallel.
+
+    The records within a chunk are mapped consecutively, hence they can have
+    a variable size.
+
+    Args:
+      path (str): path of the file to map the records on.
+      chunks (iterable[tuple[int, int]]): offset and end offset per chunk.
+      ordered (Optional[bool]): True if the results should be yielded in the
+          order of the chunks and records, otherwise the results of a chunk
+          are yielded as soon as the chunk has been mapped.
+      record_function (Optional[function]): function to apply to every record
+          in the worker processes, which must be defined at the top level of
+          a module so that it can be pickled.
+
+    Yields:
+      object: mapped value of a record or the result of the record function.
+
+    Raises:
+      MappingError: if the records cannot be mapped.
+    """
+    ranges = (
+        (byte_offset, None, until_byte_offset)
+        for byte_offset, until_byte_offset in chunks)
+
+    for result in self._MapRanges(path, ranges, ordered, record_function):
+      yield result
+
+  def MapFile(
+      self, path, byte_offset=0, number_of_records=None,
+      until_byte_offset=None, ordered=True, record_function=None):
+    """Maps consecutive fixed-size records from a file in parallel.
+
+    Args:
+      path (str): path of the file to map the records on.
+      byte_offset (Optional[int]): offset of the first record.
+      number_of_records (Optional[int]): maximum number of records, where
+          None represents no maximum.
+      until_byte_offset (Optional[int]): offset where the records end, where
+          None represents the end of the file.
+      ordered (Optional[bool]): True if the results should be yielded in the
+          order of the records, otherwise results are yielded per task as
+          soon as the task has been completed.
+      record_function (Optional[function]): function to apply to every record
+          in the worker processes, which must be defined at the top level of
+          a module so that it can be pickled.
+
+    Yields:
+      object: mapped value of a record or the result of the record function.
+
+    Raises:
+      MappingError: if the records cannot be mapped or do not have a fixed
+          size.
+    """
+    record_byte_size = self._data_type_map.GetByteSize()
+    if not record_byte_size:
+      raise errors.MappingError((
+          u'Unable to map records of data type: {0:s} without fixed '
+          u'size').format(self._definition_name))
+
+    if until_byte_offset is None:
+      until_byte_offset = os.path.getsize(path)
+
+    maximum_number_of_records = max(
+        (until_byte_offset - byte_offset) // record_byte_size, 0)
+    if number_of_records is None or number_of_records > (
+        maximum_number_of_records):
+      number_of_records = maximum_number_of_records
+
+    task_byte_size = self._number_of_records_per_task * record_byte_size
+
+    ranges = (
+        (task_byte_offset, None, min(
+            task_byte_offset + task_byte_size,
+            byte_offset + number_of_records * record_byte_size))
+        for task_byte_offset in range(
+            byte_offset, byte_offset + number_of_records * record_byte_size,
+            task_byte_size))
+
+    for result in self._MapRanges(path, ranges, ordered, record_function):
+      yield result
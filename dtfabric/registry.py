@@ -10,6 +10,7 @@ class DataTypeDefinitionsRegistry(object):
     super(DataTypeDefinitionsRegistry, self).__init__()
     self._aliases = {}
     self._definitions = {}
+    self._modification_count = 0
 
   def DeregisterDefinition(self, data_type_definition):
     """Deregisters a data type definition.
@@ -29,6 +30,7 @@ class DataTypeDefinitionsRegistry(object):
           data_type_definition.name))
 
     del self._definitions[name]
+    self._modification_count += 1
 
   def GetDefinitionByName(self, name):
     """Retrieves a specific data type definition by name.
@@ -45,6 +47,18 @@ class DataTypeDefinitionsRegistry(object):
 
     return self._definitions.get(lookup_name, None)
 
+  def GetModificationCount(self):
+    """Retrieves the number of modifications of the registry.
+
+    The modification count changes every time a data type definition is
+    registered or deregistered, which allows for invalidation of objects
+    derived from the data type definitions, such as data type maps.
+
+    Returns:
+      int: number of modifications.
+    """
+    return self._modification_count
+
   def GetDefinitions(self):
     """Retrieves the data type definitions.
 
@@ -82,3 +96,5 @@ class DataTypeDefinitionsRegistry(object):
 
     for alias in data_type_definition.aliases:
       self._aliases[alias] = name_lower
+
+    self._modification_count += 1
@@ -7,11 +7,21 @@ except ImportError:
   import builtins
 
 import abc
+import array
+import ast
+import itertools
 import keyword
+import operator
 import struct
 import sys
 import uuid
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+from dtfabric import buffers
 from dtfabric import data_types
 from dtfabric import definitions
 from dtfabric import errors
@@ -19,26 +29,56 @@ from dtfabric import py2to3
 
 
 # TODO: add ConstantMap.
-# TODO: add EnumerationMap.
 # TODO: add FormatMap.
 # TODO: complete SequenceMap.
 # TODO: complete StructureMap.
 
 
+def _UsesPrimitiveMethod(data_type_map, method_name):
+  """Determines if a data type map uses a method of the primitive data type map.
+
+  Note that Python 2 creates a new unbound method object every time a method
+  is retrieved from a class, hence the underlying functions are compared.
+
+  Args:
+    data_type_map (DataTypeMap): data type map.
+    method_name (str): name of the method, such as "MapValue".
+
+  Returns:
+    bool: True if the data type map does not override the method of
+        the primitive data type map.
+  """
+  method = getattr(type(data_type_map), method_name, None)
+  primitive_method = getattr(PrimitiveDataTypeMap, method_name)
+  return (getattr(method, u'__func__', method) is
+          getattr(primitive_method, u'__func__', primitive_method))
+
+
 class ByteStreamOperation(object):
   """Byte stream operation."""
 
   @abc.abstractmethod
-  def ReadFrom(self, byte_stream):
+  def ReadFrom(self, byte_stream, byte_offset=0):
     """Read values from a byte stream.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
 
     Returns:
       tuple[object, ...]: values copies from the byte stream.
     """
 
+  @abc.abstractmethod
+  def WriteTo(self, byte_stream, values, byte_offset=0):
+    """Writes values to a byte stream.
+
+    Args:
+      byte_stream (bytearray): byte stream.
+      values (tuple[object, ...]): values to write.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+    """
+
 
 class StructOperation(ByteStreamOperation):
   """Python struct-base byte stream operation."""
@@ -64,11 +104,12 @@ class StructOperation(ByteStreamOperation):
     self._struct = struct_object
     self._struct_format_string = format_string
 
-  def ReadFrom(self, byte_stream):
+  def ReadFrom(self, byte_stream, byte_offset=0):
     """Read values from a byte stream.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
 
     Returns:
       tuple[object, ...]: values copies from the byte stream.
@@ -77,14 +118,81 @@ class StructOperation(ByteStreamOperation):
       IOError: if byte stream cannot be read.
     """
     try:
-      return self._struct.unpack_from(byte_stream)
+      return self._struct.unpack_from(byte_stream, byte_offset)
+    except (TypeError, struct.error) as exception:
+      raise IOError(u'Unable to read byte stream with error: {0!s}'.format(
+          exception))
+
+  def ReadArrayFrom(self, byte_stream, number_of_elements, byte_offset=0):
+    """Read an array of consecutive values from a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      number_of_elements (int): number of elements in the array.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+
+    Returns:
+      iterator[tuple[object, ...]]: values copies from the byte stream per
+          element.
+
+    Raises:
+      IOError: if byte stream cannot be read.
+    """
+    data_size = number_of_elements * self._struct.size
+
+    try:
+      byte_stream_view = memoryview(byte_stream)[
+          byte_offset:byte_offset + data_size]
+    except (TypeError, ValueError) as exception:
+      raise IOError(u'Unable to read byte stream with error: {0!s}'.format(
+          exception))
+
+    if len(byte_stream_view) != data_size:
+      raise IOError((
+          u'Unable to read byte stream with error: byte stream too small '
+          u'for {0:d} elements').format(number_of_elements))
+
+    try:
+      # Note that struct.iter_unpack is not supported by Python 2.
+      if hasattr(self._struct, u'iter_unpack'):
+        return self._struct.iter_unpack(byte_stream_view)
+
+      return iter([
+          self._struct.unpack_from(byte_stream_view, element_offset)
+          for element_offset in range(0, data_size, self._struct.size)])
+
     except (TypeError, struct.error) as exception:
       raise IOError(u'Unable to read byte stream with error: {0!s}'.format(
           exception))
 
+  def WriteTo(self, byte_stream, values, byte_offset=0):
+    """Writes values to a byte stream.
+
+    The values are written directly into the byte stream, which must be
+    writable and large enough to contain the values.
+
+    Args:
+      byte_stream (bytearray): byte stream.
+      values (tuple[object, ...]): values to write.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+
+    Raises:
+      IOError: if byte stream cannot be written.
+    """
+    try:
+      self._struct.pack_into(byte_stream, byte_offset, *values)
+    except (TypeError, struct.error) as exception:
+      raise IOError(u'Unable to write byte stream with error: {0!s}'.format(
+          exception))
+
 
 class StructureValuesClassFactory(object):
-  """Structure values class factory."""
+  """Structure values class factory.
+
+  By default the structure values classes define __slots__ so that instances
+  do not have a per-instance __dict__. Alternatively named tuple-based
+  classes can be created, which store the values in a tuple.
+  """
 
   _CLASS_TEMPLATE = u'\n'.join([
       u'class {type_name:s}(object):',
@@ -94,12 +202,31 @@ class StructureValuesClassFactory(object):
       u'{class_attributes_description:s}',
       u'  """',
       u'',
+      u'  __slots__ = {slots:s}',
+      u'',
       u'  def __init__(self, {init_arguments:s}):',
       u'    """Initializes an instance of {type_name:s}."""',
       u'    super({type_name:s}, self).__init__()',
       u'{instance_attributes:s}',
       u''])
 
+  _NAMED_TUPLE_CLASS_TEMPLATE = u'\n'.join([
+      u'class {type_name:s}(tuple):',
+      u'  """{type_description:s}.',
+      u'',
+      u'  Attributes:',
+      u'{class_attributes_description:s}',
+      u'  """',
+      u'',
+      u'  __slots__ = ()',
+      u'',
+      u'  def __new__(cls, {init_arguments:s}):',
+      u'    """Initializes an instance of {type_name:s}."""',
+      u'    return tuple.__new__(cls, ({tuple_values:s}))',
+      u'',
+      u'{properties:s}',
+      u''])
+
   _PYTHON_NATIVE_TYPES = {
       definitions.TYPE_INDICATOR_BOOLEAN: u'bool',
       definitions.TYPE_INDICATOR_CHARACTER: u'str',
@@ -108,11 +235,13 @@ class StructureValuesClassFactory(object):
       definitions.TYPE_INDICATOR_UUID: u'uuid.UUID'}
 
   @classmethod
-  def _CreateClassTemplate(cls, data_type_definition):
+  def _CreateClassTemplate(cls, data_type_definition, named_tuple=False):
     """Creates the class template.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
+      named_tuple (Optional[bool]): True if a named tuple-based class template
+          should be created.
 
     Returns:
       str: class template.
@@ -123,11 +252,13 @@ class StructureValuesClassFactory(object):
     while type_description.endswith(u'.'):
       type_description = type_description[:-1]
 
+    attribute_names = []
     class_attributes_description = []
     init_arguments = []
     instance_attributes = []
+    properties = []
 
-    for member_definition in data_type_definition.members:
+    for index, member_definition in enumerate(data_type_definition.members):
       attribute_name = member_definition.name
 
       description = member_definition.description or attribute_name
@@ -153,22 +284,39 @@ class StructureValuesClassFactory(object):
       description = u'    {0:s} ({1:s}): {2:s}.'.format(
           attribute_name, member_type_indicator, description)
 
+      property_definition = (
+          u'  {0:s} = _property(_itemgetter({1:d}))').format(
+              attribute_name, index)
+
+      attribute_names.append(attribute_name)
       class_attributes_description.append(description)
       init_arguments.append(argument)
       instance_attributes.append(definition)
+      properties.append(property_definition)
 
     class_attributes_description = u'\n'.join(
         sorted(class_attributes_description))
     init_arguments = u', '.join(init_arguments)
     instance_attributes = u'\n'.join(sorted(instance_attributes))
+    properties = u'\n'.join(properties)
+    slots = u'({0:s}, )'.format(u', '.join([
+        u'u\'{0:s}\''.format(attribute_name)
+        for attribute_name in attribute_names]))
+    tuple_values = u'{0:s}, '.format(u', '.join(attribute_names))
 
     template_values = {
         u'class_attributes_description': class_attributes_description,
         u'init_arguments': init_arguments,
         u'instance_attributes': instance_attributes,
+        u'properties': properties,
+        u'slots': slots,
+        u'tuple_values': tuple_values,
         u'type_description': type_description,
         u'type_name': type_name}
 
+    if named_tuple:
+      return cls._NAMED_TUPLE_CLASS_TEMPLATE.format(**template_values)
+
     return cls._CLASS_TEMPLATE.format(**template_values)
 
   @classmethod
@@ -227,24 +375,32 @@ class StructureValuesClassFactory(object):
       defined_attribute_names.add(attribute_name)
 
   @classmethod
-  def CreateClass(cls, data_type_definition):
+  def CreateClass(cls, data_type_definition, named_tuple=False):
     """Creates a new structure values class.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
+      named_tuple (Optional[bool]): True if a named tuple-based class should
+          be created, of which the instances are immutable and can be used
+          as tuples, but use more memory per instance than the default class
+          that uses __slots__.
 
     Returns:
       class: structure values class.
     """
     cls._ValidateDataTypeDefinition(data_type_definition)
 
-    class_definition = cls._CreateClassTemplate(data_type_definition)
+    class_definition = cls._CreateClassTemplate(
+        data_type_definition, named_tuple=named_tuple)
 
     namespace = {
         u'__builtins__' : {
             u'object': builtins.object,
-            u'super': builtins.super},
-        u'__name__': u'{0:s}'.format(data_type_definition.name)}
+            u'super': builtins.super,
+            u'tuple': builtins.tuple},
+        u'__name__': u'{0:s}'.format(data_type_definition.name),
+        u'_itemgetter': operator.itemgetter,
+        u'_property': builtins.property}
 
     if sys.version_info[0] >= 3:
       namespace[u'__builtins__'][u'__build_class__'] = builtins.__build_class__
@@ -254,265 +410,1817 @@ class StructureValuesClassFactory(object):
     return namespace[data_type_definition.name]
 
 
-class DataTypeMapContext(object):
-  """Data type map context.
+class NumPyDataTypeFactory(object):
+  """NumPy data type factory.
 
-  Attributes:
-    byte_size (int): byte size.
-    values (dict[str, object]): values per name.
+  The NumPy data type factory creates NumPy structured data types (dtype)
+  from fixed-size structure data type definitions, where:
+  * integer and floating-point members are represented by their NumPy
+    equivalent;
+  * boolean members are represented by an unsigned integer of the same size;
+  * sequence members with a fixed number of elements are represented by
+    a sub-array;
+  * structure members are represented by a nested structured data type.
   """
 
-  def __init__(self, values=None):
-    """Initializes a data type map context.
-
-    Args:
-      values (dict[str, object]): values per name.
-    """
-    super(DataTypeMapContext, self).__init__()
-    self.byte_size = None
-    self.values = values or {}
-
+  _BYTE_ORDER_STRINGS = {
+      definitions.BYTE_ORDER_BIG_ENDIAN: u'>',
+      definitions.BYTE_ORDER_LITTLE_ENDIAN: u'<',
+      definitions.BYTE_ORDER_NATIVE: u'='}
 
-class DataTypeMap(object):
-  """Data type map."""
+  _FORMAT_STRINGS_BOOLEAN = {
+      1: u'u1',
+      2: u'u2',
+      4: u'u4'}
 
-  def __init__(self, data_type_definition):
-    """Initializes a data type map.
+  _FORMAT_STRINGS_FLOATING_POINT = {
+      4: u'f4',
+      8: u'f8'}
 
-    Args:
-      data_type_definition (DataTypeDefinition): data type definition.
+  _FORMAT_STRINGS_SIGNED = {
+      1: u'i1',
+      2: u'i2',
+      4: u'i4',
+      8: u'i8'}
 
-    Raises:
-      FormatError: if the data type map cannot be determed from the data
-          type definition.
-    """
-    super(DataTypeMap, self).__init__()
-    self._data_type_definition = data_type_definition
+  _FORMAT_STRINGS_UNSIGNED = {
+      1: u'u1',
+      2: u'u2',
+      4: u'u4',
+      8: u'u8'}
 
-  def _GetByteStreamOperation(self, data_type_definition):
-    """Retrieves the byte stream operation.
+  @classmethod
+  def _GetDataTypeDescription(cls, data_type_definition, byte_order):
+    """Retrieves the NumPy data type description of a data type definition.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
+      byte_order (str): byte-order of the parent data type definition.
 
     Returns:
-      ByteStreamOperation: byte stream operation or None if unable to determine.
+      tuple[object, tuple[int, ...]]: NumPy data type description and shape,
+          where the shape is an empty tuple if the data type definition is
+          not a sequence.
 
     Raises:
-      FormatError: if the byte stream operation cannot be determed from the
-          data type definition.
+      FormatError: if the NumPy data type cannot be determed from the data
+          type definition.
     """
-    byte_order_string = self._GetStructByteOrderString(data_type_definition)
-    format_string = self._GetStructFormatString(data_type_definition)
-    format_string = u''.join([byte_order_string, format_string])
+    if data_type_definition.byte_order != definitions.BYTE_ORDER_NATIVE:
+      byte_order = data_type_definition.byte_order
+
+    type_indicator = data_type_definition.TYPE_INDICATOR
+
+    if type_indicator == definitions.TYPE_INDICATOR_SEQUENCE:
+      number_of_elements = data_type_definition.number_of_elements
+      if not number_of_elements:
+        raise errors.FormatError(
+            u'Unsupported sequence: {0:s} without fixed size'.format(
+                data_type_definition.name))
+
+      element_description, element_shape = cls._GetDataTypeDescription(
+          data_type_definition.element_data_type_definition, byte_order)
+      return element_description, (number_of_elements, ) + element_shape
+
+    if type_indicator == definitions.TYPE_INDICATOR_STRUCTURE:
+      return cls._GetStructureDataTypeDescription(
+          data_type_definition, byte_order), ()
+
+    if type_indicator == definitions.TYPE_INDICATOR_BOOLEAN:
+      format_strings = cls._FORMAT_STRINGS_BOOLEAN
+    elif type_indicator == definitions.TYPE_INDICATOR_FLOATING_POINT:
+      format_strings = cls._FORMAT_STRINGS_FLOATING_POINT
+    elif type_indicator == definitions.TYPE_INDICATOR_INTEGER:
+      if data_type_definition.format == definitions.FORMAT_UNSIGNED:
+        format_strings = cls._FORMAT_STRINGS_UNSIGNED
+      else:
+        format_strings = cls._FORMAT_STRINGS_SIGNED
+    else:
+      format_strings = {}
 
-    return StructOperation(format_string)
+    format_string = format_strings.get(
+        data_type_definition.GetByteSize(), None)
+    if not format_string:
+      raise errors.FormatError(
+          u'Unsupported data type: {0:s} of type: {1!s}'.format(
+              data_type_definition.name, type_indicator))
 
-  def _GetStructByteOrderString(self, data_type_definition):
-    """Retrieves the Python struct format string.
+    byte_order_string = cls._BYTE_ORDER_STRINGS.get(byte_order, u'=')
+    return u''.join([byte_order_string, format_string]), ()
+
+  @classmethod
+  def _GetStructureDataTypeDescription(cls, data_type_definition, byte_order):
+    """Retrieves the NumPy data type description of a structure.
 
     Args:
-      data_type_definition (DataTypeDefinition): data type definition.
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
+      byte_order (str): byte-order of the parent data type definition.
 
     Returns:
-      str: format string as used by Python struct or None if format string
-          cannot be determined.
+      list[tuple[str, object]]: NumPy data type description of the members.
 
     Raises:
-      FormatError: if the struct byte order string cannot be determed from
-          the data type definition.
+      FormatError: if the NumPy data type cannot be determed from the data
+          type definition.
     """
-    if not data_type_definition:
-      raise errors.FormatError(u'Missing data type definition')
+    if data_type_definition.GetByteSize() is None:
+      raise errors.FormatError(
+          u'Unsupported structure: {0:s} without fixed size'.format(
+              data_type_definition.name))
 
-    error_string = u''
+    if data_type_definition.byte_order != definitions.BYTE_ORDER_NATIVE:
+      byte_order = data_type_definition.byte_order
 
-    try:
-      byte_order_string = data_type_definition.GetStructByteOrderString()
-    except (AttributeError, TypeError) as exception:
-      byte_order_string = None
-      error_string = u' with error: {0!s}'.format(exception)
+    description = []
+    for member_definition in data_type_definition.members:
+      member_name = member_definition.name
+      if isinstance(member_definition, data_types.StructureMemberDefinition):
+        member_definition = member_definition.member_data_type_definition
 
-    if not byte_order_string:
-      raise errors.FormatError(
-          u'Unable to determine byte order string{0:s}'.format(error_string))
+      member_description, member_shape = cls._GetDataTypeDescription(
+          member_definition, byte_order)
 
-    return byte_order_string
+      if member_shape:
+        description.append((member_name, member_description, member_shape))
+      else:
+        description.append((member_name, member_description))
 
-  def _GetStructFormatString(self, data_type_definition):
-    """Retrieves the Python struct format string.
+    return description
+
+  @classmethod
+  def CreateDataType(cls, data_type_definition):
+    """Creates a NumPy structured data type.
 
     Args:
-      data_type_definition (DataTypeDefinition): data type definition.
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
 
     Returns:
-      str: format string as used by Python struct or None if format string
-          cannot be determined.
+      numpy.dtype: NumPy structured data type.
 
     Raises:
-      FormatError: if the struct format string cannot be determed from
-          the data type definition.
+      FormatError: if NumPy is not available or if the NumPy data type cannot
+          be determed from the data type definition.
     """
-    if not data_type_definition:
-      raise errors.FormatError(u'Missing data type definition')
+    if not numpy:
+      raise errors.FormatError(u'Missing NumPy support')
 
-    error_string = u''
+    if (not data_type_definition or data_type_definition.TYPE_INDICATOR !=
+        definitions.TYPE_INDICATOR_STRUCTURE):
+      raise errors.FormatError(u'Unsupported data type definition')
 
-    try:
-      format_string = data_type_definition.GetStructFormatString()
-    except (AttributeError, TypeError) as exception:
-      format_string = None
-      error_string = u' with error: {0!s}'.format(exception)
+    description = cls._GetStructureDataTypeDescription(
+        data_type_definition, definitions.BYTE_ORDER_NATIVE)
 
-    if not format_string:
+    try:
+      return numpy.dtype(description)
+    except (TypeError, ValueError) as exception:
       raise errors.FormatError(
-          u'Unable to determine format string{0:s}'.format(error_string))
+          u'Unable to create NumPy data type with error: {0!s}'.format(
+              exception))
 
-    return format_string
 
-  def GetByteSize(self):
-    """Retrieves the byte size of the data type map.
+class StructureMapFunctionFactory(object):
+  """Structure map function factory.
 
-    Returns:
-      int: data type size in bytes or None if size cannot be determined.
-    """
-    return self._data_type_definition.GetByteSize()
+  The structure map function factory compiles a structure data type definition
+  into a single Python function that maps the structure on a byte stream.
+  Consecutive primitive members, including sequences with a fixed number of
+  primitive elements and nested structures that consist of such members,
+  are read with a single struct unpack_from call and the offsets of the
+  other members are determined inline.
+  """
 
-  @abc.abstractmethod
-  def MapByteStream(self, byte_stream, context=None, **unused_kwargs):
-    """Maps the data type on a byte stream.
+  _FUNCTION_TEMPLATE = u'\n'.join([
+      u'def {function_name:s}(byte_stream, byte_offset, context):',
+      u'  """Maps the {type_name:s} structure on a byte stream."""',
+      u'{function_body:s}',
+      u''])
+
+  _MEMBER_FUNCTION_TEMPLATE = u'\n'.join([
+      u'def {function_name:s}(byte_stream, byte_offset, context):',
+      (u'  """Maps the {member_name:s} member of the {type_name:s} '
+       u'structure."""'),
+      u'{function_body:s}',
+      u''])
+
+  @classmethod
+  def _CreateFunctionBody(
+      cls, data_type_definition, data_type_maps, byte_order_string,
+      namespace, member_names=None, named_tuple=False):
+    """Creates the function body.
 
     Args:
-      byte_stream (bytes): byte stream.
-      context (Optional[DataTypeMapContext]): data type map context.
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
+      data_type_maps (list[DataTypeMap]): member data type maps.
+      byte_order_string (str): byte-order string of the structure as used by
+          Python struct, which applies to members with native byte-order.
+      namespace (dict[str, object]): namespace of the function, which is
+          updated with the objects referenced by the function body.
+      member_names (Optional[list[str]]): names of the members to map, where
+          None represents all members. The values of the other members are
+          None, except for members that are needed to determine the offsets
+          of the members that follow them.
+      named_tuple (Optional[bool]): True if the structure values class is
+          named tuple-based, in which case the values of a composite
+          structure are first stored in an instance of member_values_class.
 
     Returns:
-      object: mapped value.
+      list[str]: lines of the function body.
 
     Raises:
-      MappingError: if the data type definition cannot be mapped on
-          the byte stream.
+      FormatError: if the function cannot be determed from the data type
+          definition.
     """
+    attribute_names = data_type_definition.GetAttributeNames()
+    member_definitions = cls._GetMemberDefinitions(data_type_definition)
+
+    is_mapped = cls._GetMappedMembers(
+        data_type_definition, member_definitions, member_names)
+
+    member_byte_order_strings = [
+        cls.GetMemberByteOrderString(member_definition, byte_order_string)
+        for member_definition in member_definitions]
+
+    member_format_strings = [
+        cls._GetMemberFormatString(
+            member_definition, data_type_map, member_byte_order_string)
+        for member_definition, data_type_map, member_byte_order_string in zip(
+            member_definitions, data_type_maps, member_byte_order_strings)]
+
+    is_composite = False
+    for index, member_definition in enumerate(member_definitions):
+      if (is_mapped[index] and member_definition.IsComposite() and
+          not member_format_strings[index]):
+        is_composite = True
+
+    # Group consecutive primitive members with the same byte-order into runs
+    # that can be read with a single struct unpack_from call.
+    member_groups = []
+    for index, member_definition in enumerate(member_definitions):
+      member_byte_order_string = member_byte_order_strings[index]
+
+      if member_definition.IsComposite() and not member_format_strings[index]:
+        member_groups.append((None, [index]))
+      elif (member_groups and
+            member_groups[-1][0] == member_byte_order_string):
+        member_groups[-1][1].append(index)
+      else:
+        member_groups.append((member_byte_order_string, [index]))
 
+    lines = []
+    number_of_runs = 0
+    if is_composite:
+      if named_tuple:
+        values_class_name = u'member_values_class'
+      else:
+        values_class_name = u'structure_values_class'
 
-class PrimitiveDataTypeMap(DataTypeMap):
-  """Primitive data type map."""
+      lines.extend([
+          u'  structure_values = {0:s}()'.format(values_class_name),
+          u'  subcontext = DataTypeMapContext(values={',
+          u'      u\'{0:s}\': structure_values}})'.format(
+              data_type_definition.name)])
 
-  def __init__(self, data_type_definition):
-    """Initializes a data type map.
+    values = []
 
-    Args:
-      data_type_definition (DataTypeDefinition): data type definition.
+    # The offset of the current member is tracked relative to byte_offset
+    # as long as the preceding members have a fixed size, otherwise relative
+    # to member_offset.
+    offset_variable = u'byte_offset'
+    relative_offset = 0
+
+    for run_byte_order_string, member_indexes in member_groups:
+      if run_byte_order_string:
+        member_byte_sizes = [
+            struct.calcsize(u''.join([
+                run_byte_order_string, member_format_strings[index]]))
+            for index in member_indexes]
+
+        # Members that are not mapped at the start and the end of the run
+        # are skipped by offset arithmetic, the others by pad bytes.
+        mapped_indexes = [
+            run_member_index
+            for run_member_index, index in enumerate(member_indexes)
+            if is_mapped[index]]
+        if not mapped_indexes:
+          relative_offset += sum(member_byte_sizes)
+          if not is_composite:
+            values.extend([u'None'] * len(member_indexes))
+          continue
+
+        first_mapped_index = mapped_indexes[0]
+        last_mapped_index = mapped_indexes[-1]
+
+        relative_offset += sum(member_byte_sizes[:first_mapped_index])
+
+      elif not is_mapped[member_indexes[0]]:
+        relative_offset += member_definitions[member_indexes[0]].GetByteSize()
+        if not is_composite:
+          values.append(u'None')
+        continue
 
-    Raises:
-      FormatError: if the data type map cannot be determed from the data
-          type definition.
-    """
-    super(PrimitiveDataTypeMap, self).__init__(data_type_definition)
-    self._operation = self._GetByteStreamOperation(data_type_definition)
+      if relative_offset:
+        offset_expression = u'{0:s} + {1:d}'.format(
+            offset_variable, relative_offset)
+      else:
+        offset_expression = offset_variable
+
+      if run_byte_order_string:
+        run_index = number_of_runs
+        number_of_runs += 1
+
+        format_strings = [run_byte_order_string]
+        for run_member_index in range(
+            first_mapped_index, last_mapped_index + 1):
+          index = member_indexes[run_member_index]
+          if is_mapped[index]:
+            format_strings.append(member_format_strings[index])
+          else:
+            format_strings.append(u'{0:d}x'.format(
+                member_byte_sizes[run_member_index]))
+
+        format_string = u''.join(format_strings)
+
+        try:
+          struct_object = struct.Struct(format_string)
+        except (TypeError, struct.error) as exception:
+          raise errors.FormatError((
+              u'Unable to create struct object from data type definition '
+              u'with error: {0!s}').format(exception))
+
+        namespace[u'struct_{0:d}'.format(run_index)] = struct_object
+        lines.append((
+            u'  values_{0:d} = struct_{0:d}.unpack_from('
+            u'byte_stream, {1:s})').format(run_index, offset_expression))
+
+        value_index = 0
+        for index in member_indexes:
+          if not is_mapped[index]:
+            if not is_composite:
+              values.append(u'None')
+            continue
+
+          value, number_of_values = cls._CreateValueExpression(
+              member_definitions[index], data_type_maps[index],
+              u'values_{0:d}'.format(run_index), value_index,
+              u'{0:d}'.format(index), namespace)
+          value_index += number_of_values
+
+          if is_composite:
+            lines.append(u'  structure_values.{0:s} = {1:s}'.format(
+                attribute_names[index], value))
+          else:
+            values.append(value)
+
+        relative_offset += struct_object.size
+        relative_offset += sum(member_byte_sizes[last_mapped_index + 1:])
 
-  def MapByteStream(self, byte_stream, context=None, **unused_kwargs):
-    """Maps the data type on a byte stream.
+      else:
+        index = member_indexes[0]
+        map_byte_stream_name = u'map_byte_stream_{0:d}'.format(index)
+        namespace[map_byte_stream_name] = data_type_maps[index].MapByteStream
+
+        lines.extend([
+            u'  structure_values.{0:s} = {1:s}('.format(
+                attribute_names[index], map_byte_stream_name),
+            u'      byte_stream, byte_offset={0:s}, context=subcontext)'.format(
+                offset_expression)])
+
+        byte_size = member_definitions[index].GetByteSize()
+        if byte_size is not None:
+          relative_offset += byte_size
+        else:
+          lines.append(
+              u'  member_offset = {0:s} + subcontext.byte_size'.format(
+                  offset_expression))
+          offset_variable = u'member_offset'
+          relative_offset = 0
+
+    if offset_variable == u'byte_offset':
+      byte_size_expression = u'{0:d}'.format(relative_offset)
+    elif relative_offset:
+      byte_size_expression = u'member_offset + {0:d} - byte_offset'.format(
+          relative_offset)
+    else:
+      byte_size_expression = u'member_offset - byte_offset'
+
+    lines.extend([
+        u'  if context:',
+        u'    context.byte_size = {0:s}'.format(byte_size_expression)])
+
+    if is_composite and named_tuple:
+      values = [
+          u'structure_values.{0:s}'.format(attribute_name)
+          for attribute_name in attribute_names]
+
+    if is_composite and not named_tuple:
+      lines.append(u'  return structure_values')
+    else:
+      lines.append(u'  return structure_values_class({0:s})'.format(
+          u', '.join(values)))
+
+    return lines
+
+  @classmethod
+  def _CreateValueExpression(
+      cls, member_definition, data_type_map, values_name, value_index,
+      name_suffix, namespace):
+    """Creates the expression of a member value that is part of a run.
 
     Args:
-      byte_stream (bytes): byte stream.
-      context (Optional[DataTypeMapContext]): data type map context.
+      member_definition (DataTypeDefinition): member data type definition.
+      data_type_map (DataTypeMap): member data type map.
+      values_name (str): name of the values read by the run.
+      value_index (int): index of the first value of the member in the values
+          read by the run.
+      name_suffix (str): suffix of the names of the objects referenced by
+          the expression.
+      namespace (dict[str, object]): namespace of the function, which is
+          updated with the objects referenced by the expression.
 
     Returns:
-      object: mapped value.
-
-    Raises:
-      MappingError: if the data type definition cannot be mapped on
-          the byte stream.
+      tuple[str, int]: expression and number of values used by the member.
     """
-    if context:
-      context.byte_size = self._data_type_definition.GetByteSize()
-
-    try:
-      struct_tuple = self._operation.ReadFrom(byte_stream)
-      return self.MapValue(*struct_tuple)
+    if isinstance(data_type_map, StructureMap):
+      # The values of a nested structure are regrouped into an instance of
+      # its structure values class.
+      structure_values_class_name = u'structure_values_class_{0:s}'.format(
+          name_suffix)
+      namespace[structure_values_class_name] = (
+          data_type_map.GetStructureValuesClass())
+
+      nested_member_definitions = cls._GetMemberDefinitions(member_definition)
+      nested_data_type_maps = data_type_map.GetMemberDataTypeMaps()
+
+      nested_values = []
+      number_of_values = 0
+      for nested_index, nested_member_definition in enumerate(
+          nested_member_definitions):
+        value, number_of_nested_values = cls._CreateValueExpression(
+            nested_member_definition, nested_data_type_maps[nested_index],
+            values_name, value_index + number_of_values,
+            u'{0:s}_{1:d}'.format(name_suffix, nested_index), namespace)
+        nested_values.append(value)
+        number_of_values += number_of_nested_values
+
+      value = u'{0:s}({1:s})'.format(
+          structure_values_class_name, u', '.join(nested_values))
+      return value, number_of_values
+
+    if (isinstance(data_type_map, SequenceMap) and
+        data_type_map.GetResultType() == (
+            definitions.SEQUENCE_RESULT_TYPE_TUPLE)):
+      # The values of the elements are regrouped into a tuple.
+      number_of_elements = member_definition.number_of_elements
+      value = u'{0:s}[{1:d}:{2:d}]'.format(
+          values_name, value_index, value_index + number_of_elements)
+
+      data_type_map = data_type_map.GetElementDataTypeMap()
+      if not _UsesPrimitiveMethod(data_type_map, u'MapValue'):
+        map_value_name = u'map_value_{0:s}'.format(name_suffix)
+        namespace[map_value_name] = data_type_map.MapValue
+        namespace[u'map'] = map
+        namespace[u'tuple'] = tuple
+        value = u'tuple(map({0:s}, {1:s}))'.format(map_value_name, value)
+
+      return value, number_of_elements
+
+    value = u'{0:s}[{1:d}]'.format(values_name, value_index)
+
+    if (not isinstance(data_type_map, SequenceMap) and
+        not _UsesPrimitiveMethod(data_type_map, u'MapValue')):
+      map_value_name = u'map_value_{0:s}'.format(name_suffix)
+      namespace[map_value_name] = data_type_map.MapValue
+      value = u'{0:s}({1:s})'.format(map_value_name, value)
+
+    return value, 1
 
-    except Exception as exception:
-      raise errors.MappingError(exception)
+  @classmethod
+  def _GetMappedMembers(
+      cls, data_type_definition, member_definitions, member_names):
+    """Determines which members to map.
 
-  def MapValue(self, value):
-    """Maps the data type on a value.
+    Members with a variable size are always mapped, as are the members that
+    precede them, since these are needed to determine the offsets of the
+    members that follow them and can be referenced by the expressions of
+    the members with a variable size.
 
     Args:
-      value (object): value.
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
+      member_definitions (list[DataTypeDefinition]): member data type
+          definitions.
+      member_names (list[str]): names of the members to map, where None
+          represents all members.
 
     Returns:
-      object: mapped value.
+      list[bool]: True for each member that needs to be mapped.
 
     Raises:
-      ValueError: if the data type definition cannot be mapped on the value.
+      FormatError: if a member name is not defined by the structure.
     """
-    return value
+    if member_names is None:
+      return [True] * len(member_definitions)
 
+    attribute_names = data_type_definition.GetAttributeNames()
+    for member_name in member_names:
+      if member_name not in attribute_names:
+        raise errors.FormatError(
+            u'Undefined member: {0!s} in structure: {1:s}'.format(
+                member_name, data_type_definition.name))
 
-class BooleanMap(PrimitiveDataTypeMap):
-  """Boolen data type map."""
+    is_mapped = [
+        attribute_name in member_names for attribute_name in attribute_names]
 
-  def __init__(self, data_type_definition):
-    """Initializes a data type map.
+    for index, member_definition in enumerate(member_definitions):
+      if member_definition.GetByteSize() is None:
+        for mapped_index in range(index + 1):
+          is_mapped[mapped_index] = True
+
+    return is_mapped
+
+  @classmethod
+  def _GetMemberDefinitions(cls, data_type_definition):
+    """Retrieves the member data type definitions of a structure.
 
     Args:
-      data_type_definition (DataTypeDefinition): data type definition.
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
 
-    Raises:
-      FormatError: if the data type map cannot be determed from the data
-          type definition.
+    Returns:
+      list[DataTypeDefinition]: member data type definitions.
     """
-    if (data_type_definition.false_value is None and
-        data_type_definition.true_value is None):
-      raise errors.FormatError(
-          u'Boolean data type has no True or False values.')
+    member_definitions = []
+    for member_definition in data_type_definition.members:
+      if isinstance(member_definition, data_types.StructureMemberDefinition):
+        member_definition = member_definition.member_data_type_definition
+      member_definitions.append(member_definition)
 
-    super(BooleanMap, self).__init__(data_type_definition)
+    return member_definitions
 
-  def MapValue(self, value):
-    """Maps the data type on a value.
+  @classmethod
+  def _GetMemberFormatString(
+      cls, member_definition, data_type_map, byte_order_string):
+    """Retrieves the format string of a member that can be part of a run.
+
+    Besides primitive members, a sequence member can be part of a run if it
+    has a fixed number of primitive elements and is mapped to a tuple or
+    bytes, and a structure member if all its members can be part of a run
+    and have the same byte-order.
 
     Args:
-      value (object): value.
+      member_definition (DataTypeDefinition): member data type definition.
+      data_type_map (DataTypeMap): member data type map.
+      byte_order_string (str): byte-order string of the member as used by
+          Python struct.
 
     Returns:
-      bool: mapped value.
-
-    Raises:
-      ValueError: if the data type definition cannot be mapped on the value.
+      str: format string as used by Python struct or None if the member
+          cannot be part of a run.
     """
-    if self._data_type_definition.false_value == value:
-      return False
+    if isinstance(data_type_map, StructureMap):
+      nested_member_definitions = cls._GetMemberDefinitions(member_definition)
+      nested_data_type_maps = data_type_map.GetMemberDataTypeMaps()
 
-    if self._data_type_definition.true_value == value:
-      return True
+      format_strings = []
+      for nested_member_definition, nested_data_type_map in zip(
+          nested_member_definitions, nested_data_type_maps):
+        nested_byte_order_string = cls.GetMemberByteOrderString(
+            nested_member_definition, byte_order_string)
+        if nested_byte_order_string != byte_order_string:
+          return
 
-    if self._data_type_definition.false_value is None:
+        format_string = cls._GetMemberFormatString(
+            nested_member_definition, nested_data_type_map, byte_order_string)
+        if not format_string:
+          return
+
+        format_strings.append(format_string)
+
+      return u''.join(format_strings)
+
+    if isinstance(data_type_map, SequenceMap):
+      if (member_definition.number_of_elements_expression or
+          not member_definition.number_of_elements):
+        return
+
+      element_data_type_definition = (
+          member_definition.element_data_type_definition)
+      if (not element_data_type_definition or
+          element_data_type_definition.IsComposite()):
+        return
+
+      result_type = data_type_map.GetResultType()
+      if result_type == definitions.SEQUENCE_RESULT_TYPE_BYTES:
+        return u'{0:d}s'.format(member_definition.number_of_elements)
+
+      if result_type == definitions.SEQUENCE_RESULT_TYPE_TUPLE:
+        return member_definition.GetStructFormatString()
+
+      return
+
+    if member_definition.IsComposite():
+      return
+
+    return member_definition.GetStructFormatString()
+
+  @classmethod
+  def CreateMapByteStreamFunction(
+      cls, data_type_definition, data_type_maps, structure_values_class,
+      byte_order_string, member_names=None):
+    """Creates a new structure map byte stream function.
+
+    Args:
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
+      data_type_maps (list[DataTypeMap]): member data type maps.
+      structure_values_class (class): structure values class.
+      byte_order_string (str): byte-order string as used by Python struct.
+      member_names (Optional[list[str]]): names of the members to map, where
+          None represents all members.
+
+    Returns:
+      function: structure map byte stream function, which takes the byte
+          stream, byte offset and data type map context as arguments and
+          returns the structure values.
+
+    Raises:
+      FormatError: if the function cannot be determed from the data type
+          definition.
+    """
+    named_tuple = issubclass(structure_values_class, tuple)
+
+    namespace = {}
+    function_body = cls._CreateFunctionBody(
+        data_type_definition, data_type_maps, byte_order_string, namespace,
+        member_names=member_names, named_tuple=named_tuple)
+
+    if named_tuple:
+      namespace[u'member_values_class'] = (
+          StructureValuesClassFactory.CreateClass(data_type_definition))
+
+    template_values = {
+        u'function_body': u'\n'.join(function_body),
+        u'function_name': u'MapByteStream',
+        u'type_name': data_type_definition.name}
+
+    function_definition = cls._FUNCTION_TEMPLATE.format(**template_values)
+
+    namespace.update({
+        u'__builtins__': {},
+        u'DataTypeMapContext': DataTypeMapContext,
+        u'structure_values_class': structure_values_class})
+
+    exec(function_definition, namespace)  # pylint: disable=exec-used
+
+    return namespace[u'MapByteStream']
+
+  @classmethod
+  def CreateMapMemberFunction(
+      cls, data_type_definition, data_type_maps, byte_order_string,
+      member_name):
+    """Creates a new function that maps a single member on a byte stream.
+
+    Args:
+      data_type_definition (DataTypeDefinition): structure data type
+          definition.
+      data_type_maps (list[DataTypeMap]): member data type maps.
+      byte_order_string (str): byte-order string as used by Python struct.
+      member_name (str): name of the member.
+
+    Returns:
+      function: member map function, which takes the byte stream, byte offset
+          of the structure and data type map context as arguments and returns
+          the member value, or None if the member has a variable size or
+          is preceded by a member with a variable size.
+
+    Raises:
+      FormatError: if the function cannot be determed from the data type
+          definition.
+    """
+    attribute_names = data_type_definition.GetAttributeNames()
+    if member_name not in attribute_names:
+      raise errors.FormatError(
+          u'Undefined member: {0!s} in structure: {1:s}'.format(
+              member_name, data_type_definition.name))
+
+    index = attribute_names.index(member_name)
+    member_definition = cls._GetMemberDefinitions(data_type_definition)[index]
+    data_type_map = data_type_maps[index]
+
+    member_offset = data_type_definition.GetMemberOffsets().get(
+        member_name, None)
+    byte_size = member_definition.GetByteSize()
+    if member_offset is None or byte_size is None:
+      return
+
+    if member_offset:
+      offset_expression = u'byte_offset + {0:d}'.format(member_offset)
+    else:
+      offset_expression = u'byte_offset'
+
+    member_byte_order_string = cls.GetMemberByteOrderString(
+        member_definition, byte_order_string)
+    format_string = cls._GetMemberFormatString(
+        member_definition, data_type_map, member_byte_order_string)
+
+    namespace = {}
+    if format_string:
+      format_string = u''.join([member_byte_order_string, format_string])
+      try:
+        namespace[u'struct_0'] = struct.Struct(format_string)
+      except (TypeError, struct.error) as exception:
+        raise errors.FormatError((
+            u'Unable to create struct object from data type definition '
+            u'with error: {0!s}').format(exception))
+
+      value, _ = cls._CreateValueExpression(
+          member_definition, data_type_map, u'values_0', 0,
+          u'{0:d}'.format(index), namespace)
+
+      function_body = [
+          u'  values_0 = struct_0.unpack_from(byte_stream, {0:s})'.format(
+              offset_expression),
+          u'  if context:',
+          u'    context.byte_size = {0:d}'.format(byte_size),
+          u'  return {0:s}'.format(value)]
+
+    else:
+      map_byte_stream_name = u'map_byte_stream_{0:d}'.format(index)
+      namespace[map_byte_stream_name] = data_type_map.MapByteStream
+
+      function_body = [
+          u'  return {0:s}('.format(map_byte_stream_name),
+          u'      byte_stream, byte_offset={0:s}, context=context)'.format(
+              offset_expression)]
+
+    template_values = {
+        u'function_body': u'\n'.join(function_body),
+        u'function_name': u'MapMember',
+        u'member_name': member_name,
+        u'type_name': data_type_definition.name}
+
+    function_definition = cls._MEMBER_FUNCTION_TEMPLATE.format(
+        **template_values)
+
+    namespace[u'__builtins__'] = {}
+
+    exec(function_definition, namespace)  # pylint: disable=exec-used
+
+    return namespace[u'MapMember']
+
+  @classmethod
+  def GetMemberByteOrderString(cls, member_definition, byte_order_string):
+    """Retrieves the byte-order string of a member.
+
+    Args:
+      member_definition (DataTypeDefinition): member data type definition.
+      byte_order_string (str): byte-order string of the structure as used by
+          Python struct.
+
+    Returns:
+      str: byte-order string as used by Python struct, which is the byte-order
+          string of the structure if the member has native byte-order.
+    """
+    member_byte_order_string = member_definition.GetStructByteOrderString()
+    if member_byte_order_string in (None, u'='):
+      return byte_order_string
+
+    return member_byte_order_string
+
+
+class DataTypeMapContext(object):
+  """Data type map context.
+
+  Attributes:
+    byte_size (int): byte size.
+    values (dict[str, object]): values per name.
+  """
+
+  def __init__(self, values=None):
+    """Initializes a data type map context.
+
+    Args:
+      values (dict[str, object]): values per name.
+    """
+    super(DataTypeMapContext, self).__init__()
+    self.byte_size = None
+    self.values = values or {}
+
+
+class LazyStructureValues(object):
+  """Lazy structure values.
+
+  The members of the structure are mapped when they are first accessed and
+  the byte stream is referenced until then. The members that are preceded
+  by a member with a variable size are mapped together on first access.
+  """
+
+  __slots__ = (
+      u'_byte_offset', u'_byte_stream', u'_data_type_map', u'_member_names',
+      u'_values')
+
+  def __init__(self, data_type_map, byte_stream, byte_offset):
+    """Initializes lazy structure values.
+
+    Args:
+      data_type_map (StructureMap): structure data type map.
+      byte_stream (bytes): byte stream.
+      byte_offset (int): offset of the structure in the byte stream.
+    """
+    super(LazyStructureValues, self).__init__()
+    self._byte_offset = byte_offset
+    self._byte_stream = byte_stream
+    self._data_type_map = data_type_map
+    self._member_names = data_type_map.GetAttributeNames()
+    self._values = {}
+
+  def __getattr__(self, name):
+    """Retrieves the value of a member.
+
+    Args:
+      name (str): name of the member.
+
+    Returns:
+      object: value of the member.
+
+    Raises:
+      AttributeError: if the structure does not define the member.
+      MappingError: if the member cannot be mapped on the byte stream.
+    """
+    # Note that __getattr__ is only invoked if the attribute is not found
+    # otherwise, hence for the members of the structure.
+    if name.startswith(u'_') or name not in self._member_names:
+      raise AttributeError(name)
+
+    # A mapped value can be None, hence a cached value is looked up by name.
+    if name in self._values:
+      return self._values[name]
+
+    # pylint: disable=protected-access
+    if self._data_type_map._GetMapMemberFunction(name):
+      value = self._data_type_map.MapMember(
+          self._byte_stream, name, byte_offset=self._byte_offset)
+      self._values[name] = value
+      return value
+
+    # The members that are preceded by a member with a variable size are
+    # mapped together, so that the members that determine their offsets are
+    # only mapped once.
+    member_names = [
+        member_name for member_name in self._member_names
+        if not self._data_type_map._GetMapMemberFunction(member_name)]
+
+    structure_values = self._data_type_map.MapByteStream(
+        self._byte_stream, byte_offset=self._byte_offset,
+        members=member_names)
+
+    for member_name in member_names:
+      if member_name not in self._values:
+        self._values[member_name] = getattr(structure_values, member_name)
+
+    return self._values[name]
+
+
+class DataTypeMap(object):
+  """Data type map."""
+
+  # The number of bytes read by MapFileObject for a data type with a variable
+  # size, when the minimum number of bytes is insufficient, is doubled until
+  # the maximum is reached, to bound the amount of data read when the size is
+  # determined by corrupt values.
+  _MAXIMUM_READ_SIZE = 64 * 1024 * 1024
+  _MINIMUM_READ_SIZE = 512
+
+  def __init__(self, data_type_definition):
+    """Initializes a data type map.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Raises:
+      FormatError: if the data type map cannot be determed from the data
+          type definition.
+    """
+    super(DataTypeMap, self).__init__()
+    self._data_type_definition = data_type_definition
+
+  def _GetArrayElementsByteSize(
+      self, byte_stream, byte_offset, number_of_elements):
+    """Determines the byte size of the elements of an array of the data type.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (int): offset into the byte stream where the array starts.
+      number_of_elements (int): number of elements in the array or None
+          if the array spans the remainder of the byte stream.
+
+    Returns:
+      tuple[int, int]: byte size of an element and number of elements.
+
+    Raises:
+      MappingError: if the data type definition is not of fixed size or
+          the number of elements is invalid.
+    """
+    element_byte_size = self._data_type_definition.GetByteSize()
+    if not element_byte_size:
+      raise errors.MappingError(
+          u'Unable to map array of data type: {0:s} without fixed size'.format(
+              self._data_type_definition.name))
+
+    if number_of_elements is None:
+      try:
+        number_of_elements = (
+            (len(byte_stream) - byte_offset) // element_byte_size)
+      except TypeError as exception:
+        raise errors.MappingError(
+            u'Unable to determine number of elements with error: {0!s}'.format(
+                exception))
+
+    if number_of_elements < 0:
+      raise errors.MappingError(
+          u'Invalid number of elements: {0:d}'.format(number_of_elements))
+
+    return element_byte_size, number_of_elements
+
+  def _GetByteStreamOperation(self, data_type_definition):
+    """Retrieves the byte stream operation.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Returns:
+      ByteStreamOperation: byte stream operation or None if unable to determine.
+
+    Raises:
+      FormatError: if the byte stream operation cannot be determed from the
+          data type definition.
+    """
+    byte_order_string = self._GetStructByteOrderString(data_type_definition)
+    format_string = self._GetStructFormatString(data_type_definition)
+    format_string = u''.join([byte_order_string, format_string])
+
+    return StructOperation(format_string)
+
+  def _GetFoldedByteSize(self, unused_mapped_value):
+    """Determines the byte size of a mapped value when folded.
+
+    Args:
+      mapped_value (object): mapped value.
+
+    Returns:
+      int: number of bytes the folded value needs.
+
+    Raises:
+      FoldingError: if the byte size cannot be determined.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is None:
+      raise errors.FoldingError(
+          u'Unable to determine byte size of data type: {0:s}'.format(
+              self._data_type_definition.name))
+
+    return byte_size
+
+  def _GetMinimumByteSize(self, unused_context):
+    """Determines the minimum byte size of the data type.
+
+    Args:
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of bytes that are needed at least to map the data type.
+    """
+    return self._data_type_definition.GetByteSize() or 0
+
+  def _GetRequiredByteSize(self, unused_byte_stream, unused_byte_offset,
+                           unused_context):
+    """Determines the byte size that is needed to map the data type.
+
+    Args:
+      byte_stream (bytes): byte stream, which can be too small to map the
+          data type.
+      byte_offset (int): offset into the byte stream where to start.
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of bytes that are needed to map the data type, which can
+          be less than needed if it depends on data beyond the byte stream,
+          or None if the byte size cannot be determined.
+    """
+    return self._data_type_definition.GetByteSize()
+
+  def _GetStructByteOrderString(self, data_type_definition):
+    """Retrieves the Python struct format string.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Returns:
+      str: format string as used by Python struct or None if format string
+          cannot be determined.
+
+    Raises:
+      FormatError: if the struct byte order string cannot be determed from
+          the data type definition.
+    """
+    if not data_type_definition:
+      raise errors.FormatError(u'Missing data type definition')
+
+    error_string = u''
+
+    try:
+      byte_order_string = data_type_definition.GetStructByteOrderString()
+    except (AttributeError, TypeError) as exception:
+      byte_order_string = None
+      error_string = u' with error: {0!s}'.format(exception)
+
+    if not byte_order_string:
+      raise errors.FormatError(
+          u'Unable to determine byte order string{0:s}'.format(error_string))
+
+    return byte_order_string
+
+  def _GetStructFormatString(self, data_type_definition):
+    """Retrieves the Python struct format string.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Returns:
+      str: format string as used by Python struct or None if format string
+          cannot be determined.
+
+    Raises:
+      FormatError: if the struct format string cannot be determed from
+          the data type definition.
+    """
+    if not data_type_definition:
+      raise errors.FormatError(u'Missing data type definition')
+
+    error_string = u''
+
+    try:
+      format_string = data_type_definition.GetStructFormatString()
+    except (AttributeError, TypeError) as exception:
+      format_string = None
+      error_string = u' with error: {0!s}'.format(exception)
+
+    if not format_string:
+      raise errors.FormatError(
+          u'Unable to determine format string{0:s}'.format(error_string))
+
+    return format_string
+
+  def FoldByteStream(self, mapped_value, **unused_kwargs):
+    """Folds the data type into a byte stream.
+
+    Args:
+      mapped_value (object): mapped value.
+
+    Returns:
+      bytes: byte stream.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    byte_size = self._GetFoldedByteSize(mapped_value)
+
+    byte_stream = bytearray(byte_size)
+    self.FoldInto(byte_stream, 0, mapped_value)
+
+    return bytes(byte_stream)
+
+  @abc.abstractmethod
+  def FoldInto(self, byte_stream, byte_offset, mapped_value):
+    """Folds the data type into an existing byte stream.
+
+    Args:
+      byte_stream (bytearray): writable byte stream, such as a bytearray,
+          memoryview or memory map, that is large enough to contain the
+          folded value.
+      byte_offset (int): offset into the byte stream where to start.
+      mapped_value (object): mapped value.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+
+  def GetByteSize(self):
+    """Retrieves the byte size of the data type map.
+
+    Returns:
+      int: data type size in bytes or None if size cannot be determined.
+    """
+    return self._data_type_definition.GetByteSize()
+
+  def IterateRecords(
+      self, source, byte_offset=0, number_of_records=None,
+      until_byte_offset=None):
+    """Iterates over consecutive records of the data type.
+
+    The records are mapped one at a time, when they are requested, and the
+    offset of the next record is determined from the byte size of the mapped
+    record, hence records with a variable size are supported as well.
+
+    Args:
+      source (bytes|file|MemoryMappedFileBuffer|ReadAheadBuffer): byte
+          stream, file-like object or buffer to map the records on.
+      byte_offset (Optional[int]): offset into the source of the first
+          record.
+      number_of_records (Optional[int]): maximum number of records, where
+          None represents no maximum.
+      until_byte_offset (Optional[int]): offset into the source where the
+          records end, where None represents the end of the source.
+
+    Yields:
+      object: mapped value of a record.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the source or a record extends beyond the end offset.
+    """
+    read_ahead_buffer = None
+    if hasattr(source, u'ReadAt'):
+      read_ahead_buffer = source
+    elif hasattr(source, u'read'):
+      read_ahead_buffer = buffers.ReadAheadBuffer(source)
+
+    elif until_byte_offset is not None:
+      # Restrict the byte stream to the records without copying it.
+      source = memoryview(source)[:until_byte_offset]
+
+    fixed_byte_size = self.GetByteSize()
+    record_index = 0
+
+    while number_of_records is None or record_index < number_of_records:
+      if until_byte_offset is not None and byte_offset >= until_byte_offset:
+        break
+
+      if read_ahead_buffer is None:
+        if byte_offset >= len(source):
+          break
+
+      elif not read_ahead_buffer.ReadAt(byte_offset, 1):
+        break
+
+      context = DataTypeMapContext()
+      if read_ahead_buffer is None:
+        record = self.MapByteStream(
+            source, byte_offset=byte_offset, context=context)
+      else:
+        record = self.MapFileObject(
+            None, byte_offset=byte_offset, context=context,
+            read_ahead_buffer=read_ahead_buffer)
+
+      byte_size = fixed_byte_size or context.byte_size
+      if not byte_size:
+        raise errors.MappingError(
+            u'Unable to determine byte size of record: {0:d}'.format(
+                record_index))
+
+      if (until_byte_offset is not None and
+          byte_offset + byte_size > until_byte_offset):
+        raise errors.MappingError((
+            u'Record: {0:d} at offset: {1:d} extends beyond end offset: '
+            u'{2:d}').format(record_index, byte_offset, until_byte_offset))
+
+      yield record
+
+      byte_offset += byte_size
+      record_index += 1
+
+  @abc.abstractmethod
+  def MapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
+    """Maps the data type on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      object: mapped value.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+
+  def MapFileObject(
+      self, file_object, byte_offset=0, context=None, read_ahead_buffer=None):
+    """Maps the data type on a file-like object.
+
+    Only the bytes the data type needs are read. If the data type has a fixed
+    size exactly that number of bytes is read. Otherwise the bytes that are
+    needed to determine the size are read first, after which the size is
+    determined from the bytes read so far, such as the number of elements of
+    a sequence. If the size cannot be determined more bytes are read, in
+    increasing amounts, until the data type can be mapped. Reading stops
+    if the end of the file-like object was reached or if the bytes that are
+    needed were read but the data type cannot be mapped on them.
+
+    Args:
+      file_object (file): file-like object, which can be None if a read-ahead
+          buffer is provided.
+      byte_offset (Optional[int]): offset into the file-like object where to
+          start.
+      context (Optional[DataTypeMapContext]): data type map context.
+      read_ahead_buffer (Optional[MemoryMappedFileBuffer|ReadAheadBuffer]):
+          buffer to read the byte stream from, where None represents a
+          read-ahead buffer of the file-like object. Reusing the buffer
+          prevents data from being read more than once when mapping
+          consecutive data types. A memory-mapped file buffer maps the data
+          types directly on the mapped memory.
+
+    Returns:
+      object: mapped value.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the file-like object.
+    """
+    if read_ahead_buffer is None:
+      read_ahead_buffer = buffers.ReadAheadBuffer(file_object)
+
+    fixed_byte_size = self.GetByteSize()
+    if fixed_byte_size is not None:
+      read_size = fixed_byte_size
+    else:
+      read_size = self._GetMinimumByteSize(context)
+
+    while True:
+      try:
+        byte_stream = read_ahead_buffer.ReadAt(byte_offset, read_size)
+      except (IOError, OSError, ValueError) as exception:
+        raise errors.MappingError((
+            u'Unable to read data type: {0:s} at offset: {1:d} with error: '
+            u'{2!s}').format(
+                self._data_type_definition.name, byte_offset, exception))
+
+      try:
+        return self.MapByteStream(byte_stream, context=context)
+
+      except errors.MappingError:
+        # Reading more bytes does not help if the data type has a fixed size
+        # or the end of the file-like object was reached.
+        if fixed_byte_size is not None or len(byte_stream) < read_size:
+          raise
+
+        # Neither does it if the bytes that are needed to map the data type
+        # were read, in which case the data is corrupt.
+        required_byte_size = self._GetRequiredByteSize(
+            byte_stream, 0, context)
+        if required_byte_size is not None and required_byte_size <= read_size:
+          raise
+
+      if required_byte_size is None:
+        required_byte_size = max(read_size * 2, self._MINIMUM_READ_SIZE)
+        if read_size < self._MAXIMUM_READ_SIZE:
+          required_byte_size = min(
+              required_byte_size, self._MAXIMUM_READ_SIZE)
+
+      if required_byte_size > self._MAXIMUM_READ_SIZE:
+        raise errors.MappingError((
+            u'Unable to map data type: {0:s} at offset: {1:d} within '
+            u'maximum read size: {2:d}').format(
+                self._data_type_definition.name, byte_offset,
+                self._MAXIMUM_READ_SIZE))
+
+      read_size = required_byte_size
+
+
+class PrimitiveDataTypeMap(DataTypeMap):
+  """Primitive data type map."""
+
+  def __init__(self, data_type_definition):
+    """Initializes a data type map.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Raises:
+      FormatError: if the data type map cannot be determed from the data
+          type definition.
+    """
+    super(PrimitiveDataTypeMap, self).__init__(data_type_definition)
+    self._operation = self._GetByteStreamOperation(data_type_definition)
+
+  def FoldInto(self, byte_stream, byte_offset, mapped_value):
+    """Folds the data type into an existing byte stream.
+
+    Args:
+      byte_stream (bytearray): writable byte stream.
+      byte_offset (int): offset into the byte stream where to start.
+      mapped_value (object): mapped value.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    try:
+      value = self.FoldValue(mapped_value)
+      self._operation.WriteTo(byte_stream, (value, ), byte_offset=byte_offset)
+
+    except Exception as exception:
+      raise errors.FoldingError(exception)
+
+    return self._data_type_definition.GetByteSize()
+
+  def FoldValue(self, value):
+    """Folds the data type into a value.
+
+    Args:
+      value (object): mapped value.
+
+    Returns:
+      object: folded value.
+
+    Raises:
+      ValueError: if the data type definition cannot be folded into the value.
+    """
+    return value
+
+  def MapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
+    """Maps the data type on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      object: mapped value.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    if context:
+      context.byte_size = self._data_type_definition.GetByteSize()
+
+    try:
+      struct_tuple = self._operation.ReadFrom(
+          byte_stream, byte_offset=byte_offset)
+      return self.MapValue(*struct_tuple)
+
+    except Exception as exception:
+      raise errors.MappingError(exception)
+
+  def MapValue(self, value):
+    """Maps the data type on a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: mapped value.
+
+    Raises:
+      ValueError: if the data type definition cannot be mapped on the value.
+    """
+    return value
+
+
+class BooleanMap(PrimitiveDataTypeMap):
+  """Boolen data type map."""
+
+  def __init__(self, data_type_definition):
+    """Initializes a data type map.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Raises:
+      FormatError: if the data type map cannot be determed from the data
+          type definition.
+    """
+    if (data_type_definition.false_value is None and
+        data_type_definition.true_value is None):
+      raise errors.FormatError(
+          u'Boolean data type has no True or False values.')
+
+    super(BooleanMap, self).__init__(data_type_definition)
+
+  def FoldValue(self, value):
+    """Folds the data type into a value.
+
+    Args:
+      value (object): mapped value.
+
+    Returns:
+      object: folded value.
+
+    Raises:
+      ValueError: if the data type definition cannot be folded into the value.
+    """
+    false_value = self._data_type_definition.false_value
+    true_value = self._data_type_definition.true_value
+
+    if value:
+      if true_value is not None:
+        return true_value
+
+      # Any value other than the False value represents True.
+      if false_value == 1:
+        return 0
+      return 1
+
+    if false_value is not None:
+      return false_value
+
+    # Any value other than the True value represents False.
+    if true_value == 0:
+      return 1
+    return 0
+
+  def MapValue(self, value):
+    """Maps the data type on a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      bool: mapped value.
+
+    Raises:
+      ValueError: if the data type definition cannot be mapped on the value.
+    """
+    if self._data_type_definition.false_value == value:
+      return False
+
+    if self._data_type_definition.true_value == value:
+      return True
+
+    if self._data_type_definition.false_value is None:
       return False
 
-    if self._data_type_definition.true_value is None:
-      return True
+    if self._data_type_definition.true_value is None:
+      return True
+
+    raise ValueError(u'No matching True and False values')
+
+
+class CharacterMap(PrimitiveDataTypeMap):
+  """Character data type map."""
+
+  def FoldValue(self, value):
+    """Folds the data type into a value.
+
+    Args:
+      value (object): mapped value.
+
+    Returns:
+      object: folded value.
+
+    Raises:
+      ValueError: if the data type definition cannot be folded into the value.
+    """
+    return ord(value)
+
+  def MapValue(self, value):
+    """Maps the data type on a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      str: mapped value.
+
+    Raises:
+      ValueError: if the data type definition cannot be mapped on the value.
+    """
+    return py2to3.UNICHR(value)
+
+
+class EnumerationMap(PrimitiveDataTypeMap):
+  """Enumeration data type map.
+
+  The enumeration values are indexed by value and by name, including their
+  aliases, when the map is created so that mapping a value does not require
+  scanning the values of the data type definition.
+
+  An enumeration that defines a bitmask can be mapped as flags, where every
+  enumeration value with a non-zero value is a flag that is set when all its
+  bits are set. The flags are decomposed per byte into lookup tables, which
+  are built on first use.
+  """
+
+  # Maximum number of cached sets of flags names, to bound the memory used
+  # if values contain many different combinations of flags.
+  _MAXIMUM_NUMBER_OF_CACHED_FLAGS_NAMES = 65536
+
+  def __init__(self, data_type_definition):
+    """Initializes a data type map.
+
+    Args:
+      data_type_definition (DataTypeDefinition): data type definition.
+
+    Raises:
+      FormatError: if the data type map cannot be determed from the data
+          type definition.
+    """
+    values_per_name = {}
+    values_per_value = {}
+    for enumeration_value in data_type_definition.values:
+      # If multiple enumeration values have the same value the first one
+      # is used to map the value.
+      values_per_value.setdefault(enumeration_value.value, enumeration_value)
+
+      values_per_name[enumeration_value.name] = enumeration_value.value
+      for alias in enumeration_value.aliases:
+        values_per_name.setdefault(alias, enumeration_value.value)
+
+    super(EnumerationMap, self).__init__(data_type_definition)
+    self._flags = None
+    self._flags_names_per_mask = {}
+    self._flags_tables = None
+    self._values_per_name = values_per_name
+    self._values_per_value = values_per_value
+
+  def _GetFlags(self):
+    """Retrieves the flags.
+
+    Returns:
+      list[EnumerationValue]: enumeration values with a non-zero value, in
+          the order of the data type definition.
+    """
+    if self._flags is None:
+      self._flags = [
+          enumeration_value
+          for enumeration_value in self._data_type_definition.values
+          if enumeration_value.value]
+
+    return self._flags
+
+  def _GetFlagsMask(self, value):
+    """Determines which flags are set in a value.
+
+    Args:
+      value (int): value.
+
+    Returns:
+      int: mask with a bit per flag in the order of the flags, which is set
+          if the flag is set in the value.
+    """
+    if self._flags_tables is None:
+      self._flags_tables = self._GetFlagsTables()
+
+    if not self._flags_tables:
+      mask = 0
+      for flag_index, enumeration_value in enumerate(self._GetFlags()):
+        if value & enumeration_value.value == enumeration_value.value:
+          mask |= 1 << flag_index
+
+      return mask
+
+    # A flag is set if its bits are set in every byte of the value, hence the
+    # masks of the individual bytes are combined with a bitwise and.
+    mask = -1
+    for byte_index, flags_table in enumerate(self._flags_tables):
+      mask &= flags_table[(value >> (byte_index * 8)) & 0xff]
+
+    return mask
+
+  def _GetFlagsNames(self, mask):
+    """Retrieves the names of the flags in a mask.
+
+    Args:
+      mask (int): mask with a bit per flag in the order of the flags.
+
+    Returns:
+      frozenset[str]: names of the flags that are set.
+    """
+    names = self._flags_names_per_mask.get(mask, None)
+    if names is None:
+      names = frozenset([
+          enumeration_value.name
+          for flag_index, enumeration_value in enumerate(self._GetFlags())
+          if mask & (1 << flag_index)])
+      if len(self._flags_names_per_mask) < (
+          self._MAXIMUM_NUMBER_OF_CACHED_FLAGS_NAMES):
+        self._flags_names_per_mask[mask] = names
+
+    return names
+
+  def _GetFlagsTables(self):
+    """Builds the flags lookup tables.
+
+    Returns:
+      list[list[int]]: lookup table per byte of the value, where the entry
+          of every byte value is a mask with a bit per flag, which is set
+          if the bits of the flag in the corresponding byte are set. The list
+          is empty if the byte size of the enumeration cannot be determined.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if not byte_size:
+      return []
+
+    flags = self._GetFlags()
+
+    flags_tables = []
+    for byte_index in range(byte_size):
+      bit_shift = byte_index * 8
+      flags_byte_values = [
+          (enumeration_value.value >> bit_shift) & 0xff
+          for enumeration_value in flags]
+
+      flags_table = []
+      for byte_value in range(256):
+        mask = 0
+        for flag_index, flag_byte_value in enumerate(flags_byte_values):
+          if byte_value & flag_byte_value == flag_byte_value:
+            mask |= 1 << flag_index
+
+        flags_table.append(mask)
+
+      flags_tables.append(flags_table)
+
+    return flags_tables
+
+  def FoldValue(self, value):
+    """Folds the data type into a value.
+
+    Args:
+      value (EnumerationValue|int|str): mapped value, which can be
+          an enumeration value, an integer or the name or alias of an
+          enumeration value.
+
+    Returns:
+      int: folded value.
+
+    Raises:
+      ValueError: if the data type definition cannot be folded into the value.
+    """
+    if isinstance(value, data_types.EnumerationValue):
+      return value.value
+
+    if isinstance(value, py2to3.STRING_TYPES):
+      try:
+        return self._values_per_name[value]
+      except KeyError:
+        raise ValueError(u'Unsupported enumeration name: {0:s}'.format(value))
+
+    return value
+
+  def GetName(self, value):
+    """Retrieves the name of an enumeration value.
+
+    Args:
+      value (int): value.
+
+    Returns:
+      str: name of the enumeration value or None if not available.
+    """
+    enumeration_value = self._values_per_value.get(value, None)
+    if not enumeration_value:
+      return None
+
+    return enumeration_value.name
+
+  def GetValue(self, name):
+    """Retrieves the value of an enumeration value.
+
+    Args:
+      name (str): name or alias of the enumeration value.
+
+    Returns:
+      int: value of the enumeration value or None if not available.
+    """
+    return self._values_per_name.get(name, None)
+
+  def MapByteStreamArray(
+      self, byte_stream, byte_offset=0, number_of_elements=None, context=None):
+    """Maps an array of consecutive enumeration values on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      number_of_elements (Optional[int]): number of values in the array,
+          where None represents as many values as fit in the remainder of
+          the byte stream.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      list[EnumerationValue|int]: mapped values, where a value that is not
+          defined by the enumeration is the value itself.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    element_byte_size, number_of_elements = self._GetArrayElementsByteSize(
+        byte_stream, byte_offset, number_of_elements)
+
+    try:
+      struct_tuples = self._operation.ReadArrayFrom(
+          byte_stream, number_of_elements, byte_offset=byte_offset)
+      values = self.MapValues([value for value, in struct_tuples])
+
+    except Exception as exception:
+      raise errors.MappingError(
+          u'Unable to map array of enumeration values with error: {0!s}'.format(
+              exception))
+
+    if context:
+      context.byte_size = number_of_elements * element_byte_size
+
+    return values
+
+  def MapFlags(self, value):
+    """Maps the data type on a value as flags.
+
+    Bits of the value that are not part of any flag are ignored.
+
+    Args:
+      value (int): value.
+
+    Returns:
+      frozenset[str]: names of the flags that are set.
+    """
+    return self._GetFlagsNames(self._GetFlagsMask(value))
+
+  def MapFlagsColumns(self, values):
+    """Maps the data type on a batch of values as a column per flag.
+
+    Args:
+      values (iterable[int]|numpy.ndarray): values, such as an array.array,
+          a list or a NumPy array of unsigned integers.
+
+    Returns:
+      dict[str, list[bool]|numpy.ndarray]: per name of a flag whether
+          the flag is set per value, where the columns are NumPy boolean
+          arrays if the values are a NumPy array.
+    """
+    flags = self._GetFlags()
+
+    if numpy and isinstance(values, numpy.ndarray):
+      return {
+          enumeration_value.name: (
+              values & enumeration_value.value) == enumeration_value.value
+          for enumeration_value in flags}
+
+    masks = [self._GetFlagsMask(value) for value in values]
 
-    raise ValueError(u'No matching True and False values')
+    return {
+        enumeration_value.name: [
+            bool(mask & (1 << flag_index)) for mask in masks]
+        for flag_index, enumeration_value in enumerate(flags)}
 
+  def MapFlagsValues(self, values):
+    """Maps the data type on a batch of values as flags.
 
-class CharacterMap(PrimitiveDataTypeMap):
-  """Character data type map."""
+    Args:
+      values (iterable[int]): values, such as an array.array or a list.
+
+    Returns:
+      list[frozenset[str]]: names of the flags that are set per value.
+    """
+    get_flags_mask = self._GetFlagsMask
+    get_flags_names = self._GetFlagsNames
+    return [get_flags_names(get_flags_mask(value)) for value in values]
 
   def MapValue(self, value):
     """Maps the data type on a value.
 
+    Values that are not defined by the enumeration are not considered an
+    error, so that an undocumented value does not prevent mapping the data
+    type that contains it.
+
     Args:
-      value (object): value.
+      value (int): value.
 
     Returns:
-      str: mapped value.
+      EnumerationValue|int: mapped value, which is the value itself if it is
+          not defined by the enumeration.
+    """
+    return self._values_per_value.get(value, value)
 
-    Raises:
-      ValueError: if the data type definition cannot be mapped on the value.
+  def MapValues(self, values):
+    """Maps the data type on a batch of values.
+
+    Args:
+      values (iterable[int]): values, such as an array.array or a list.
+
+    Returns:
+      list[EnumerationValue|int]: mapped values, where a value that is not
+          defined by the enumeration is the value itself.
     """
-    return py2to3.UNICHR(value)
+    get_value = self._values_per_value.get
+    return [get_value(value, value) for value in values]
 
 
 class FloatingPointMap(PrimitiveDataTypeMap):
@@ -526,20 +2234,103 @@ class IntegerMap(PrimitiveDataTypeMap):
 class SequenceMap(DataTypeMap):
   """Sequence data type map."""
 
-  def __init__(self, data_type_definition):
+  # Candidate array type codes per Python struct format character, of which
+  # the one with a matching item size is used.
+  _ARRAY_TYPE_CODES = {
+      u'b': u'bhilq',
+      u'B': u'BHILQ',
+      u'd': u'd',
+      u'f': u'f',
+      u'h': u'bhilq',
+      u'H': u'BHILQ',
+      u'i': u'bhilq',
+      u'I': u'BHILQ',
+      u'q': u'bhilq',
+      u'Q': u'BHILQ'}
+
+  # Globals of the number of elements expression, where __builtins__ contains
+  # an empty dictionary to prevent access to the Python built-ins.
+  _EXPRESSION_GLOBALS = {u'__builtins__': {}}
+
+  _NATIVE_BYTE_ORDER_STRING = u'<' if sys.byteorder == u'little' else u'>'
+
+  def __init__(
+      self, data_type_definition, data_type_map_cache=None, result_type=None):
     """Initializes a data type map.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
+      data_type_map_cache (Optional[dict[DataTypeDefinition, DataTypeMap]]):
+          cached data type maps, that is shared with other data type maps.
+      result_type (Optional[str]): type of the mapped values, where
+          SEQUENCE_RESULT_TYPE_ARRAY maps the elements to an array.array and
+          SEQUENCE_RESULT_TYPE_MEMORYVIEW maps the elements to a memoryview
+          of the byte stream, which is only supported for integer and
+          floating-point elements. SEQUENCE_RESULT_TYPE_BYTES maps the
+          elements to bytes, which is only supported for byte elements.
+          None represents bytes for byte elements and a tuple otherwise.
+          The memoryview result type is not supported by Python 2, since
+          its memoryview cannot be cast to the type of the elements.
+
+    Raises:
+      FormatError: if the data type map cannot be determed from the data
+          type definition.
     """
+    if (result_type is not None and
+        result_type not in definitions.SEQUENCE_RESULT_TYPES):
+      raise errors.FormatError(
+          u'Unsupported result type: {0!s}'.format(result_type))
+
     element_data_type_definition = self._GetElementDataTypeDefinition(
         data_type_definition)
 
-    data_type_map = DataTypeMapFactory.CreateDataTypeMapByType(
+    is_byte_sequence = self._IsByteElementDataTypeDefinition(
         element_data_type_definition)
 
-    if (element_data_type_definition.IsComposite() or
-        data_type_definition.number_of_elements_expression):
+    if result_type is None:
+      if is_byte_sequence:
+        result_type = definitions.SEQUENCE_RESULT_TYPE_BYTES
+      else:
+        result_type = definitions.SEQUENCE_RESULT_TYPE_TUPLE
+
+    elif (result_type == definitions.SEQUENCE_RESULT_TYPE_BYTES and
+          not is_byte_sequence):
+      raise errors.FormatError(
+          u'Unsupported result type: bytes for element data type: {0:s}'.format(
+              element_data_type_definition.name))
+
+    elif (result_type == definitions.SEQUENCE_RESULT_TYPE_MEMORYVIEW and
+          not hasattr(memoryview, u'cast')):
+      raise errors.FormatError(
+          u'Unsupported result type: memoryview without memoryview.cast')
+
+    number_of_elements_expression = None
+    if data_type_definition.number_of_elements_expression:
+      number_of_elements_expression = self._CompileExpression(
+          data_type_definition.number_of_elements_expression)
+
+    data_type_map = DataTypeMapFactory.CreateDataTypeMapByType(
+        element_data_type_definition, data_type_map_cache=data_type_map_cache)
+
+    array_type_code = None
+    is_byte_swapped = False
+    if result_type == definitions.SEQUENCE_RESULT_TYPE_BYTES:
+      map_byte_stream = self._ArrayMapByteStream
+      operation = None
+
+    elif result_type != definitions.SEQUENCE_RESULT_TYPE_TUPLE:
+      array_type_code = self._GetArrayTypeCode(element_data_type_definition)
+      map_byte_stream = self._ArrayMapByteStream
+      operation = None
+
+      byte_order_string = self._GetStructByteOrderString(
+          element_data_type_definition)
+      is_byte_swapped = (
+          element_data_type_definition.GetByteSize() > 1 and
+          byte_order_string not in (u'=', self._NATIVE_BYTE_ORDER_STRING))
+
+    elif (element_data_type_definition.IsComposite() or
+          data_type_definition.number_of_elements_expression):
       map_byte_stream = self._CompositeMapByteStream
       operation = None
     else:
@@ -547,68 +2338,218 @@ class SequenceMap(DataTypeMap):
       operation = self._GetByteStreamOperation(data_type_definition)
 
     super(SequenceMap, self).__init__(data_type_definition)
+    self._array_type_code = array_type_code
     self._data_type_map = data_type_map
+    self._fold_operations = {}
+    self._is_byte_swapped = is_byte_swapped
     self._map_byte_stream = map_byte_stream
+    self._number_of_elements_expression = number_of_elements_expression
     self._operation = operation
+    self._result_type = result_type
 
-  def _CompositeMapByteStream(self, byte_stream, context=None, **unused_kwargs):
-    """Maps a sequence of composite data types on a byte stream.
+  def _ArrayMapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
+    """Maps a sequence of integer or floating-point elements on a byte stream.
+
+    Unless the byte order of the elements differs from the native byte order
+    the memoryview result type does not copy the byte stream. Otherwise the
+    elements are copied and byte-swapped into an array.array. The bytes
+    result type copies the byte stream once.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
       context (Optional[DataTypeMapContext]): data type map context.
 
     Returns:
-      tuple[object, ...]: mapped values.
+      array.array|bytes|memoryview: mapped values.
 
     Raises:
       MappingError: if the data type definition cannot be mapped on
           the byte stream.
     """
-    if self._data_type_definition.number_of_elements:
-      number_of_elements = self._data_type_definition.number_of_elements
-    else:
-      expression = self._data_type_definition.number_of_elements_expression
-      namespace = {}
-      if context and context.values:
-        namespace.update(context.values)
-      # Make sure __builtins__ contains an empty dictionary.
-      namespace[u'__builtins__'] = {}
+    number_of_elements = self._GetNumberOfElements(context)
 
-      try:
-        number_of_elements = eval(expression, namespace)  # pylint: disable=eval-used
-      except Exception as exception:
-        raise errors.MappingError(
-            u'Unable to determine number of elements with error: {0!s}'.format(
-                exception))
+    element_byte_size = (
+        self._data_type_definition.element_data_type_definition.GetByteSize())
+    data_size = number_of_elements * element_byte_size
 
-    if number_of_elements < 0:
+    try:
+      data_view = memoryview(byte_stream)[byte_offset:byte_offset + data_size]
+      if len(data_view) != data_size:
+        raise ValueError(
+            u'byte stream too small for {0:d} elements'.format(
+                number_of_elements))
+
+      if self._result_type == definitions.SEQUENCE_RESULT_TYPE_BYTES:
+        values = data_view.tobytes()
+
+      elif (self._result_type == definitions.SEQUENCE_RESULT_TYPE_MEMORYVIEW and
+            not self._is_byte_swapped):
+        values = data_view.cast(self._array_type_code)
+
+      else:
+        values = array.array(self._array_type_code)
+        # Note that array.frombytes is not supported by Python 2.
+        if hasattr(values, u'frombytes'):
+          values.frombytes(data_view)
+        else:
+          values.fromstring(data_view.tobytes())
+        if self._is_byte_swapped:
+          values.byteswap()
+
+    except Exception as exception:
       raise errors.MappingError(
-          u'Invalid number of elements: {0:d}'.format(number_of_elements))
+          u'Unable to map sequence at offset: {0:d} with error: {1!s}'.format(
+              byte_offset, exception))
+
+    if context:
+      context.byte_size = data_size
+
+    return values
+
+  def _CompileExpression(self, expression):
+    """Compiles an expression.
+
+    The expression is only allowed to reference values by name and
+    the attributes of these values that do not start with an underscore.
+
+    Args:
+      expression (str): expression.
+
+    Returns:
+      code: compiled expression.
+
+    Raises:
+      FormatError: if the expression is invalid or not supported.
+    """
+    try:
+      expression_tree = ast.parse(expression, mode=u'eval')
+    except (SyntaxError, TypeError, ValueError) as exception:
+      raise errors.FormatError(
+          u'Invalid expression: {0!s} with error: {1!s}'.format(
+              expression, exception))
+
+    for node in ast.walk(expression_tree):
+      if isinstance(node, ast.Attribute):
+        name = node.attr
+      elif isinstance(node, ast.Name):
+        name = node.id
+      else:
+        continue
+
+      if name.startswith(u'_'):
+        raise errors.FormatError((
+            u'Unsupported expression: {0!s} name: {1:s} starts with '
+            u'underscore').format(expression, name))
+
+    return compile(expression_tree, u'<expression>', u'eval')
+
+  def _CompositeMapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
+    """Maps a sequence of composite data types on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      tuple[object, ...]: mapped values.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    number_of_elements = self._GetNumberOfElements(context)
 
     values = []
 
     subcontext = DataTypeMapContext()
 
-    byte_stream_offset = 0
+    element_offset = byte_offset
     for _ in range(number_of_elements):
       try:
         value = self._data_type_map.MapByteStream(
-            byte_stream[byte_stream_offset:], context=subcontext)
+            byte_stream, byte_offset=element_offset, context=subcontext)
         values.append(value)
 
       except Exception as exception:
         raise errors.MappingError((
             u'Unable to read byte stream at offset: {0:d} with error: '
-            u'{1!s}').format(byte_stream_offset, exception))
+            u'{1!s}').format(element_offset, exception))
 
-      byte_stream_offset += subcontext.byte_size
+      element_offset += subcontext.byte_size
 
     if context:
-      context.byte_size = byte_stream_offset
+      context.byte_size = element_offset - byte_offset
 
     return tuple(values)
 
+  def _EvaluateNumberOfElements(self, context):
+    """Evaluates the number of elements.
+
+    Args:
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of elements, which can be negative.
+
+    Raises:
+      MappingError: if the number of elements cannot be evaluated.
+    """
+    if self._number_of_elements_expression is None:
+      return self._data_type_definition.number_of_elements
+
+    if context:
+      values = context.values
+    else:
+      values = {}
+
+    try:
+      return eval(  # pylint: disable=eval-used
+          self._number_of_elements_expression, self._EXPRESSION_GLOBALS,
+          values)
+    except Exception as exception:
+      raise errors.MappingError(
+          u'Unable to determine number of elements with error: {0!s}'.format(
+              exception))
+
+  def _GetArrayTypeCode(self, element_data_type_definition):
+    """Retrieves the array type code of the elements.
+
+    Args:
+      element_data_type_definition (DataTypeDefinition): element data type
+          definition.
+
+    Returns:
+      str: array type code.
+
+    Raises:
+      FormatError: if the array type code cannot be determed from the element
+          data type definition.
+    """
+    if element_data_type_definition.TYPE_INDICATOR not in (
+        definitions.TYPE_INDICATOR_FLOATING_POINT,
+        definitions.TYPE_INDICATOR_INTEGER):
+      raise errors.FormatError(
+          u'Unsupported element data type: {0:s} for result type'.format(
+              element_data_type_definition.TYPE_INDICATOR))
+
+    format_string = self._GetStructFormatString(element_data_type_definition)
+    element_byte_size = struct.calcsize(u'<{0:s}'.format(format_string))
+
+    for array_type_code in self._ARRAY_TYPE_CODES.get(format_string, u''):
+      try:
+        if array.array(array_type_code).itemsize == element_byte_size:
+          return array_type_code
+      except ValueError:
+        pass
+
+    raise errors.FormatError(
+        u'Unable to determine array type code for format string: {0:s}'.format(
+            format_string))
+
   def _GetElementDataTypeDefinition(self, data_type_definition):
     """Retrieves the element data type definition.
 
@@ -633,11 +2574,190 @@ class SequenceMap(DataTypeMap):
 
     return element_data_type_definition
 
-  def _PrimitiveMapByteStream(self, byte_stream, context=None, **unused_kwargs):
+  def _GetFoldOperation(self, number_of_elements):
+    """Retrieves the byte stream operation to fold primitive elements.
+
+    Args:
+      number_of_elements (int): number of elements.
+
+    Returns:
+      StructOperation: byte stream operation.
+
+    Raises:
+      FormatError: if the byte stream operation cannot be determed from the
+          data type definition.
+    """
+    operation = self._fold_operations.get(number_of_elements, None)
+    if not operation:
+      element_data_type_definition = (
+          self._data_type_definition.element_data_type_definition)
+
+      if self._result_type == definitions.SEQUENCE_RESULT_TYPE_BYTES:
+        format_string = u'{0:d}s'.format(number_of_elements)
+      else:
+        byte_order_string = self._GetStructByteOrderString(
+            element_data_type_definition)
+        format_string = self._GetStructFormatString(
+            element_data_type_definition)
+        format_string = u'{0:s}{1:d}{2:s}'.format(
+            byte_order_string, number_of_elements, format_string)
+
+      operation = StructOperation(format_string)
+      self._fold_operations[number_of_elements] = operation
+
+    return operation
+
+  def _GetFoldedByteSize(self, mapped_value):
+    """Determines the byte size of a mapped value when folded.
+
+    Args:
+      mapped_value (object): mapped value.
+
+    Returns:
+      int: number of bytes the folded value needs.
+
+    Raises:
+      FoldingError: if the byte size cannot be determined.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is None:
+      element_byte_size = (
+          self._data_type_definition.element_data_type_definition.GetByteSize())
+      if element_byte_size is not None:
+        byte_size = len(mapped_value) * element_byte_size
+      else:
+        # pylint: disable=protected-access
+        byte_size = sum([
+            self._data_type_map._GetFoldedByteSize(element_value)
+            for element_value in mapped_value])
+
+    return byte_size
+
+  def _GetMinimumByteSize(self, context):
+    """Determines the minimum byte size of the data type.
+
+    Args:
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of bytes that are needed at least to map the data type.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is None:
+      element_byte_size = (
+          self._data_type_definition.element_data_type_definition.GetByteSize())
+      if element_byte_size is None:
+        return 0
+
+      # If the number of elements cannot be determined mapping the sequence
+      # fails regardless of the number of bytes.
+      try:
+        number_of_elements = self._GetNumberOfElements(context)
+      except errors.MappingError:
+        return 0
+
+      byte_size = number_of_elements * element_byte_size
+
+    return byte_size
+
+  def _GetNumberOfElements(self, context):
+    """Determines the number of elements.
+
+    Args:
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of elements.
+
+    Raises:
+      MappingError: if the number of elements cannot be determined.
+    """
+    number_of_elements = self._EvaluateNumberOfElements(context)
+    if number_of_elements < 0:
+      raise errors.MappingError(
+          u'Invalid number of elements: {0:d}'.format(number_of_elements))
+
+    return number_of_elements
+
+  def _GetRequiredByteSize(self, byte_stream, byte_offset, context):
+    """Determines the byte size that is needed to map the data type.
+
+    Args:
+      byte_stream (bytes): byte stream, which can be too small to map the
+          data type.
+      byte_offset (int): offset into the byte stream where to start.
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of bytes that are needed to map the data type, which can
+          be less than needed if it depends on data beyond the byte stream,
+          or None if the byte size cannot be determined.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is not None:
+      return byte_size
+
+    try:
+      number_of_elements = self._EvaluateNumberOfElements(context)
+    except errors.MappingError:
+      return None
+
+    # An invalid number of elements cannot be corrected by more bytes.
+    if number_of_elements < 0:
+      return 0
+
+    element_byte_size = (
+        self._data_type_definition.element_data_type_definition.GetByteSize())
+    if element_byte_size is not None:
+      return number_of_elements * element_byte_size
+
+    subcontext = DataTypeMapContext()
+    byte_stream_size = len(byte_stream)
+
+    # pylint: disable=protected-access
+    element_offset = byte_offset
+    for _ in range(number_of_elements):
+      element_byte_size = self._data_type_map._GetRequiredByteSize(
+          byte_stream, element_offset, subcontext)
+      if element_byte_size is None:
+        return None
+
+      if element_offset + element_byte_size > byte_stream_size:
+        return element_offset + element_byte_size - byte_offset
+
+      try:
+        self._data_type_map.MapByteStream(
+            byte_stream, byte_offset=element_offset, context=subcontext)
+      except errors.MappingError:
+        return None
+
+      element_offset += subcontext.byte_size
+
+    return element_offset - byte_offset
+
+  def _IsByteElementDataTypeDefinition(self, element_data_type_definition):
+    """Determines if the element data type definition defines a byte.
+
+    Args:
+      element_data_type_definition (DataTypeDefinition): element data type
+          definition.
+
+    Returns:
+      bool: True if the elements are 8-bit unsigned integers, False otherwise.
+    """
+    return (
+        element_data_type_definition.TYPE_INDICATOR == (
+            definitions.TYPE_INDICATOR_INTEGER) and
+        element_data_type_definition.format == definitions.FORMAT_UNSIGNED and
+        element_data_type_definition.GetByteSize() == 1)
+
+  def _PrimitiveMapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
     """Maps a data type sequence on a byte stream.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
       context (Optional[DataTypeMapContext]): data type map context.
 
     Returns:
@@ -651,17 +2771,89 @@ class SequenceMap(DataTypeMap):
       context.byte_size = self._data_type_definition.GetByteSize()
 
     try:
-      struct_tuple = self._operation.ReadFrom(byte_stream)
+      struct_tuple = self._operation.ReadFrom(
+          byte_stream, byte_offset=byte_offset)
       return tuple(map(self._data_type_map.MapValue, struct_tuple))
 
     except Exception as exception:
       raise errors.MappingError(exception)
 
-  def MapByteStream(self, byte_stream, **kwargs):
+  def FoldInto(self, byte_stream, byte_offset, mapped_value):
+    """Folds the data type into an existing byte stream.
+
+    Args:
+      byte_stream (bytearray): writable byte stream.
+      byte_offset (int): offset into the byte stream where to start.
+      mapped_value (tuple[object, ...]|array.array|bytes|memoryview): mapped
+          value.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    number_of_elements = len(mapped_value)
+    if (self._number_of_elements_expression is None and
+        number_of_elements != self._data_type_definition.number_of_elements):
+      raise errors.FoldingError(
+          u'Unsupported number of elements: {0:d}, expected: {1:d}'.format(
+              number_of_elements,
+              self._data_type_definition.number_of_elements))
+
+    element_data_type_definition = (
+        self._data_type_definition.element_data_type_definition)
+
+    if element_data_type_definition.IsComposite():
+      element_offset = byte_offset
+      for element_value in mapped_value:
+        element_offset += self._data_type_map.FoldInto(
+            byte_stream, element_offset, element_value)
+
+      return element_offset - byte_offset
+
+    try:
+      operation = self._GetFoldOperation(number_of_elements)
+
+      if self._result_type == definitions.SEQUENCE_RESULT_TYPE_BYTES:
+        values = (bytes(mapped_value), )
+      elif not _UsesPrimitiveMethod(self._data_type_map, u'FoldValue'):
+        values = tuple(map(self._data_type_map.FoldValue, mapped_value))
+      else:
+        values = tuple(mapped_value)
+
+      operation.WriteTo(byte_stream, values, byte_offset=byte_offset)
+
+    except Exception as exception:
+      raise errors.FoldingError(
+          u'Unable to fold sequence at offset: {0:d} with error: {1!s}'.format(
+              byte_offset, exception))
+
+    return number_of_elements * element_data_type_definition.GetByteSize()
+
+  def GetElementDataTypeMap(self):
+    """Retrieves the data type map of the elements.
+
+    Returns:
+      DataTypeMap: element data type map.
+    """
+    return self._data_type_map
+
+  def GetResultType(self):
+    """Retrieves the type of the mapped values.
+
+    Returns:
+      str: result type, such as SEQUENCE_RESULT_TYPE_TUPLE.
+    """
+    return self._result_type
+
+  def MapByteStream(self, byte_stream, byte_offset=0, **kwargs):
     """Maps the data type on a byte stream.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
 
     Returns:
       tuple[object, ...]: mapped values.
@@ -670,38 +2862,115 @@ class SequenceMap(DataTypeMap):
       MappingError: if the data type definition cannot be mapped on
           the byte stream.
     """
-    return self._map_byte_stream(byte_stream, **kwargs)
+    return self._map_byte_stream(
+        byte_stream, byte_offset=byte_offset, **kwargs)
+
+  def MapByteStreamArray(
+      self, byte_stream, byte_offset=0, number_of_elements=None, context=None):
+    """Maps an array of consecutive fixed-size sequences on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      number_of_elements (Optional[int]): number of sequences in the array,
+          where None represents as many sequences as fit in the remainder of
+          the byte stream.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      list[tuple[object, ...]]: mapped values per sequence.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    element_byte_size, number_of_elements = self._GetArrayElementsByteSize(
+        byte_stream, byte_offset, number_of_elements)
+
+    data_size = number_of_elements * element_byte_size
+
+    try:
+      if self._operation:
+        struct_tuples = self._operation.ReadArrayFrom(
+            byte_stream, number_of_elements, byte_offset=byte_offset)
+
+        map_value = self._data_type_map.MapValue
+        if _UsesPrimitiveMethod(self._data_type_map, u'MapValue'):
+          values = list(struct_tuples)
+        else:
+          values = [
+              tuple(map(map_value, struct_tuple))
+              for struct_tuple in struct_tuples]
+
+      else:
+        values = [
+            self._map_byte_stream(byte_stream, byte_offset=element_offset)
+            for element_offset in range(
+                byte_offset, byte_offset + data_size, element_byte_size)]
+
+    except Exception as exception:
+      raise errors.MappingError(
+          u'Unable to map array of sequences with error: {0!s}'.format(
+              exception))
+
+    if context:
+      context.byte_size = data_size
+
+    return values
 
 
 class StructureMap(DataTypeMap):
   """Structure data type map."""
 
-  def __init__(self, data_type_definition):
+  def __init__(
+      self, data_type_definition, data_type_map_cache=None, named_tuple=False):
     """Initializes a structure data type map.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
+      data_type_map_cache (Optional[dict[DataTypeDefinition, DataTypeMap]]):
+          cached data type maps, that is shared with other data type maps.
+      named_tuple (Optional[bool]): True if the structure values should be
+          mapped to named tuple-based instances instead of instances that use
+          __slots__.
     """
     structure_values_class = StructureValuesClassFactory.CreateClass(
-        data_type_definition)
+        data_type_definition, named_tuple=named_tuple)
+
+    if data_type_map_cache is None:
+      data_type_map_cache = {}
 
-    data_type_map_cache = {}
     data_type_maps = self._GetMemberDataTypeMaps(
         data_type_definition, data_type_map_cache)
 
-    if self._CheckCompositeMap(data_type_definition):
-      map_byte_stream = self._CompositeMapByteStream
-      operation = None
-    else:
-      map_byte_stream = self._PrimitiveMapByteStream
-      operation = self._GetByteStreamOperation(data_type_definition)
+    is_composite_map = self._CheckCompositeMap(data_type_definition)
+
+    byte_order_string = self._GetStructByteOrderString(data_type_definition)
+    map_byte_stream = (
+        StructureMapFunctionFactory.CreateMapByteStreamFunction(
+            data_type_definition, data_type_maps, structure_values_class,
+            byte_order_string))
+
+    # Arrays of structures of which all member values are mapped as-is and
+    # that have a single byte-order can be mapped directly from the values
+    # read by a single struct operation.
+    operation = None
+    if not is_composite_map:
+      for data_type_map in data_type_maps:
+        if not _UsesPrimitiveMethod(data_type_map, u'MapValue'):
+          break
+      else:
+        operation = self._GetByteStreamOperation(data_type_definition)
 
     super(StructureMap, self).__init__(data_type_definition)
     self._attribute_names = data_type_definition.GetAttributeNames()
-    self._data_type_map_cache = data_type_map_cache
     self._data_type_maps = data_type_maps
     self._map_byte_stream = map_byte_stream
+    self._member_values_class = None
+    self._numpy_data_type = None
+    self._map_member_functions = {}
     self._operation = operation
+    self._projected_map_byte_stream_functions = {}
     self._structure_values_class = structure_values_class
 
   def _CheckCompositeMap(self, data_type_definition):
@@ -724,10 +2993,7 @@ class StructureMap(DataTypeMap):
     if not members:
       raise errors.FormatError(u'Invalid data type definition missing members')
 
-    structure_byte_order = data_type_definition.byte_order
-
     is_composite_map = False
-    last_member_byte_order = definitions.BYTE_ORDER_NATIVE
 
     for member_definition in members:
       if isinstance(member_definition, data_types.StructureMemberDefinition):
@@ -735,61 +3001,10 @@ class StructureMap(DataTypeMap):
 
       if member_definition.IsComposite():
         is_composite_map = True
-        continue
-
-      member_byte_order = member_definition.byte_order
-      if (structure_byte_order != definitions.BYTE_ORDER_NATIVE and
-          structure_byte_order != member_byte_order):
-        raise errors.FormatError((
-            u'Contficting byte-order definitions in structure: {0:s} and '
-            u'member: {1:s}').format(
-                data_type_definition.name, member_definition.name))
-
-      last_member_byte_order = member_byte_order
+        break
 
     return is_composite_map
 
-  def _CompositeMapByteStream(self, byte_stream, context=None, **unused_kwargs):
-    """Maps a sequence of composite data types on a byte stream.
-
-    Args:
-      byte_stream (bytes): byte stream.
-      context (Optional[DataTypeMapContext]): data type map context.
-
-    Returns:
-      object: mapped value.
-
-    Raises:
-      MappingError: if the data type definition cannot be mapped on
-          the byte stream.
-    """
-    structure_values = self._structure_values_class()
-
-    subcontext = DataTypeMapContext(values={
-        type(structure_values).__name__: structure_values})
-
-    byte_stream_offset = 0
-    for index in range(len(self._attribute_names)):
-      attribute_name = self._attribute_names[index]
-      data_type_map = self._data_type_maps[index]
-
-      try:
-        value = data_type_map.MapByteStream(
-            byte_stream[byte_stream_offset:], context=subcontext)
-        setattr(structure_values, attribute_name, value)
-
-      except Exception as exception:
-        raise errors.MappingError((
-            u'Unable to read byte stream at offset: {0:d} with error: '
-            u'{1!s}').format(byte_stream_offset, exception))
-
-      byte_stream_offset += subcontext.byte_size
-
-    if context:
-      context.byte_size = byte_stream_offset
-
-    return structure_values
-
   def _GetByteStreamOperation(self, data_type_definition):
     """Retrieves the byte stream operation.
 
@@ -811,19 +3026,64 @@ class StructureMap(DataTypeMap):
       raise errors.FormatError(u'Invalid data type definition missing members')
 
     byte_order_string = self._GetStructByteOrderString(data_type_definition)
+
+    # A single struct operation requires all members to have the same
+    # byte-order.
+    member_byte_order_strings = set([
+        StructureMapFunctionFactory.GetMemberByteOrderString(
+            member_definition, byte_order_string)
+        for member_definition in members])
+    if len(member_byte_order_strings) != 1:
+      return
+
     format_string = u''.join([
         member_definition.GetStructFormatString()
         for member_definition in members])
-    format_string = u''.join([byte_order_string, format_string])
+    format_string = u''.join([member_byte_order_strings.pop(), format_string])
 
     return StructOperation(format_string)
 
+  def _GetMapMemberFunction(self, member_name):
+    """Retrieves a map member function.
+
+    Args:
+      member_name (str): name of the member.
+
+    Returns:
+      function: map member function or None if the member is preceded by
+          a member with a variable size.
+
+    Raises:
+      MappingError: if the function cannot be determed from the data type
+          definition.
+    """
+    if member_name in self._map_member_functions:
+      return self._map_member_functions[member_name]
+
+    byte_order_string = self._GetStructByteOrderString(
+        self._data_type_definition)
+
+    try:
+      map_member = StructureMapFunctionFactory.CreateMapMemberFunction(
+          self._data_type_definition, self._data_type_maps,
+          byte_order_string, member_name)
+    except errors.FormatError as exception:
+      raise errors.MappingError((
+          u'Unable to map member: {0!s} of structure: {1:s} with error: '
+          u'{2!s}').format(
+              member_name, self._data_type_definition.name, exception))
+
+    self._map_member_functions[member_name] = map_member
+
+    return map_member
+
   def _GetMemberDataTypeMaps(self, data_type_definition, data_type_map_cache):
     """Retrieves the member data type maps.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
-      data_type_map_cache (dict[str, DataTypeMap]): cached data type maps.
+      data_type_map_cache (dict[DataTypeDefinition, DataTypeMap]): cached
+          data type maps.
 
     Returns:
       list[DataTypeMap]: member data type maps.
@@ -845,21 +3105,152 @@ class StructureMap(DataTypeMap):
       if isinstance(member_definition, data_types.StructureMemberDefinition):
         member_definition = member_definition.member_data_type_definition
 
-      if member_definition.name not in data_type_map_cache:
-        data_type_map = DataTypeMapFactory.CreateDataTypeMapByType(
-            member_definition)
-        data_type_map_cache[member_definition.name] = data_type_map
-
-      data_type_maps.append(data_type_map_cache[member_definition.name])
+      data_type_map = DataTypeMapFactory.CreateDataTypeMapByType(
+          member_definition, data_type_map_cache=data_type_map_cache)
+      data_type_maps.append(data_type_map)
 
     return data_type_maps
 
-  def _PrimitiveMapByteStream(self, byte_stream, context=None, **unused_kwargs):
-    """Maps a data type sequence on a byte stream.
+  def _GetFoldedByteSize(self, mapped_value):
+    """Determines the byte size of a mapped value when folded.
+
+    Args:
+      mapped_value (object): mapped value.
+
+    Returns:
+      int: number of bytes the folded value needs.
+
+    Raises:
+      FoldingError: if the byte size cannot be determined.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is None:
+      # pylint: disable=protected-access
+      byte_size = sum([
+          data_type_map._GetFoldedByteSize(
+              getattr(mapped_value, attribute_name))
+          for attribute_name, data_type_map in zip(
+              self._attribute_names, self._data_type_maps)])
+
+    return byte_size
+
+  def _GetMinimumByteSize(self, unused_context):
+    """Determines the minimum byte size of the data type.
+
+    Args:
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of bytes that are needed at least to map the data type.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is None:
+      # The offset of the first member with a variable size is the largest
+      # member offset that can be determined without mapping the structure.
+      member_offsets = self._data_type_definition.GetMemberOffsets()
+      byte_size = max(member_offsets.values()) if member_offsets else 0
+
+    return byte_size
+
+  def _GetProjectedMapByteStreamFunction(self, member_names):
+    """Retrieves a map byte stream function that maps selected members.
+
+    Args:
+      member_names (list[str]): names of the members to map.
+
+    Returns:
+      function: structure map byte stream function.
+
+    Raises:
+      FormatError: if the function cannot be determed from the data type
+          definition.
+    """
+    lookup_key = frozenset(member_names)
+    map_byte_stream = self._projected_map_byte_stream_functions.get(
+        lookup_key, None)
+    if not map_byte_stream:
+      byte_order_string = self._GetStructByteOrderString(
+          self._data_type_definition)
+      map_byte_stream = (
+          StructureMapFunctionFactory.CreateMapByteStreamFunction(
+              self._data_type_definition, self._data_type_maps,
+              self._structure_values_class, byte_order_string,
+              member_names=sorted(lookup_key)))
+      self._projected_map_byte_stream_functions[lookup_key] = map_byte_stream
+
+    return map_byte_stream
+
+  def _GetRequiredByteSize(self, byte_stream, byte_offset, unused_context):
+    """Determines the byte size that is needed to map the data type.
+
+    Args:
+      byte_stream (bytes): byte stream, which can be too small to map the
+          data type.
+      byte_offset (int): offset into the byte stream where to start.
+      context (DataTypeMapContext): data type map context.
+
+    Returns:
+      int: number of bytes that are needed to map the data type, which can
+          be less than needed if it depends on data beyond the byte stream,
+          or None if the byte size cannot be determined.
+    """
+    byte_size = self._data_type_definition.GetByteSize()
+    if byte_size is not None:
+      return byte_size
+
+    # The member values are stored in a mutable instance so that they can be
+    # referenced by the expressions of the members that follow them.
+    if self._member_values_class is None:
+      self._member_values_class = StructureValuesClassFactory.CreateClass(
+          self._data_type_definition)
+
+    member_values = self._member_values_class()
+    subcontext = DataTypeMapContext(values={
+        self._data_type_definition.name: member_values})
+    byte_stream_size = len(byte_stream)
+
+    # pylint: disable=protected-access
+    member_offset = byte_offset
+    for attribute_name, data_type_map in zip(
+        self._attribute_names, self._data_type_maps):
+      member_byte_size = data_type_map._GetRequiredByteSize(
+          byte_stream, member_offset, subcontext)
+      if member_byte_size is None:
+        return None
+
+      if member_offset + member_byte_size > byte_stream_size:
+        return member_offset + member_byte_size - byte_offset
+
+      # A member that cannot be mapped on the bytes it needs is corrupt,
+      # which cannot be corrected by more bytes.
+      try:
+        member_value = data_type_map.MapByteStream(
+            byte_stream, byte_offset=member_offset, context=subcontext)
+      except errors.MappingError:
+        return member_offset + member_byte_size - byte_offset
+
+      setattr(member_values, attribute_name, member_value)
+      member_offset += subcontext.byte_size
+
+    return member_offset - byte_offset
+
+  def MapByteStream(
+      self, byte_stream, byte_offset=0, context=None, lazy=False,
+      members=None, **unused_kwargs):
+    """Maps the data type on a byte stream.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
       context (Optional[DataTypeMapContext]): data type map context.
+      lazy (Optional[bool]): True if the members should only be mapped when
+          they are first accessed, in which case LazyStructureValues are
+          returned, members is ignored and the byte size in the context is
+          only set if the structure has a fixed size.
+      members (Optional[list[str]]): names of the members to map, where None
+          represents all members. Members that are not mapped have a value of
+          None, except for members that are needed to determine the offsets
+          of the members that follow them.
 
     Returns:
       object: mapped value.
@@ -868,34 +3259,273 @@ class StructureMap(DataTypeMap):
       MappingError: if the data type definition cannot be mapped on
           the byte stream.
     """
-    if context:
-      context.byte_size = self._data_type_definition.GetByteSize()
+    if lazy:
+      if context:
+        context.byte_size = self._data_type_definition.GetByteSize()
+      return LazyStructureValues(self, byte_stream, byte_offset)
+
+    if members is None:
+      map_byte_stream = self._map_byte_stream
+    else:
+      try:
+        map_byte_stream = self._GetProjectedMapByteStreamFunction(members)
+      except errors.FormatError as exception:
+        raise errors.MappingError((
+            u'Unable to map members of structure: {0:s} with error: '
+            u'{1!s}').format(self._data_type_definition.name, exception))
 
     try:
-      struct_tuple = self._operation.ReadFrom(byte_stream)
-      values = [
-          self._data_type_maps[index].MapValue(value)
-          for index, value in enumerate(struct_tuple)]
-      return self._structure_values_class(*values)
+      return map_byte_stream(byte_stream, byte_offset, context)
 
     except Exception as exception:
+      raise errors.MappingError((
+          u'Unable to map structure: {0:s} at offset: {1:d} with error: '
+          u'{2!s}').format(
+              self._data_type_definition.name, byte_offset, exception))
+
+  def MapByteStreamArray(
+      self, byte_stream, byte_offset=0, number_of_elements=None, context=None):
+    """Maps an array of consecutive fixed-size structures on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      number_of_elements (Optional[int]): number of structures in the array,
+          where None represents as many structures as fit in the remainder of
+          the byte stream.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      list[object]: mapped values per structure.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    element_byte_size, number_of_elements = self._GetArrayElementsByteSize(
+        byte_stream, byte_offset, number_of_elements)
+
+    data_size = number_of_elements * element_byte_size
+
+    try:
+      if self._operation:
+        struct_tuples = self._operation.ReadArrayFrom(
+            byte_stream, number_of_elements, byte_offset=byte_offset)
+        values = list(itertools.starmap(
+            self._structure_values_class, struct_tuples))
+
+      else:
+        values = [
+            self._map_byte_stream(byte_stream, element_offset, None)
+            for element_offset in range(
+                byte_offset, byte_offset + data_size, element_byte_size)]
+
+    except Exception as exception:
+      raise errors.MappingError((
+          u'Unable to map array of structure: {0:s} at offset: {1:d} with '
+          u'error: {2!s}').format(
+              self._data_type_definition.name, byte_offset, exception))
+
+    if context:
+      context.byte_size = data_size
+
+    return values
+
+  def FoldInto(self, byte_stream, byte_offset, mapped_value):
+    """Folds the data type into an existing byte stream.
+
+    Args:
+      byte_stream (bytearray): writable byte stream.
+      byte_offset (int): offset into the byte stream where to start.
+      mapped_value (object): mapped value.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    try:
+      member_values = [
+          getattr(mapped_value, attribute_name)
+          for attribute_name in self._attribute_names]
+    except AttributeError as exception:
+      raise errors.FoldingError(
+          u'Unable to fold structure: {0:s} with error: {1!s}'.format(
+              self._data_type_definition.name, exception))
+
+    return self.FoldMemberValuesInto(byte_stream, byte_offset, member_values)
+
+  def FoldMemberValuesInto(self, byte_stream, byte_offset, member_values):
+    """Folds the values of the members into an existing byte stream.
+
+    Structures of which the members have a single byte-order and are folded
+    as-is are written by a single struct operation.
+
+    Args:
+      byte_stream (bytearray): writable byte stream.
+      byte_offset (int): offset into the byte stream where to start.
+      member_values (list[object]|tuple[object, ...]): values of the members
+          in the order of the structure definition.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    if len(member_values) != len(self._data_type_maps):
+      raise errors.FoldingError((
+          u'Unable to fold structure: {0:s} with unsupported number of '
+          u'member values: {1:d}').format(
+              self._data_type_definition.name, len(member_values)))
+
+    if self._operation:
+      try:
+        self._operation.WriteTo(
+            byte_stream, member_values, byte_offset=byte_offset)
+      except IOError as exception:
+        raise errors.FoldingError((
+            u'Unable to fold structure: {0:s} at offset: {1:d} with error: '
+            u'{2!s}').format(
+                self._data_type_definition.name, byte_offset, exception))
+
+      return self._data_type_definition.GetByteSize()
+
+    member_offset = byte_offset
+    for data_type_map, member_value in zip(
+        self._data_type_maps, member_values):
+      member_offset += data_type_map.FoldInto(
+          byte_stream, member_offset, member_value)
+
+    return member_offset - byte_offset
+
+  def GetAttributeNames(self):
+    """Determines the attribute (or field) names of the structure.
+
+    Returns:
+      list[str]: attribute names.
+    """
+    return self._attribute_names
+
+  def GetMemberDataTypeMaps(self):
+    """Retrieves the member data type maps.
+
+    Returns:
+      list[DataTypeMap]: member data type maps.
+    """
+    return self._data_type_maps
+
+  def GetNumPyDataType(self):
+    """Retrieves the NumPy structured data type of the structure.
+
+    Returns:
+      numpy.dtype: NumPy structured data type.
+
+    Raises:
+      FormatError: if NumPy is not available or if the NumPy data type cannot
+          be determed from the data type definition.
+    """
+    if self._numpy_data_type is None:
+      self._numpy_data_type = NumPyDataTypeFactory.CreateDataType(
+          self._data_type_definition)
+
+    return self._numpy_data_type
+
+  def GetStructureValuesClass(self):
+    """Retrieves the structure values class.
+
+    Returns:
+      class: structure values class.
+    """
+    return self._structure_values_class
+
+  def MapByteStreamNumPyArray(
+      self, byte_stream, byte_offset=0, number_of_elements=None, context=None):
+    """Maps an array of consecutive fixed-size structures on a byte stream.
+
+    The structures are mapped as a NumPy structured array, which is a view
+    on the byte stream and does not create an object per structure.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      number_of_elements (Optional[int]): number of structures in the array,
+          where None represents as many structures as fit in the remainder of
+          the byte stream.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      numpy.ndarray: NumPy structured array.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    try:
+      numpy_data_type = self.GetNumPyDataType()
+    except errors.FormatError as exception:
       raise errors.MappingError(exception)
 
-  def MapByteStream(self, byte_stream, **kwargs):
-    """Maps the data type on a byte stream.
+    element_byte_size, number_of_elements = self._GetArrayElementsByteSize(
+        byte_stream, byte_offset, number_of_elements)
+
+    try:
+      values = numpy.frombuffer(
+          byte_stream, dtype=numpy_data_type, count=number_of_elements,
+          offset=byte_offset)
+
+    except Exception as exception:
+      raise errors.MappingError((
+          u'Unable to map array of structure: {0:s} at offset: {1:d} with '
+          u'error: {2!s}').format(
+              self._data_type_definition.name, byte_offset, exception))
+
+    if context:
+      context.byte_size = number_of_elements * element_byte_size
+
+    return values
+
+  def MapMember(self, byte_stream, member_name, byte_offset=0, context=None):
+    """Maps a single member of the structure on a byte stream.
+
+    A member that is not preceded by a member with a variable size is mapped
+    directly at its offset, without mapping the other members.
 
     Args:
       byte_stream (bytes): byte stream.
-      context (Optional[object]): context.
+      member_name (str): name of the member.
+      byte_offset (Optional[int]): offset into the byte stream where the
+          structure starts.
+      context (Optional[DataTypeMapContext]): data type map context, where
+          the byte size is set to that of the member if it can be determined.
 
     Returns:
-      object: mapped value.
+      object: mapped value of the member.
 
     Raises:
       MappingError: if the data type definition cannot be mapped on
           the byte stream.
     """
-    return self._map_byte_stream(byte_stream, **kwargs)
+    map_member = self._GetMapMemberFunction(member_name)
+    if not map_member:
+      structure_values = self.MapByteStream(
+          byte_stream, byte_offset=byte_offset, members=[member_name])
+      if context:
+        context.byte_size = None
+      return getattr(structure_values, member_name)
+
+    try:
+      return map_member(byte_stream, byte_offset, context)
+
+    except Exception as exception:
+      raise errors.MappingError((
+          u'Unable to map member: {0:s} of structure: {1:s} at offset: {2:d} '
+          u'with error: {3!s}').format(
+              member_name, self._data_type_definition.name, byte_offset,
+              exception))
 
 
 class UUIDMap(DataTypeMap):
@@ -911,14 +3541,69 @@ class UUIDMap(DataTypeMap):
       FormatError: if the data type map cannot be determed from the data
           type definition.
     """
+    byte_order_string = self._GetStructByteOrderString(data_type_definition)
+    if byte_order_string == u'=':
+      is_little_endian = sys.byteorder == u'little'
+    else:
+      is_little_endian = byte_order_string == u'<'
+
     super(UUIDMap, self).__init__(data_type_definition)
-    self._operation = self._GetByteStreamOperation(data_type_definition)
+    self._is_little_endian = is_little_endian
+    self._operation = StructOperation(u'16s')
+
+  def _MapBytes(self, uuid_bytes):
+    """Maps the data type on the bytes of an UUID.
+
+    Args:
+      uuid_bytes (bytes): 16 bytes of the UUID.
+
+    Returns:
+      uuid.UUID: mapped value.
+
+    Raises:
+      ValueError: if the bytes cannot be mapped to an UUID.
+    """
+    if self._is_little_endian:
+      return uuid.UUID(bytes_le=uuid_bytes)
+
+    return uuid.UUID(bytes=uuid_bytes)
+
+  def FoldInto(self, byte_stream, byte_offset, mapped_value):
+    """Folds the data type into an existing byte stream.
+
+    Args:
+      byte_stream (bytearray): writable byte stream.
+      byte_offset (int): offset into the byte stream where to start.
+      mapped_value (uuid.UUID): mapped value.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    try:
+      if self._is_little_endian:
+        uuid_bytes = mapped_value.bytes_le
+      else:
+        uuid_bytes = mapped_value.bytes
+
+      self._operation.WriteTo(
+          byte_stream, (uuid_bytes, ), byte_offset=byte_offset)
+
+    except Exception as exception:
+      raise errors.FoldingError(exception)
+
+    return 16
 
-  def MapByteStream(self, byte_stream, context=None, **unused_kwargs):
+  def MapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
     """Maps the data type on a byte stream.
 
     Args:
       byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
       context (Optional[DataTypeMapContext]): data type map context.
 
     Returns:
@@ -929,30 +3614,73 @@ class UUIDMap(DataTypeMap):
           the byte stream.
     """
     if context:
-      context.byte_size = self._data_type_definition.GetByteSize()
+      context.byte_size = 16
 
     try:
-      struct_tuple = self._operation.ReadFrom(byte_stream)
-      uuid_string = (
-          u'{{{0:08x}-{1:04x}-{2:04x}-{3:02x}{4:02x}-'
-          u'{5:02x}{6:02x}{7:02x}{8:02x}{9:02x}{10:02x}}}').format(
-              *struct_tuple)
-      return uuid.UUID(uuid_string)
+      uuid_bytes = memoryview(byte_stream)[
+          byte_offset:byte_offset + 16].tobytes()
+      return self._MapBytes(uuid_bytes)
 
     except Exception as exception:
       raise errors.MappingError(exception)
 
+  def MapByteStreamArray(
+      self, byte_stream, byte_offset=0, number_of_elements=None, context=None):
+    """Maps an array of consecutive UUIDs on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      number_of_elements (Optional[int]): number of UUIDs in the array,
+          where None represents as many UUIDs as fit in the remainder of
+          the byte stream.
+      context (Optional[DataTypeMapContext]): data type map context.
+
+    Returns:
+      list[uuid.UUID]: mapped values.
+
+    Raises:
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    _, number_of_elements = self._GetArrayElementsByteSize(
+        byte_stream, byte_offset, number_of_elements)
+
+    data_size = number_of_elements * 16
+
+    try:
+      data = memoryview(byte_stream)[
+          byte_offset:byte_offset + data_size].tobytes()
+      if len(data) != data_size:
+        raise ValueError(
+            u'byte stream too small for {0:d} elements'.format(
+                number_of_elements))
+
+      map_bytes = self._MapBytes
+      values = [
+          map_bytes(data[data_offset:data_offset + 16])
+          for data_offset in range(0, data_size, 16)]
+
+    except Exception as exception:
+      raise errors.MappingError(
+          u'Unable to map array of UUIDs with error: {0!s}'.format(exception))
+
+    if context:
+      context.byte_size = data_size
+
+    return values
+
 
 class DataTypeMapFactory(object):
   """Factory for data type maps."""
 
   # TODO: add support for definitions.TYPE_INDICATOR_CONSTANT
-  # TODO: add support for definitions.TYPE_INDICATOR_ENUMERATION
   # TODO: add support for definitions.TYPE_INDICATOR_FORMAT
 
   _MAP_PER_DEFINITION = {
       definitions.TYPE_INDICATOR_BOOLEAN: BooleanMap,
       definitions.TYPE_INDICATOR_CHARACTER: CharacterMap,
+      definitions.TYPE_INDICATOR_ENUMERATION: EnumerationMap,
       definitions.TYPE_INDICATOR_FLOATING_POINT: FloatingPointMap,
       definitions.TYPE_INDICATOR_INTEGER: IntegerMap,
       definitions.TYPE_INDICATOR_SEQUENCE: SequenceMap,
@@ -967,11 +3695,17 @@ class DataTypeMapFactory(object):
           registry.
     """
     super(DataTypeMapFactory, self).__init__()
+    self._data_type_map_cache = {}
     self._definitions_registry = definitions_registry
+    self._registry_modification_count = None
 
   def CreateDataTypeMap(self, definition_name):
     """Creates a specific data type map by name.
 
+    Data type maps are cached and shared, including the data type maps of
+    structure members and sequence elements. The cache is invalidated when
+    a data type definition is registered or deregistered.
+
     Args:
       definition_name (str): name of the data type definition.
 
@@ -979,27 +3713,52 @@ class DataTypeMapFactory(object):
       DataTypeMap: data type map or None if the date type definition
           is not available.
     """
+    modification_count = self._definitions_registry.GetModificationCount()
+    if modification_count != self._registry_modification_count:
+      self._data_type_map_cache = {}
+      self._registry_modification_count = modification_count
+
     data_type_definition = self._definitions_registry.GetDefinitionByName(
         definition_name)
     if not data_type_definition:
       return
 
-    return DataTypeMapFactory.CreateDataTypeMapByType(data_type_definition)
+    return DataTypeMapFactory.CreateDataTypeMapByType(
+        data_type_definition, data_type_map_cache=self._data_type_map_cache)
 
   @classmethod
-  def CreateDataTypeMapByType(cls, data_type_definition):
+  def CreateDataTypeMapByType(
+      cls, data_type_definition, data_type_map_cache=None):
     """Creates a specific data type map by type indicator.
 
     Args:
       data_type_definition (DataTypeDefinition): data type definition.
+      data_type_map_cache (Optional[dict[DataTypeDefinition, DataTypeMap]]):
+          cached data type maps, where None represents no caching.
 
     Returns:
       DataTypeMap: data type map or None if the date type definition
           is not available.
     """
+    if data_type_map_cache is not None:
+      data_type_map = data_type_map_cache.get(data_type_definition, None)
+      if data_type_map is not None:
+        return data_type_map
+
     data_type_map_class = cls._MAP_PER_DEFINITION.get(
         data_type_definition.TYPE_INDICATOR, None)
     if not data_type_map_class:
       return
 
-    return data_type_map_class(data_type_definition)
+    # Composite data type maps share the cache with the data type maps of
+    # their members or elements.
+    if issubclass(data_type_map_class, (SequenceMap, StructureMap)):
+      data_type_map = data_type_map_class(
+          data_type_definition, data_type_map_cache=data_type_map_cache)
+    else:
+      data_type_map = data_type_map_class(data_type_definition)
+
+    if data_type_map_cache is not None:
+      data_type_map_cache[data_type_definition] = data_type_map
+
+    return data_type_map
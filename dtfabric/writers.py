@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Writers to fold records into files or memory maps."""
+
+from dtfabric import errors
+from dtfabric import runtime
+
+
+class RecordWriter(object):
+  """Record writer.
+
+  Folds records into a reusable chunk buffer that is written to a file-like
+  object with a single write per chunk. If the output is a writable buffer,
+  such as a memory map or bytearray, the records are folded directly into
+  the output instead.
+
+  Records of a structure can be provided as structure values, as tuples of
+  the member values in the order of the structure definition or as
+  dictionaries of the member values per member name.
+
+  Close must be called after the last records have been written, which
+  writes the remaining records to a file-like object and releases the view
+  of a writable buffer, so that a memory map can be closed.
+  """
+
+  _DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+  def __init__(self, data_type_map, output, byte_offset=0, chunk_size=None):
+    """Initializes a record writer.
+
+    Args:
+      data_type_map (DataTypeMap): data type map of the records.
+      output (bytearray|file|mmap.mmap): file-like object or writable buffer
+          to write the records to.
+      byte_offset (Optional[int]): offset into the writable buffer where to
+          start, which is ignored for a file-like object.
+      chunk_size (Optional[int]): size of the chunk buffer in bytes, where
+          None represents the default.
+
+    Raises:
+      ValueError: if the chunk size is invalid.
+    """
+    if chunk_size is None:
+      chunk_size = self._DEFAULT_CHUNK_SIZE
+
+    if chunk_size <= 0:
+      raise ValueError(u'Invalid chunk size: {0:d}'.format(chunk_size))
+
+    try:
+      output_view = memoryview(output)
+    except TypeError:
+      output_view = None
+
+    if output_view is not None and output_view.readonly:
+      output_view = None
+
+    record_byte_size = data_type_map.GetByteSize()
+    if output_view is None:
+      if record_byte_size:
+        # Only complete records are folded into a chunk.
+        chunk_size = max(chunk_size // record_byte_size, 1) * record_byte_size
+
+      chunk_view = memoryview(bytearray(chunk_size))
+      byte_offset = 0
+    else:
+      chunk_view = output_view
+
+    attribute_names = None
+    if isinstance(data_type_map, runtime.StructureMap):
+      attribute_names = data_type_map.GetAttributeNames()
+
+    super(RecordWriter, self).__init__()
+    self._attribute_names = attribute_names
+    self._byte_offset = byte_offset
+    self._chunk_view = chunk_view
+    self._data_type_map = data_type_map
+    self._file_object = output if output_view is None else None
+    self._record_byte_size = record_byte_size
+
+  def _FoldRecord(self, byte_offset, record):
+    """Folds a record into the chunk or output buffer.
+
+    Args:
+      byte_offset (int): offset into the chunk or output buffer.
+      record (object): record.
+
+    Returns:
+      int: number of bytes written.
+
+    Raises:
+      FoldingError: if the record cannot be folded.
+    """
+    if self._attribute_names is not None:
+      if isinstance(record, dict):
+        try:
+          record = tuple([
+              record[attribute_name]
+              for attribute_name in self._attribute_names])
+        except KeyError as exception:
+          raise errors.FoldingError(
+              u'Missing value of member: {0!s}'.format(exception))
+
+      if isinstance(record, tuple):
+        return self._data_type_map.FoldMemberValuesInto(
+            self._chunk_view, byte_offset, record)
+
+    return self._data_type_map.FoldInto(self._chunk_view, byte_offset, record)
+
+  def _FoldRecordByteStream(self, record):
+    """Folds a record into a byte stream.
+
+    Args:
+      record (object): record.
+
+    Returns:
+      bytes: byte stream.
+
+    Raises:
+      FoldingError: if the record cannot be folded.
+    """
+    if self._attribute_names is not None:
+      structure_values_class = self._data_type_map.GetStructureValuesClass()
+      try:
+        if isinstance(record, dict):
+          record = structure_values_class(**record)
+        elif isinstance(record, tuple):
+          record = structure_values_class(*record)
+
+      except TypeError as exception:
+        raise errors.FoldingError(
+            u'Unable to fold record with error: {0!s}'.format(exception))
+
+    return self._data_type_map.FoldByteStream(record)
+
+  def Close(self):
+    """Closes the record writer."""
+    self.Flush()
+
+    # Note that memoryview.release is not supported by Python 2.
+    if hasattr(self._chunk_view, u'release'):
+      self._chunk_view.release()
+
+  def Flush(self):
+    """Writes the records in the chunk buffer to the file-like object."""
+    if self._file_object and self._byte_offset:
+      self._file_object.write(self._chunk_view[:self._byte_offset])
+      self._byte_offset = 0
+
+  def WriteRecords(self, records):
+    """Writes records.
+
+    The records are written to the file-like object when the chunk buffer is
+    full or the writer is flushed.
+
+    Args:
+      records (iterable[object]): records.
+
+    Returns:
+      int: number of records written.
+
+    Raises:
+      FoldingError: if a record cannot be folded or does not fit in the
+          output buffer.
+    """
+    number_of_records = 0
+    chunk_size = len(self._chunk_view)
+
+    for record in records:
+      if not self._file_object:
+        self._byte_offset += self._FoldRecord(self._byte_offset, record)
+
+      elif self._record_byte_size:
+        if self._byte_offset + self._record_byte_size > chunk_size:
+          self.Flush()
+
+        self._byte_offset += self._FoldRecord(self._byte_offset, record)
+
+      else:
+        # The byte size of a record with a variable size is only known after
+        # it has been folded.
+        byte_stream = self._FoldRecordByteStream(record)
+        record_byte_size = len(byte_stream)
+
+        if self._byte_offset + record_byte_size > chunk_size:
+          self.Flush()
+
+        if record_byte_size > chunk_size:
+          self._file_object.write(byte_stream)
+        else:
+          end_offset = self._byte_offset + record_byte_size
+          self._chunk_view[self._byte_offset:end_offset] = byte_stream
+          self._byte_offset = end_offset
+
+      number_of_records += 1
+
+    return number_of_records
@@ -0,0 +1,216 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark dtFabric data type maps."""
+
+from __future__ import print_function
+import argparse
+import io
+import struct
+import sys
+import time
+
+try:
+  import tracemalloc
+except ImportError:
+  tracemalloc = None
+
+from dtfabric import reader
+from dtfabric import registry
+from dtfabric import runtime
+
+
+class DataTypeMapBenchmark(object):
+  """Class that defines a dtFabric data type map benchmark."""
+
+  _DEFINITIONS = b'\n'.join([
+      b'name: int32',
+      b'type: integer',
+      b'attributes:',
+      b'  byte_order: little-endian',
+      b'  format: signed',
+      b'  size: 4',
+      b'  units: bytes',
+      b'---',
+      b'name: point3d',
+      b'type: structure',
+      b'members:',
+      b'- name: x',
+      b'  data_type: int32',
+      b'- name: y',
+      b'  data_type: int32',
+      b'- name: z',
+      b'  data_type: int32',
+      b'---',
+      b'name: point3d_list',
+      b'type: structure',
+      b'members:',
+      b'- name: number_of_points',
+      b'  data_type: int32',
+      b'- name: points',
+      b'  type: sequence',
+      b'  element_data_type: point3d',
+      b'  number_of_elements: point3d_list.number_of_points'])
+
+  def __init__(self):
+    """Initializes a dtFabric data type map benchmark."""
+    super(DataTypeMapBenchmark, self).__init__()
+    self._definitions_registry = registry.DataTypeDefinitionsRegistry()
+
+    definitions_reader = reader.YAMLDataTypeDefinitionsFileReader()
+    file_object = io.BytesIO(self._DEFINITIONS)
+    definitions_reader.ReadFileObject(self._definitions_registry, file_object)
+
+    self._data_type_map_factory = runtime.DataTypeMapFactory(
+        self._definitions_registry)
+
+  def _CreateByteStream(self, number_of_points):
+    """Creates a byte stream containing a list of points.
+
+    Args:
+      number_of_points (int): number of points in the list.
+
+    Returns:
+      bytes: byte stream.
+    """
+    byte_values = [struct.pack(u'<i', number_of_points)]
+    for index in range(number_of_points):
+      byte_values.append(struct.pack(u'<iii', index, index + 1, index + 2))
+
+    return b''.join(byte_values)
+
+  def BenchmarkMapByteStream(self, maximum_number_of_points):
+    """Benchmarks mapping byte streams of increasing size.
+
+    The number of points is doubled every iteration, if mapping scales
+    linearly the time per point remains about the same.
+
+    Args:
+      maximum_number_of_points (int): maximum number of points in the list.
+    """
+    data_type_map = self._data_type_map_factory.CreateDataTypeMap(
+        u'point3d_list')
+
+    print(u'{0:>10s} {1:>12s} {2:>12s} {3:>14s}'.format(
+        u'Points', u'Bytes', u'Seconds', u'Microseconds'))
+
+    number_of_points = 1024
+    while number_of_points <= maximum_number_of_points:
+      byte_stream = self._CreateByteStream(number_of_points)
+
+      start_time = time.time()
+      data_type_map.MapByteStream(byte_stream)
+      elapsed_time = time.time() - start_time
+
+      microseconds_per_point = (elapsed_time * 1000000.0) / number_of_points
+      print(u'{0:10d} {1:12d} {2:12.6f} {3:14.3f}'.format(
+          number_of_points, len(byte_stream), elapsed_time,
+          microseconds_per_point))
+
+      number_of_points *= 2
+
+  def BenchmarkMemoryUsage(self, number_of_instances):
+    """Benchmarks the memory usage of structure values.
+
+    Args:
+      number_of_instances (int): number of structure values instances to
+          create per structure values class.
+    """
+    data_type_definition = self._definitions_registry.GetDefinitionByName(
+        u'point3d')
+
+    class DictStructureValues(object):
+      """Structure values with a per-instance __dict__ for comparison."""
+
+      def __init__(self, x=None, y=None, z=None):
+        """Initializes structure values."""
+        super(DictStructureValues, self).__init__()
+        self.x = x
+        self.y = y
+        self.z = z
+
+    structure_values_classes = [
+        (u'__dict__', DictStructureValues),
+        (u'__slots__', runtime.StructureValuesClassFactory.CreateClass(
+            data_type_definition)),
+        (u'named tuple', runtime.StructureValuesClassFactory.CreateClass(
+            data_type_definition, named_tuple=True))]
+
+    print(u'{0:<12s} {1:>10s} {2:>16s}'.format(
+        u'Class', u'Instances', u'Bytes/instance'))
+
+    for description, structure_values_class in structure_values_classes:
+      if tracemalloc:
+        tracemalloc.start()
+
+      # Use the same large integer values for every instance so that only
+      # the memory usage of the instances is measured.
+      instances = [
+          structure_values_class(x=1000, y=2000, z=3000)
+          for _ in range(number_of_instances)]
+
+      if tracemalloc:
+        memory_usage, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Exclude the memory used by the list that holds the instances.
+        memory_usage -= sys.getsizeof(instances)
+
+      else:
+        instance = instances[0]
+        memory_usage = sys.getsizeof(instance)
+        if hasattr(instance, u'__dict__'):
+          memory_usage += sys.getsizeof(instance.__dict__)
+
+        memory_usage *= number_of_instances
+
+      print(u'{0:<12s} {1:10d} {2:16.1f}'.format(
+          description, number_of_instances,
+          float(memory_usage) / number_of_instances))
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(
+      description=u'Benchmarks dtFabric data type maps.')
+
+  argument_parser.add_argument(
+      u'benchmark', nargs=u'?', action=u'store', metavar=u'BENCHMARK',
+      default=u'map', choices=[u'map', u'memory'], help=(
+          u'benchmark to run, either "map" to benchmark mapping byte streams '
+          u'of increasing size or "memory" to benchmark the memory usage of '
+          u'the structure values classes.'))
+
+  argument_parser.add_argument(
+      u'--maximum_number_of_points', u'--maximum-number-of-points',
+      dest=u'maximum_number_of_points', type=int, action=u'store',
+      metavar=u'NUMBER', default=131072, help=(
+          u'maximum number of points to map, the number of points starts at '
+          u'1024 and is doubled every iteration.'))
+
+  argument_parser.add_argument(
+      u'--number_of_instances', u'--number-of-instances',
+      dest=u'number_of_instances', type=int, action=u'store',
+      metavar=u'NUMBER', default=100000, help=(
+          u'number of structure values instances to create per structure '
+          u'values class.'))
+
+  options = argument_parser.parse_args()
+
+  benchmark = DataTypeMapBenchmark()
+  if options.benchmark == u'memory':
+    benchmark.BenchmarkMemoryUsage(options.number_of_instances)
+  else:
+    benchmark.BenchmarkMapByteStream(options.maximum_number_of_points)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
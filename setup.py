@@ -19,6 +19,11 @@ try:
 except ImportError:
   from distutils.command.bdist_rpm import bdist_rpm
 
+try:
+  from setuptools.command.build_py import build_py
+except ImportError:
+  from distutils.command.build_py import build_py
+
 if sys.version < '2.7':
   print('Unsupported Python version: {0:s}.'.format(sys.version))
   print('Supported Python versions are 2.7 or a later 2.x version.')
@@ -96,6 +101,34 @@ class BdistRPMCommand(bdist_rpm):
     return python_spec_file
 
 
+class BuildPyCommand(build_py):
+  """Custom handler for the build_py command."""
+
+  def find_package_modules(self, package, package_dir):
+    """Finds the modules of a package.
+
+    The asynchronous module requires Python 3.7 or later, hence it is not
+    built, nor byte-compiled when installed, for earlier versions.
+
+    Args:
+      package (str): name of the package.
+      package_dir (str): path of the package directory.
+
+    Returns:
+      list[tuple[str, str, str]]: package, module name and path per module.
+    """
+    # Note that build_py can be an old style class.
+    modules = build_py.find_package_modules(self, package, package_dir)
+
+    if sys.version_info < (3, 7):
+      modules = [
+          (module_package, module_name, module_path)
+          for module_package, module_name, module_path in modules
+          if (module_package, module_name) != ('dtfabric', 'asynchronous')]
+
+    return modules
+
+
 class TestCommand(Command):
   """Run tests, implementing an interface."""
   user_options = []
@@ -141,6 +174,7 @@ setup(
     ],
     cmdclass={
         'bdist_rpm': BdistRPMCommand,
+        'build_py': BuildPyCommand,
         'test': TestCommand},
     packages=find_packages('.', exclude=[
         'tests', 'tests.*', 'utils']),
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""Tests for the objects to map data types from asyncio code."""
+
+import io
+import struct
+import sys
+import unittest
+
+# The asynchronous module requires Python 3.7 or later.
+if sys.version_info >= (3, 7):
+  import asyncio
+  from concurrent import futures
+  from dtfabric import asynchronous
+else:
+  asynchronous = None
+
+from dtfabric import errors
+
+from tests import test_lib
+
+
+_YAML_DEFINITION = b'\n'.join([
+    b'name: int32',
+    b'type: integer',
+    b'attributes:',
+    b'  byte_order: little-endian',
+    b'  format: signed',
+    b'  size: 4',
+    b'  units: bytes',
+    b'---',
+    b'name: pair',
+    b'type: structure',
+    b'members:',
+    b'- name: first',
+    b'  data_type: int32',
+    b'- name: second',
+    b'  data_type: int32',
+    b'---',
+    b'name: int32_list',
+    b'type: structure',
+    b'members:',
+    b'- name: number_of_values',
+    b'  data_type: int32',
+    b'- name: values',
+    b'  type: sequence',
+    b'  element_data_type: int32',
+    b'  number_of_elements: int32_list.number_of_values'])
+
+
+@unittest.skipUnless(asynchronous, u'requires Python 3.7 or later')
+class AsyncDataTypeMapTest(test_lib.BaseTestCase):
+  """Data type map for asyncio code tests."""
+
+  def _IterateRecords(self, async_data_type_map, source):
+    """Iterates over the records in a source within an event loop.
+
+    Args:
+      async_data_type_map (AsyncDataTypeMap): data type map for asyncio code.
+      source (asyncio.StreamReader|file): asyncio stream or file-like object.
+
+    Returns:
+      list[object]: mapped records.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+      records = []
+      async_iterator = async_data_type_map.IterateRecords(source)
+      while True:
+        try:
+          records.append(loop.run_until_complete(async_iterator.__anext__()))
+        except StopAsyncIteration:  # pylint: disable=undefined-variable
+          break
+
+    finally:
+      loop.close()
+
+    return records
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    async_data_type_map = asynchronous.AsyncDataTypeMap(
+        _YAML_DEFINITION, u'pair')
+    self.assertIsNotNone(async_data_type_map)
+
+    with self.assertRaises(errors.FormatError):
+      asynchronous.AsyncDataTypeMap(_YAML_DEFINITION, u'bogus')
+
+  def testIterateRecords(self):
+    """Tests the IterateRecords function."""
+    async_data_type_map = asynchronous.AsyncDataTypeMap(
+        _YAML_DEFINITION, u'pair', read_size=20)
+
+    byte_stream = b''.join([
+        struct.pack(u'<ii', value, value + 1) for value in range(10)])
+
+    records = self._IterateRecords(
+        async_data_type_map, io.BytesIO(byte_stream))
+    self.assertEqual(
+        [(pair.first, pair.second) for pair in records],
+        [(value, value + 1) for value in range(10)])
+
+    with self.assertRaises(errors.MappingError):
+      self._IterateRecords(async_data_type_map, io.BytesIO(byte_stream[:-2]))
+
+    byte_values = []
+    for number_of_values in range(6):
+      byte_values.append(struct.pack(u'<i', number_of_values))
+      byte_values.extend([
+          struct.pack(u'<i', value) for value in range(number_of_values)])
+
+    byte_stream = b''.join(byte_values)
+
+    async_data_type_map = asynchronous.AsyncDataTypeMap(
+        _YAML_DEFINITION, u'int32_list', read_size=7)
+
+    records = self._IterateRecords(
+        async_data_type_map, io.BytesIO(byte_stream))
+    self.assertEqual(
+        [record.values for record in records],
+        [tuple(range(number_of_values)) for number_of_values in range(6)])
+
+    with self.assertRaises(errors.MappingError):
+      self._IterateRecords(async_data_type_map, io.BytesIO(byte_stream[:-2]))
+
+  def testIterateRecordsWithLargeRecord(self):
+    """Tests the IterateRecords function with a record of many reads."""
+    async_data_type_map = asynchronous.AsyncDataTypeMap(
+        _YAML_DEFINITION, u'int32_list', read_size=16)
+
+    submitted_batch_sizes = []
+    submit_batch = async_data_type_map._SubmitBatch
+
+    def _SubmitBatch(byte_stream):
+      """Submits a batch of records and tracks its size."""
+      submitted_batch_sizes.append(len(byte_stream))
+      return submit_batch(byte_stream)
+
+    async_data_type_map._SubmitBatch = _SubmitBatch
+
+    byte_values = [struct.pack(u'<i', 4096)]
+    byte_values.extend([struct.pack(u'<i', value) for value in range(4096)])
+    byte_stream = b''.join(byte_values)
+
+    records = self._IterateRecords(
+        async_data_type_map, io.BytesIO(byte_stream))
+    self.assertEqual(len(records), 1)
+    self.assertEqual(records[0].values, tuple(range(4096)))
+
+    # The partial record is only mapped again once the data has doubled.
+    self.assertLess(len(submitted_batch_sizes), 20)
+    self.assertLess(sum(submitted_batch_sizes), 4 * len(byte_stream))
+
+  def testIterateRecordsWithProcessPoolExecutor(self):
+    """Tests the IterateRecords function with a process pool executor."""
+    byte_stream = b''.join([
+        struct.pack(u'<ii', value, value + 1) for value in range(10)])
+
+    with futures.ProcessPoolExecutor(max_workers=2) as executor:
+      async_data_type_map = asynchronous.AsyncDataTypeMap(
+          _YAML_DEFINITION, u'pair', executor=executor, read_size=16)
+
+      records = self._IterateRecords(
+          async_data_type_map, io.BytesIO(byte_stream))
+
+    self.assertEqual(
+        [(pair.first, pair.second) for pair in records],
+        [(value, value + 1) for value in range(10)])
+
+  def testMapByteStream(self):
+    """Tests the MapByteStream function."""
+    async_data_type_map = asynchronous.AsyncDataTypeMap(
+        _YAML_DEFINITION, u'pair')
+
+    loop = asyncio.new_event_loop()
+    try:
+      pair = loop.run_until_complete(async_data_type_map.MapByteStream(
+          b'\xff\xff\x01\x00\x00\x00\x02\x00\x00\x00', byte_offset=2))
+      self.assertEqual(pair.first, 1)
+      self.assertEqual(pair.second, 2)
+
+      with self.assertRaises(errors.MappingError):
+        loop.run_until_complete(async_data_type_map.MapByteStream(b'\x01'))
+
+    finally:
+      loop.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
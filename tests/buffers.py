@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Tests for the buffers."""
+
+import io
+import os
+import tempfile
+import unittest
+
+from dtfabric import buffers
+
+from tests import test_lib
+
+
+@test_lib.skipUnlessHasTestFile([u'integer.yaml'])
+class MemoryMappedFileBufferTest(test_lib.BaseTestCase):
+  """Memory-mapped file buffer tests."""
+
+  def testGetSize(self):
+    """Tests the GetSize function."""
+    test_file_path = self._GetTestFilePath([u'integer.yaml'])
+    with open(test_file_path, 'rb') as file_object:
+      file_data = file_object.read()
+
+      memory_mapped_file_buffer = buffers.MemoryMappedFileBuffer(file_object)
+      self.assertEqual(memory_mapped_file_buffer.GetSize(), len(file_data))
+      memory_mapped_file_buffer.Close()
+
+  def testReadAt(self):
+    """Tests the ReadAt function."""
+    test_file_path = self._GetTestFilePath([u'integer.yaml'])
+    with open(test_file_path, 'rb') as file_object:
+      file_data = file_object.read()
+
+      memory_mapped_file_buffer = buffers.MemoryMappedFileBuffer(file_object)
+
+      data = memory_mapped_file_buffer.ReadAt(2, 8)
+      self.assertIsInstance(data, memoryview)
+      self.assertEqual(data.tobytes(), file_data[2:10])
+
+      data = memory_mapped_file_buffer.ReadAt(len(file_data) - 4, 8)
+      self.assertEqual(data.tobytes(), file_data[-4:])
+
+      data = memory_mapped_file_buffer.ReadAt(len(file_data) + 4, 8)
+      self.assertEqual(data.tobytes(), b'')
+
+      with self.assertRaises(ValueError):
+        memory_mapped_file_buffer.ReadAt(-1, 4)
+
+      with self.assertRaises(ValueError):
+        memory_mapped_file_buffer.ReadAt(0, -1)
+
+      del data
+
+      memory_mapped_file_buffer.Close()
+
+      with self.assertRaises(ValueError):
+        memory_mapped_file_buffer.ReadAt(0, 4)
+
+  def testReadAtWithEmptyFile(self):
+    """Tests the ReadAt function with an empty file."""
+    file_descriptor, test_file_path = tempfile.mkstemp()
+    os.close(file_descriptor)
+
+    try:
+      with open(test_file_path, 'rb') as file_object:
+        memory_mapped_file_buffer = buffers.MemoryMappedFileBuffer(file_object)
+        self.assertEqual(memory_mapped_file_buffer.GetSize(), 0)
+
+        data = memory_mapped_file_buffer.ReadAt(0, 4)
+        self.assertEqual(data.tobytes(), b'')
+
+        del data
+
+        memory_mapped_file_buffer.Close()
+
+    finally:
+      os.remove(test_file_path)
+
+
+class ReadAheadBufferTest(test_lib.BaseTestCase):
+  """Read-ahead buffer tests."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    file_object = io.BytesIO(b'')
+
+    read_ahead_buffer = buffers.ReadAheadBuffer(file_object)
+    self.assertIsNotNone(read_ahead_buffer)
+
+    with self.assertRaises(ValueError):
+      buffers.ReadAheadBuffer(file_object, read_ahead_size=0)
+
+  def testReadAt(self):
+    """Tests the ReadAt function."""
+    file_object = io.BytesIO(bytes(bytearray(range(64))))
+
+    read_ahead_buffer = buffers.ReadAheadBuffer(
+        file_object, read_ahead_size=16)
+
+    data = read_ahead_buffer.ReadAt(4, 4)
+    self.assertEqual(data.tobytes(), b'\x04\x05\x06\x07')
+
+    # Data within the read-ahead is not read from the file-like object again.
+    file_object.seek(0, io.SEEK_SET)
+    data = read_ahead_buffer.ReadAt(8, 12)
+    self.assertEqual(file_object.tell(), 0)
+    self.assertEqual(data.tobytes(), bytes(bytearray(range(8, 20))))
+
+    data = read_ahead_buffer.ReadAt(2, 4)
+    self.assertEqual(data.tobytes(), b'\x02\x03\x04\x05')
+
+    data = read_ahead_buffer.ReadAt(60, 8)
+    self.assertEqual(data.tobytes(), b'\x3c\x3d\x3e\x3f')
+
+    data = read_ahead_buffer.ReadAt(128, 8)
+    self.assertEqual(data.tobytes(), b'')
+
+    with self.assertRaises(ValueError):
+      read_ahead_buffer.ReadAt(-1, 4)
+
+    with self.assertRaises(ValueError):
+      read_ahead_buffer.ReadAt(0, -1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -496,6 +496,32 @@ class StructureDefinitionTest(test_lib.BaseTestCase):
     byte_size = data_type_definition.GetByteSize()
     self.assertEqual(byte_size, 4)
 
+  def testGetMemberOffsets(self):
+    """Tests the GetMemberOffsets function."""
+    data_type_definition = data_types.StructureDefinition(
+        u'my_struct_type', aliases=[u'MY_STRUCT_TYPE'],
+        description=u'my structure type')
+
+    member_offsets = data_type_definition.GetMemberOffsets()
+    self.assertEqual(member_offsets, {})
+
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+
+    member_offsets = data_type_definition.GetMemberOffsets()
+    self.assertEqual(member_offsets, {u'a': 0, u'b': 12, u'c': 24})
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+
+    member_offsets = data_type_definition.GetMemberOffsets()
+    self.assertEqual(
+        member_offsets, {u'number_of_triangles': 0, u'triangles': 4})
+
   def testGetStructFormatString(self):
     """Tests the GetStructFormatString function."""
     data_type_definition = data_types.StructureDefinition(
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Tests for the objects to map records in parallel."""
+
+import struct
+import unittest
+
+from dtfabric import errors
+from dtfabric import parallel
+
+from tests import test_lib
+
+
+_YAML_DEFINITION = b'\n'.join([
+    b'name: int32',
+    b'type: integer',
+    b'attributes:',
+    b'  byte_order: little-endian',
+    b'  format: signed',
+    b'  size: 4',
+    b'  units: bytes',
+    b'---',
+    b'name: pair',
+    b'type: structure',
+    b'members:',
+    b'- name: first',
+    b'  data_type: int32',
+    b'- name: second',
+    b'  data_type: int32'])
+
+
+def _GetSum(record):
+  """Retrieves the sum of the members of a pair record.
+
+  Args:
+    record (pair): pair record.
+
+  Returns:
+    int: sum of the members.
+  """
+  return record.first + record.second
+
+
+@unittest.skipUnless(parallel.futures, u'missing concurrent.futures support')
+@test_lib.skipUnlessHasTestFile([u'integer.yaml'])
+class ParallelMapperTest(test_lib.BaseTestCase):
+  """Parallel mapper tests."""
+
+  # pylint: disable=protected-access
+
+  def _GetExpectedPairs(self, path):
+    """Retrieves the expected pairs of a test file.
+
+    Args:
+      path (str): path of the test file.
+
+    Returns:
+      list[tuple[int, int]]: expected pairs.
+    """
+    with open(path, 'rb') as file_object:
+      file_data = file_object.read()
+
+    number_of_pairs = len(file_data) // 8
+    return [
+        struct.unpack_from(u'<ii', file_data, index * 8)
+        for index in range(number_of_pairs)]
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    parallel_mapper = parallel.ParallelMapper(_YAML_DEFINITION, u'pair')
+    self.assertIsNotNone(parallel_mapper)
+
+    with self.assertRaises(errors.FormatError):
+      parallel.ParallelMapper(_YAML_DEFINITION, u'bogus')
+
+  def testComposeValue(self):
+    """Tests the ComposeValue and DecomposeValue functions."""
+    parallel_mapper = parallel.ParallelMapper(_YAML_DEFINITION, u'pair')
+    data_type_map = parallel_mapper._data_type_map
+
+    pair = data_type_map.MapByteStream(struct.pack(u'<ii', 1, 2))
+
+    value = parallel.DecomposeValue(data_type_map, pair)
+    self.assertEqual(value, (1, 2))
+
+    pair = parallel.ComposeValue(data_type_map, value)
+    self.assertEqual(pair.first, 1)
+    self.assertEqual(pair.second, 2)
+
+  def testMapChunks(self):
+    """Tests the MapChunks function."""
+    test_file_path = self._GetTestFilePath([u'integer.yaml'])
+    expected_pairs = self._GetExpectedPairs(test_file_path)
+
+    parallel_mapper = parallel.ParallelMapper(
+        _YAML_DEFINITION, u'pair', maximum_number_of_processes=2)
+
+    chunks = [(0, 16), (16, 40), (40, 48)]
+    pairs = [
+        (pair.first, pair.second)
+        for pair in parallel_mapper.MapChunks(test_file_path, chunks)]
+    self.assertEqual(pairs, expected_pairs[:6])
+
+  def testMapFile(self):
+    """Tests the MapFile function."""
+    test_file_path = self._GetTestFilePath([u'integer.yaml'])
+    expected_pairs = self._GetExpectedPairs(test_file_path)
+
+    parallel_mapper = parallel.ParallelMapper(
+        _YAML_DEFINITION, u'pair', maximum_number_of_processes=2,
+        number_of_records_per_task=3)
+
+    pairs = [
+        (pair.first, pair.second)
+        for pair in parallel_mapper.MapFile(test_file_path)]
+    self.assertEqual(pairs, expected_pairs)
+
+    sums = parallel_mapper.MapFile(
+        test_file_path, byte_offset=8, number_of_records=5, ordered=False,
+        record_function=_GetSum)
+    expected_sums = [first + second for first, second in expected_pairs[1:6]]
+    self.assertEqual(sorted(sums), sorted(expected_sums))
+
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapRecords(self):
+    """Tests the _MapRecords function."""
+    test_file_path = self._GetTestFilePath([u'integer.yaml'])
+    expected_pairs = self._GetExpectedPairs(test_file_path)
+
+    # The worker process state is initialized by the first task.
+    pairs = parallel._MapRecords(
+        _YAML_DEFINITION, u'pair', test_file_path, 0, 2, None, None)
+    self.assertEqual(pairs, expected_pairs[:2])
+
+    data_type_map = parallel._worker_process_state[u'data_type_map']
+
+    pairs = parallel._MapRecords(
+        _YAML_DEFINITION, u'pair', test_file_path, 8, None, 24, None)
+    self.assertEqual(pairs, expected_pairs[1:3])
+    self.assertIs(
+        parallel._worker_process_state[u'data_type_map'], data_type_map)
+
+    sums = parallel._MapRecords(
+        _YAML_DEFINITION, u'pair', test_file_path, 0, 2, None, _GetSum)
+    self.assertEqual(
+        sums, [first + second for first, second in expected_pairs[:2]])
+
+    memory_mapped_file_buffer = parallel._worker_process_state[
+        u'memory_mapped_file_buffer']
+
+    # The worker process state is initialized again for another file.
+    test_file_path = self._GetTestFilePath([u'structure.yaml'])
+    expected_pairs = self._GetExpectedPairs(test_file_path)
+
+    pairs = parallel._MapRecords(
+        _YAML_DEFINITION, u'pair', test_file_path, 0, 2, None, None)
+    self.assertEqual(pairs, expected_pairs[:2])
+    self.assertIsNone(memory_mapped_file_buffer._memory_map)
+
+
+if __name__ == '__main__':
+  unittest.main()
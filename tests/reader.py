@@ -710,6 +710,8 @@ class YAMLDataTypeDefinitionsFileReaderTest(test_lib.BaseTestCase):
     self.assertEqual(
         data_type_definition.description, u'Point in 3 dimensional space.')
     self.assertEqual(data_type_definition.aliases, [u'POINT'])
+    self.assertEqual(
+        data_type_definition.byte_order, definitions.BYTE_ORDER_LITTLE_ENDIAN)
 
     self.assertEqual(len(data_type_definition.members), 3)
 
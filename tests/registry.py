@@ -65,6 +65,27 @@ class DataTypeDefinitionsRegistryTest(test_lib.BaseTestCase):
 
     definitions_registry.DeregisterDefinition(data_type_definition)
 
+  def testGetModificationCount(self):
+    """Tests the GetModificationCount function."""
+    definitions_registry = registry.DataTypeDefinitionsRegistry()
+
+    modification_count = definitions_registry.GetModificationCount()
+    self.assertEqual(modification_count, 0)
+
+    data_type_definition = data_types.IntegerDefinition(
+        u'int32', aliases=[u'LONG', u'LONG32'],
+        description=u'signed 32-bit integer')
+
+    definitions_registry.RegisterDefinition(data_type_definition)
+
+    modification_count = definitions_registry.GetModificationCount()
+    self.assertEqual(modification_count, 1)
+
+    definitions_registry.DeregisterDefinition(data_type_definition)
+
+    modification_count = definitions_registry.GetModificationCount()
+    self.assertEqual(modification_count, 2)
+
   def testGetDefinitions(self):
     """Tests the GetDefinitions function."""
     definitions_registry = registry.DataTypeDefinitionsRegistry()
@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
 """Tests for the run-time object."""
 
+import array
+import io
+import struct
 import unittest
 import uuid
 
+from dtfabric import buffers
 from dtfabric import data_types
 from dtfabric import definitions
 from dtfabric import errors
+from dtfabric import py2to3
 from dtfabric import runtime
 
 from tests import test_lib
@@ -71,12 +76,47 @@ class StructOperationTest(test_lib.BaseTestCase):
     value = byte_stream_operation.ReadFrom(b'\x12\x34\x56\x78')
     self.assertEqual(value, (0x78563412, ))
 
+    value = byte_stream_operation.ReadFrom(
+        b'\xff\xff\x12\x34\x56\x78', byte_offset=2)
+    self.assertEqual(value, (0x78563412, ))
+
     with self.assertRaises(IOError):
       byte_stream_operation.ReadFrom(None)
 
     with self.assertRaises(IOError):
       byte_stream_operation.ReadFrom(b'\x12\x34\x56')
 
+  def testReadArrayFrom(self):
+    """Tests the ReadArrayFrom function."""
+    byte_stream_operation = runtime.StructOperation(u'<h')
+
+    values = byte_stream_operation.ReadArrayFrom(
+        b'\xff\x01\x00\x02\x00\x03\x00', 3, byte_offset=1)
+    self.assertEqual(list(values), [(1, ), (2, ), (3, )])
+
+    values = byte_stream_operation.ReadArrayFrom(b'', 0)
+    self.assertEqual(list(values), [])
+
+    with self.assertRaises(IOError):
+      byte_stream_operation.ReadArrayFrom(None, 1)
+
+    with self.assertRaises(IOError):
+      byte_stream_operation.ReadArrayFrom(b'\x01\x00\x02\x00\x03', 3)
+
+  def testWriteTo(self):
+    """Tests the WriteTo function."""
+    byte_stream_operation = runtime.StructOperation(u'<i')
+
+    byte_stream = bytearray(6)
+    byte_stream_operation.WriteTo(byte_stream, (0x78563412, ), byte_offset=2)
+    self.assertEqual(byte_stream, b'\x00\x00\x12\x34\x56\x78')
+
+    with self.assertRaises(IOError):
+      byte_stream_operation.WriteTo(bytearray(3), (0x78563412, ))
+
+    with self.assertRaises(IOError):
+      byte_stream_operation.WriteTo(bytearray(4), (None, ))
+
 
 class StructureValuesClassFactoryTest(test_lib.BaseTestCase):
   """Structure values class factory tests."""
@@ -153,6 +193,358 @@ class StructureValuesClassFactoryTest(test_lib.BaseTestCase):
         data_type_definition)
     self.assertIsNotNone(structure_values_class)
 
+    structure_values = structure_values_class(x=1, y=2, z=3)
+    self.assertEqual(structure_values.x, 1)
+    self.assertFalse(hasattr(structure_values, u'__dict__'))
+
+    structure_values.x = 4
+    self.assertEqual(structure_values.x, 4)
+
+    structure_values_class = runtime.StructureValuesClassFactory.CreateClass(
+        data_type_definition, named_tuple=True)
+    self.assertIsNotNone(structure_values_class)
+
+    structure_values = structure_values_class(x=1, y=2, z=3)
+    self.assertEqual(structure_values, (1, 2, 3))
+    self.assertEqual(structure_values.x, 1)
+    self.assertEqual(structure_values.z, 3)
+    self.assertFalse(hasattr(structure_values, u'__dict__'))
+
+    with self.assertRaises(AttributeError):
+      structure_values.x = 4
+
+
+@test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+class NumPyDataTypeFactoryTest(test_lib.BaseTestCase):
+  """NumPy data type factory tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetDataTypeDescription(self):
+    """Tests the _GetDataTypeDescription function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'int32')
+
+    description = runtime.NumPyDataTypeFactory._GetDataTypeDescription(
+        data_type_definition, definitions.BYTE_ORDER_LITTLE_ENDIAN)
+    self.assertEqual(description, (u'<i4', ()))
+
+    data_type_definition.byte_order = definitions.BYTE_ORDER_BIG_ENDIAN
+
+    description = runtime.NumPyDataTypeFactory._GetDataTypeDescription(
+        data_type_definition, definitions.BYTE_ORDER_LITTLE_ENDIAN)
+    self.assertEqual(description, (u'>i4', ()))
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'box3d')
+    member_definition = data_type_definition.members[0]
+
+    description = runtime.NumPyDataTypeFactory._GetDataTypeDescription(
+        member_definition, definitions.BYTE_ORDER_NATIVE)
+    self.assertEqual(description[1], (12, ))
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    member_definition = data_type_definition.members[1]
+
+    with self.assertRaises(errors.FormatError):
+      runtime.NumPyDataTypeFactory._GetDataTypeDescription(
+          member_definition, definitions.BYTE_ORDER_NATIVE)
+
+  def testGetStructureDataTypeDescription(self):
+    """Tests the _GetStructureDataTypeDescription function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+
+    description = (
+        runtime.NumPyDataTypeFactory._GetStructureDataTypeDescription(
+            data_type_definition, definitions.BYTE_ORDER_LITTLE_ENDIAN))
+
+    expected_point3d_description = [
+        (u'x', u'<i4'), (u'y', u'<i4'), (u'z', u'<i4')]
+    expected_description = [
+        (u'a', expected_point3d_description),
+        (u'b', expected_point3d_description),
+        (u'c', expected_point3d_description)]
+
+    self.assertEqual(description, expected_description)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+
+    with self.assertRaises(errors.FormatError):
+      runtime.NumPyDataTypeFactory._GetStructureDataTypeDescription(
+          data_type_definition, definitions.BYTE_ORDER_NATIVE)
+
+  def testCreateDataType(self):
+    """Tests the CreateDataType function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+
+    if not runtime.numpy:
+      with self.assertRaises(errors.FormatError):
+        runtime.NumPyDataTypeFactory.CreateDataType(data_type_definition)
+
+      return
+
+    numpy_data_type = runtime.NumPyDataTypeFactory.CreateDataType(
+        data_type_definition)
+    self.assertEqual(numpy_data_type.itemsize, 36)
+    self.assertEqual(numpy_data_type.names, (u'a', u'b', u'c'))
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'int32')
+
+    with self.assertRaises(errors.FormatError):
+      runtime.NumPyDataTypeFactory.CreateDataType(data_type_definition)
+
+
+@test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+class StructureMapFunctionFactoryTest(test_lib.BaseTestCase):
+  """Structure map function factory tests."""
+
+  # pylint: disable=protected-access
+
+  def testCreateFunctionBody(self):
+    """Tests the _CreateFunctionBody function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'<', namespace)
+
+    expected_function_body = [
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset)',
+        u'  if context:',
+        u'    context.byte_size = 12',
+        (u'  return structure_values_class(values_0[0], values_0[1], '
+         u'values_0[2])')]
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertEqual(namespace[u'struct_0'].format, u'<iii')
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'<', namespace)
+
+    expected_function_body = [
+        u'  structure_values = structure_values_class()',
+        u'  subcontext = DataTypeMapContext(values={',
+        u'      u\'sphere3d\': structure_values})',
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset)',
+        u'  structure_values.number_of_triangles = values_0[0]',
+        u'  structure_values.triangles = map_byte_stream_1(',
+        u'      byte_stream, byte_offset=byte_offset + 4, context=subcontext)',
+        u'  member_offset = byte_offset + 4 + subcontext.byte_size',
+        u'  if context:',
+        u'    context.byte_size = member_offset - byte_offset',
+        u'  return structure_values']
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertIn(u'map_byte_stream_1', namespace)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'=', namespace)
+
+    expected_function_body = [
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset)',
+        u'  if context:',
+        u'    context.byte_size = 36',
+        (u'  return structure_values_class(structure_values_class_0('
+         u'values_0[0], values_0[1], values_0[2]), structure_values_class_1('
+         u'values_0[3], values_0[4], values_0[5]), structure_values_class_2('
+         u'values_0[6], values_0[7], values_0[8]))')]
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertEqual(namespace[u'struct_0'].format, u'<iiiiiiiii')
+    self.assertIn(u'structure_values_class_0', namespace)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testCreateFunctionBodyWithSequence(self):
+    """Tests the _CreateFunctionBody function with sequence members."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'file_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'<', namespace)
+
+    expected_function_body = [
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset)',
+        u'  if context:',
+        u'    context.byte_size = 16',
+        (u'  return structure_values_class(values_0[0], values_0[1], '
+         u'values_0[2:4])')]
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertEqual(namespace[u'struct_0'].format, u'<4sI2I')
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testCreateFunctionBodyWithMemberNames(self):
+    """Tests the _CreateFunctionBody function with member names."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'file_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'<', namespace,
+        member_names=[u'offsets'])
+
+    expected_function_body = [
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset + 8)',
+        u'  if context:',
+        u'    context.byte_size = 16',
+        u'  return structure_values_class(None, None, values_0[0:2])']
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertEqual(namespace[u'struct_0'].format, u'<2I')
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'<', namespace,
+        member_names=[u'signature', u'offsets'])
+
+    expected_function_body = [
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset)',
+        u'  if context:',
+        u'    context.byte_size = 16',
+        u'  return structure_values_class(values_0[0], None, values_0[1:3])']
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertEqual(namespace[u'struct_0'].format, u'<4s4x2I')
+
+    with self.assertRaises(errors.FormatError):
+      runtime.StructureMapFunctionFactory._CreateFunctionBody(
+          data_type_definition, data_type_map._data_type_maps, u'<', {},
+          member_names=[u'bogus'])
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testCreateFunctionBodyWithMixedByteOrder(self):
+    """Tests the _CreateFunctionBody function with mixed byte-order."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'chunk_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    namespace = {}
+    function_body = runtime.StructureMapFunctionFactory._CreateFunctionBody(
+        data_type_definition, data_type_map._data_type_maps, u'<', namespace)
+
+    expected_function_body = [
+        u'  values_0 = struct_0.unpack_from(byte_stream, byte_offset)',
+        u'  values_1 = struct_1.unpack_from(byte_stream, byte_offset + 4)',
+        u'  if context:',
+        u'    context.byte_size = 12',
+        (u'  return structure_values_class(values_0[0], values_1[0], '
+         u'values_1[1])')]
+
+    self.assertEqual(function_body, expected_function_body)
+    self.assertEqual(namespace[u'struct_0'].format, u'>I')
+    self.assertEqual(namespace[u'struct_1'].format, u'<II')
+
+  def testCreateMapByteStreamFunction(self):
+    """Tests the CreateMapByteStreamFunction function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    structure_values_class = runtime.StructureValuesClassFactory.CreateClass(
+        data_type_definition)
+
+    map_byte_stream = (
+        runtime.StructureMapFunctionFactory.CreateMapByteStreamFunction(
+            data_type_definition, data_type_map._data_type_maps,
+            structure_values_class, u'<'))
+
+    context = runtime.DataTypeMapContext()
+    point3d = map_byte_stream(
+        b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00', 0, context)
+    self.assertIsInstance(point3d, structure_values_class)
+    self.assertEqual(point3d.x, 1)
+    self.assertEqual(point3d.y, 2)
+    self.assertEqual(point3d.z, 3)
+    self.assertEqual(context.byte_size, 12)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testCreateMapMemberFunction(self):
+    """Tests the CreateMapMemberFunction function."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'chunk_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    map_member = runtime.StructureMapFunctionFactory.CreateMapMemberFunction(
+        data_type_definition, data_type_map._data_type_maps, u'<', u'offset')
+
+    byte_stream = b''.join([
+        struct.pack(u'>I', 0x52494646), struct.pack(u'<II', 32, 64)])
+
+    context = runtime.DataTypeMapContext()
+    value = map_member(byte_stream, 0, context)
+    self.assertEqual(value, 64)
+    self.assertEqual(context.byte_size, 4)
+
+    map_member = runtime.StructureMapFunctionFactory.CreateMapMemberFunction(
+        data_type_definition, data_type_map._data_type_maps, u'<',
+        u'signature')
+
+    value = map_member(byte_stream, 0, None)
+    self.assertEqual(value, 0x52494646)
+
+    with self.assertRaises(errors.FormatError):
+      runtime.StructureMapFunctionFactory.CreateMapMemberFunction(
+          data_type_definition, data_type_map._data_type_maps, u'<', u'bogus')
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'extension_block')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    map_member = runtime.StructureMapFunctionFactory.CreateMapMemberFunction(
+        data_type_definition, data_type_map._data_type_maps, u'=', u'data')
+    self.assertIsNone(map_member)
+
 
 class DataTypeMapContextTest(test_lib.BaseTestCase):
   """Data type map context tests."""
@@ -163,6 +555,77 @@ class DataTypeMapContextTest(test_lib.BaseTestCase):
     self.assertIsNotNone(data_type_map_context)
 
 
+@test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+class LazyStructureValuesTest(test_lib.BaseTestCase):
+  """Lazy structure values tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetAttr(self):
+    """Tests the __getattr__ function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    lazy_structure_values = runtime.LazyStructureValues(
+        data_type_map, b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00', 0)
+    self.assertEqual(lazy_structure_values._values, {})
+
+    self.assertEqual(lazy_structure_values.y, 2)
+    self.assertEqual(lazy_structure_values._values, {u'y': 2})
+
+    self.assertEqual(lazy_structure_values.y, 2)
+    self.assertEqual(lazy_structure_values.z, 3)
+
+    # A cached value of None is not mapped again.
+    lazy_structure_values._values[u'x'] = None
+    self.assertIsNone(lazy_structure_values.x)
+
+    with self.assertRaises(AttributeError):
+      getattr(lazy_structure_values, u'bogus')
+
+    self.assertFalse(hasattr(lazy_structure_values, u'__dict__'))
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testGetAttrWithVariableSizeMember(self):
+    """Tests the __getattr__ function with a variable-size member."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'tagged_values')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    map_byte_stream_calls = []
+    map_byte_stream = data_type_map.MapByteStream
+
+    def _MapByteStream(*args, **kwargs):
+      """Maps the data type on a byte stream and tracks the call."""
+      map_byte_stream_calls.append(kwargs.get(u'members', None))
+      return map_byte_stream(*args, **kwargs)
+
+    data_type_map.MapByteStream = _MapByteStream
+
+    byte_stream = struct.pack(u'<iiiii', 2, 7, 8, 9, 10)
+    lazy_structure_values = runtime.LazyStructureValues(
+        data_type_map, byte_stream, 0)
+
+    self.assertEqual(lazy_structure_values.number_of_values, 2)
+    self.assertEqual(map_byte_stream_calls, [])
+
+    self.assertEqual(lazy_structure_values.tag, 9)
+    self.assertEqual(lazy_structure_values.checksum, 10)
+    self.assertEqual(lazy_structure_values.values, (7, 8))
+
+    # The members that follow the variable-size member are mapped together.
+    self.assertEqual(
+        map_byte_stream_calls, [[u'values', u'tag', u'checksum']])
+
+
 @test_lib.skipUnlessHasTestFile([u'integer.yaml'])
 class DataTypeMapTest(test_lib.BaseTestCase):
   """Data type map tests."""
@@ -256,6 +719,104 @@ class PrimitiveDataTypeMapTest(test_lib.BaseTestCase):
     integer_value = data_type_map.MapByteStream(b'\x01\x00\x00\x00')
     self.assertEqual(integer_value, 1)
 
+    integer_value = data_type_map.MapByteStream(
+        b'\xff\x01\x00\x00\x00', byte_offset=1)
+    self.assertEqual(integer_value, 1)
+
+    byte_stream = memoryview(bytearray(b'\xff\x01\x00\x00\x00'))
+    integer_value = data_type_map.MapByteStream(byte_stream, byte_offset=1)
+    self.assertEqual(integer_value, 1)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(b'\xff\x01\x00\x00\x00', byte_offset=2)
+
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream and FoldInto functions."""
+    definitions_file = self._GetTestFilePath([u'integer.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'int32le')
+    data_type_map = runtime.PrimitiveDataTypeMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(1)
+    self.assertEqual(byte_stream, b'\x01\x00\x00\x00')
+
+    byte_stream = bytearray(b'\xff' * 5)
+    byte_size = data_type_map.FoldInto(byte_stream, 1, 1)
+    self.assertEqual(byte_size, 4)
+    self.assertEqual(byte_stream, b'\xff\x01\x00\x00\x00')
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldInto(byte_stream, 2, 1)
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldByteStream(u'bogus')
+
+  def testIterateRecords(self):
+    """Tests the IterateRecords function."""
+    definitions_file = self._GetTestFilePath([u'integer.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'int32le')
+    data_type_map = runtime.PrimitiveDataTypeMap(data_type_definition)
+
+    byte_stream = b''.join([
+        struct.pack(u'<i', value) for value in range(1, 9)])
+
+    values = list(data_type_map.IterateRecords(byte_stream))
+    self.assertEqual(values, [1, 2, 3, 4, 5, 6, 7, 8])
+
+    values = list(data_type_map.IterateRecords(
+        byte_stream, byte_offset=4, number_of_records=3))
+    self.assertEqual(values, [2, 3, 4])
+
+    values = list(data_type_map.IterateRecords(
+        byte_stream, byte_offset=8, until_byte_offset=16))
+    self.assertEqual(values, [3, 4])
+
+    file_object = io.BytesIO(byte_stream)
+    values = list(data_type_map.IterateRecords(file_object, byte_offset=20))
+    self.assertEqual(values, [6, 7, 8])
+
+    with self.assertRaises(errors.MappingError):
+      list(data_type_map.IterateRecords(byte_stream, until_byte_offset=18))
+
+    with self.assertRaises(errors.MappingError):
+      list(data_type_map.IterateRecords(file_object, byte_offset=30))
+
+  def testMapFileObject(self):
+    """Tests the MapFileObject function."""
+    definitions_file = self._GetTestFilePath([u'integer.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'int32le')
+    data_type_map = runtime.PrimitiveDataTypeMap(data_type_definition)
+
+    file_object = io.BytesIO(b'\xff\x01\x00\x00\x00')
+
+    integer_value = data_type_map.MapFileObject(file_object, byte_offset=1)
+    self.assertEqual(integer_value, 1)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapFileObject(file_object, byte_offset=2)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapFileObject(file_object, byte_offset=-1)
+
+    test_file_path = self._GetTestFilePath([u'integer.yaml'])
+    with open(test_file_path, 'rb') as file_object:
+      file_data = file_object.read(8)
+      expected_integer_value = struct.unpack(u'<i', file_data[4:8])[0]
+
+      memory_mapped_file_buffer = buffers.MemoryMappedFileBuffer(file_object)
+      integer_value = data_type_map.MapFileObject(
+          None, byte_offset=4, read_ahead_buffer=memory_mapped_file_buffer)
+      self.assertEqual(integer_value, expected_integer_value)
+      memory_mapped_file_buffer.Close()
+
   def testMapValue(self):
     """Tests the MapValue function."""
     definitions_file = self._GetTestFilePath([u'integer.yaml'])
@@ -286,15 +847,61 @@ class BooleanMapTest(test_lib.BaseTestCase):
     with self.assertRaises(errors.FormatError):
       runtime.BooleanMap(data_type_definition)
 
-  def testMapByteStream(self):
-    """Tests the MapByteStream function."""
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream function."""
     definitions_file = self._GetTestFilePath([u'definitions', u'booleans.yaml'])
     definitions_registry = self._CreateDefinitionRegistryFromFile(
         definitions_file)
 
-    data_type_definition = definitions_registry.GetDefinitionByName(u'bool8')
+    data_type_definition = definitions_registry.GetDefinitionByName(u'bool16')
     data_type_definition.byte_order = definitions.BYTE_ORDER_LITTLE_ENDIAN
-    data_type_map = runtime.BooleanMap(data_type_definition)
+    data_type_definition.false_value = 0
+    data_type_definition.true_value = 1
+    data_type_map = runtime.BooleanMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(False)
+    self.assertEqual(byte_stream, b'\x00\x00')
+
+    byte_stream = data_type_map.FoldByteStream(True)
+    self.assertEqual(byte_stream, b'\x01\x00')
+
+    # Without a True value any value other than the False value is True.
+    data_type_definition.true_value = None
+    data_type_map = runtime.BooleanMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(True)
+    self.assertEqual(byte_stream, b'\x01\x00')
+    self.assertTrue(data_type_map.MapByteStream(byte_stream))
+
+    data_type_definition.false_value = 1
+    data_type_map = runtime.BooleanMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(True)
+    self.assertEqual(byte_stream, b'\x00\x00')
+    self.assertTrue(data_type_map.MapByteStream(byte_stream))
+
+    byte_stream = data_type_map.FoldByteStream(False)
+    self.assertEqual(byte_stream, b'\x01\x00')
+    self.assertFalse(data_type_map.MapByteStream(byte_stream))
+
+    # Without a False value any value other than the True value is False.
+    data_type_definition.false_value = None
+    data_type_definition.true_value = 1
+    data_type_map = runtime.BooleanMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(False)
+    self.assertEqual(byte_stream, b'\x00\x00')
+    self.assertFalse(data_type_map.MapByteStream(byte_stream))
+
+  def testMapByteStream(self):
+    """Tests the MapByteStream function."""
+    definitions_file = self._GetTestFilePath([u'definitions', u'booleans.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'bool8')
+    data_type_definition.byte_order = definitions.BYTE_ORDER_LITTLE_ENDIAN
+    data_type_map = runtime.BooleanMap(data_type_definition)
     data_type_definition.true_value = 1
 
     bool_value = data_type_map.MapByteStream(b'\x00')
@@ -337,6 +944,20 @@ class BooleanMapTest(test_lib.BaseTestCase):
 class CharacterMapTest(test_lib.BaseTestCase):
   """Character map tests."""
 
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream function."""
+    definitions_file = self._GetTestFilePath([
+        u'definitions', u'characters.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'wchar16')
+    data_type_definition.byte_order = definitions.BYTE_ORDER_LITTLE_ENDIAN
+    data_type_map = runtime.CharacterMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(u'\u24b6')
+    self.assertEqual(byte_stream, b'\xb6\x24')
+
   def testMapByteStream(self):
     """Tests the MapByteStream function."""
     definitions_file = self._GetTestFilePath([
@@ -369,6 +990,240 @@ class CharacterMapTest(test_lib.BaseTestCase):
       data_type_map.MapByteStream(b'\xb6\x24')
 
 
+@test_lib.skipUnlessHasTestFile([u'enumeration.yaml'])
+class EnumerationMapTest(test_lib.BaseTestCase):
+  """Enumeration map tests."""
+
+  def _CreateEnumerationMap(
+      self, filename=u'enumeration.yaml',
+      definition_name=u'object_information_type'):
+    """Creates an enumeration map for testing.
+
+    Args:
+      filename (Optional[str]): name of the test definitions file.
+      definition_name (Optional[str]): name of the enumeration definition.
+
+    Returns:
+      EnumerationMap: enumeration map.
+    """
+    definitions_file = self._GetTestFilePath([filename])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        definition_name)
+    return runtime.EnumerationMap(data_type_definition)
+
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream function."""
+    data_type_map = self._CreateEnumerationMap()
+
+    enumeration_value = data_type_map.MapValue(4)
+    byte_stream = data_type_map.FoldByteStream(enumeration_value)
+    self.assertEqual(byte_stream, b'\x04\x00\x00\x00')
+
+    byte_stream = data_type_map.FoldByteStream(u'MiniMutantInformation2')
+    self.assertEqual(byte_stream, b'\x03\x00\x00\x00')
+
+    byte_stream = data_type_map.FoldByteStream(5)
+    self.assertEqual(byte_stream, b'\x05\x00\x00\x00')
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldByteStream(u'bogus')
+
+  def testGetName(self):
+    """Tests the GetName function."""
+    data_type_map = self._CreateEnumerationMap()
+
+    name = data_type_map.GetName(1)
+    self.assertEqual(name, u'MiniThreadInformation1')
+
+    name = data_type_map.GetName(99)
+    self.assertIsNone(name)
+
+  def testGetValue(self):
+    """Tests the GetValue function."""
+    data_type_map = self._CreateEnumerationMap()
+
+    value = data_type_map.GetValue(u'MiniProcessInformation1')
+    self.assertEqual(value, 4)
+
+    value = data_type_map.GetValue(u'bogus')
+    self.assertIsNone(value)
+
+  def testMapByteStream(self):
+    """Tests the MapByteStream function."""
+    data_type_map = self._CreateEnumerationMap()
+
+    enumeration_value = data_type_map.MapByteStream(b'\x02\x00\x00\x00')
+    self.assertEqual(enumeration_value.name, u'MiniMutantInformation1')
+    self.assertEqual(enumeration_value.value, 2)
+
+    # A value that is not defined by the enumeration is mapped as-is.
+    enumeration_value = data_type_map.MapByteStream(b'\x63\x00\x00\x00')
+    self.assertEqual(enumeration_value, 0x63)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(b'\x02\x00')
+
+  def testMapByteStreamArray(self):
+    """Tests the MapByteStreamArray function."""
+    data_type_map = self._CreateEnumerationMap()
+
+    byte_stream = b'\x01\x00\x00\x00\x05\x00\x00\x00\x00\x00\x00\x00'
+    context = runtime.DataTypeMapContext()
+    enumeration_values = data_type_map.MapByteStreamArray(
+        byte_stream, context=context)
+    self.assertEqual(
+        [enumeration_value.name for enumeration_value in enumeration_values],
+        [u'MiniThreadInformation1', u'MiniProcessInformation2',
+         u'MiniHandleObjectInformationNone'])
+    self.assertEqual(context.byte_size, 12)
+
+    enumeration_values = data_type_map.MapByteStreamArray(
+        byte_stream, byte_offset=4, number_of_elements=1)
+    self.assertEqual(len(enumeration_values), 1)
+    self.assertEqual(enumeration_values[0].value, 5)
+
+    enumeration_values = data_type_map.MapByteStreamArray(
+        b'\x63\x00\x00\x00\x05\x00\x00\x00')
+    self.assertEqual(enumeration_values[0], 0x63)
+    self.assertEqual(enumeration_values[1].value, 5)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamArray(
+          byte_stream, byte_offset=4, number_of_elements=3)
+
+  def testMapByteStreamWithSequence(self):
+    """Tests the MapByteStream function with a sequence of values."""
+    definitions_file = self._GetTestFilePath([u'enumeration.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    element_data_type_definition = definitions_registry.GetDefinitionByName(
+        u'object_information_type')
+    data_type_definition = data_types.SequenceDefinition(
+        u'object_information_types', element_data_type_definition)
+    data_type_definition.number_of_elements = 2
+    data_type_map = runtime.SequenceMap(data_type_definition)
+
+    byte_stream = b'\x03\x00\x00\x00\x01\x00\x00\x00'
+    enumeration_values = data_type_map.MapByteStream(byte_stream)
+    self.assertEqual(
+        [enumeration_value.name for enumeration_value in enumeration_values],
+        [u'MiniMutantInformation2', u'MiniThreadInformation1'])
+
+    folded_byte_stream = data_type_map.FoldByteStream(enumeration_values)
+    self.assertEqual(folded_byte_stream, byte_stream)
+
+    # A value that is not defined by the enumeration does not prevent mapping
+    # the sequence.
+    byte_stream = b'\x03\x00\x00\x00\x63\x00\x00\x00'
+    enumeration_values = data_type_map.MapByteStream(byte_stream)
+    self.assertEqual(enumeration_values[0].value, 3)
+    self.assertEqual(enumeration_values[1], 0x63)
+
+    folded_byte_stream = data_type_map.FoldByteStream(enumeration_values)
+    self.assertEqual(folded_byte_stream, byte_stream)
+
+  @test_lib.skipUnlessHasTestFile([u'flags.yaml'])
+  def testMapFlags(self):
+    """Tests the MapFlags function."""
+    data_type_map = self._CreateEnumerationMap(u'flags.yaml', u'file_flags')
+
+    names = data_type_map.MapFlags(0x00000105)
+    self.assertEqual(names, frozenset([
+        u'MiniDumpWithDataSegs', u'MiniDumpWithHandleData',
+        u'MiniDumpWithProcessThreadData']))
+
+    names = data_type_map.MapFlags(0)
+    self.assertEqual(names, frozenset())
+
+    # A flag with bits in multiple bytes is only set if all its bits are set.
+    names = data_type_map.MapFlags(0x001fffff)
+    self.assertEqual(len(names), 6)
+    self.assertIn(u'MiniDumpValidTypeFlags', names)
+
+    names = data_type_map.MapFlags(0x0010ffff)
+    self.assertNotIn(u'MiniDumpValidTypeFlags', names)
+    self.assertIn(u'MiniDumpFilterTriage', names)
+
+  def testMapFlagsWithoutByteSize(self):
+    """Tests the MapFlags function without a byte size."""
+    data_type_definition = data_types.EnumerationDefinition(u'flags')
+    data_type_definition.AddValue(u'FLAG_NONE', 0)
+    data_type_definition.AddValue(u'FLAG_LOW', 0x00000001)
+    data_type_definition.AddValue(u'FLAG_HIGH', 0x00010000)
+    data_type_definition.AddValue(u'FLAG_BOTH', 0x00010001)
+    data_type_definition.size = 4
+    data_type_definition.units = u'bits'
+
+    data_type_map = runtime.EnumerationMap(data_type_definition)
+
+    names = data_type_map.MapFlags(0x00010001)
+    self.assertEqual(names, frozenset([
+        u'FLAG_BOTH', u'FLAG_HIGH', u'FLAG_LOW']))
+
+    names = data_type_map.MapFlags(0x00010000)
+    self.assertEqual(names, frozenset([u'FLAG_HIGH']))
+
+    names_per_value = data_type_map.MapFlagsValues([0, 1])
+    self.assertEqual(names_per_value, [frozenset(), frozenset([u'FLAG_LOW'])])
+
+  @test_lib.skipUnlessHasTestFile([u'flags.yaml'])
+  def testMapFlagsColumns(self):
+    """Tests the MapFlagsColumns function."""
+    data_type_map = self._CreateEnumerationMap(u'flags.yaml', u'file_flags')
+
+    columns = data_type_map.MapFlagsColumns([0x00000003, 0x00100000, 0])
+    self.assertEqual(len(columns), 6)
+    self.assertNotIn(u'MiniDumpNormal', columns)
+    self.assertEqual(columns[u'MiniDumpWithDataSegs'], [True, False, False])
+    self.assertEqual(columns[u'MiniDumpWithFullMemory'], [True, False, False])
+    self.assertEqual(columns[u'MiniDumpFilterTriage'], [False, True, False])
+    self.assertEqual(columns[u'MiniDumpValidTypeFlags'], [False, False, False])
+
+  @unittest.skipUnless(runtime.numpy, u'missing NumPy support')
+  @test_lib.skipUnlessHasTestFile([u'flags.yaml'])
+  def testMapFlagsColumnsWithNumPy(self):
+    """Tests the MapFlagsColumns function with a NumPy array."""
+    data_type_map = self._CreateEnumerationMap(u'flags.yaml', u'file_flags')
+
+    values = runtime.numpy.array(
+        [0x00000003, 0x00100000, 0], dtype=runtime.numpy.uint32)
+    columns = data_type_map.MapFlagsColumns(values)
+    self.assertEqual(len(columns), 6)
+    self.assertEqual(
+        columns[u'MiniDumpWithDataSegs'].tolist(), [True, False, False])
+    self.assertEqual(
+        columns[u'MiniDumpFilterTriage'].tolist(), [False, True, False])
+
+  @test_lib.skipUnlessHasTestFile([u'flags.yaml'])
+  def testMapFlagsValues(self):
+    """Tests the MapFlagsValues function."""
+    data_type_map = self._CreateEnumerationMap(u'flags.yaml', u'file_flags')
+
+    names_per_value = data_type_map.MapFlagsValues(
+        array.array('I', [0x00000002, 0x00000102]))
+    self.assertEqual(names_per_value, [
+        frozenset([u'MiniDumpWithFullMemory']),
+        frozenset([
+            u'MiniDumpWithFullMemory', u'MiniDumpWithProcessThreadData'])])
+
+  def testMapValues(self):
+    """Tests the MapValues function."""
+    data_type_map = self._CreateEnumerationMap()
+
+    enumeration_values = data_type_map.MapValues(array.array('B', [0, 3]))
+    self.assertEqual(
+        [enumeration_value.name for enumeration_value in enumeration_values],
+        [u'MiniHandleObjectInformationNone', u'MiniMutantInformation2'])
+
+    enumeration_values = data_type_map.MapValues([1, 99])
+    self.assertEqual(enumeration_values[0].value, 1)
+    self.assertEqual(enumeration_values[1], 99)
+
+
 @test_lib.skipUnlessHasTestFile([u'definitions', u'floating-points.yaml'])
 class FloatingPointMapTest(test_lib.BaseTestCase):
   """Floating-point map tests."""
@@ -465,6 +1320,73 @@ class SequenceMapTest(test_lib.BaseTestCase):
     data_type_map = runtime.SequenceMap(data_type_definition)
     self.assertIsNotNone(data_type_map)
 
+    data_type_map = runtime.SequenceMap(
+        data_type_definition,
+        result_type=definitions.SEQUENCE_RESULT_TYPE_ARRAY)
+    self.assertIsNotNone(data_type_map)
+
+    with self.assertRaises(errors.FormatError):
+      runtime.SequenceMap(data_type_definition, result_type=u'bogus')
+
+  def testCompileExpression(self):
+    """Tests the _CompileExpression function."""
+    definitions_file = self._GetTestFilePath([u'sequence.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    data_type_definition = definitions_registry.GetDefinitionByName(u'vector4')
+
+    data_type_map = runtime.SequenceMap(data_type_definition)
+
+    expression = data_type_map._CompileExpression(u'header.size - 4')
+    self.assertIsNotNone(expression)
+
+    with self.assertRaises(errors.FormatError):
+      data_type_map._CompileExpression(u'header.size -')
+
+    with self.assertRaises(errors.FormatError):
+      data_type_map._CompileExpression(u'header.__class__')
+
+    with self.assertRaises(errors.FormatError):
+      data_type_map._CompileExpression(u'_header.size')
+
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream and FoldInto functions."""
+    definitions_file = self._GetTestFilePath([u'sequence.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    data_type_definition = definitions_registry.GetDefinitionByName(u'vector4')
+
+    expected_byte_stream = (
+        b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x04\x00\x00\x00')
+
+    data_type_map = runtime.SequenceMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream((1, 2, 3, 4))
+    self.assertEqual(byte_stream, expected_byte_stream)
+
+    byte_stream = bytearray(20)
+    byte_size = data_type_map.FoldInto(byte_stream, 4, (1, 2, 3, 4))
+    self.assertEqual(byte_size, 16)
+    self.assertEqual(byte_stream[4:], expected_byte_stream)
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldByteStream((1, 2, 3))
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldInto(bytearray(8), 0, (1, 2, 3, 4))
+
+    result_types = [definitions.SEQUENCE_RESULT_TYPE_ARRAY]
+    if hasattr(memoryview, u'cast'):
+      result_types.append(definitions.SEQUENCE_RESULT_TYPE_MEMORYVIEW)
+
+    for result_type in result_types:
+      data_type_map = runtime.SequenceMap(
+          data_type_definition, result_type=result_type)
+
+      sequence_value = data_type_map.MapByteStream(expected_byte_stream)
+      byte_stream = data_type_map.FoldByteStream(sequence_value)
+      self.assertEqual(byte_stream, expected_byte_stream)
+
   def testGetElementDataTypeDefinition(self):
     """Tests the _GetElementDataTypeDefinition function."""
     definitions_file = self._GetTestFilePath([u'sequence.yaml'])
@@ -498,12 +1420,163 @@ class SequenceMapTest(test_lib.BaseTestCase):
         b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x04\x00\x00\x00')
     self.assertEqual(sequence_value, (1, 2, 3, 4))
 
+    sequence_value = data_type_map.MapByteStream(
+        b'\xff\xff\xff\xff\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+        b'\x04\x00\x00\x00', byte_offset=4)
+    self.assertEqual(sequence_value, (1, 2, 3, 4))
+
     with self.assertRaises(errors.MappingError):
       data_type_map.MapByteStream(None)
 
     with self.assertRaises(errors.MappingError):
       data_type_map.MapByteStream(b'\x12\x34\x56')
 
+  def testMapByteStreamWithArray(self):
+    """Tests the MapByteStream function with an array result type."""
+    definitions_file = self._GetTestFilePath([u'sequence.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    data_type_definition = definitions_registry.GetDefinitionByName(u'vector4')
+
+    data_type_map = runtime.SequenceMap(
+        data_type_definition,
+        result_type=definitions.SEQUENCE_RESULT_TYPE_ARRAY)
+
+    context = runtime.DataTypeMapContext()
+    sequence_value = data_type_map.MapByteStream(
+        b'\xff\xff\xff\xff\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+        b'\x04\x00\x00\x00', byte_offset=4, context=context)
+    self.assertIsInstance(sequence_value, array.array)
+    self.assertEqual(sequence_value.tolist(), [1, 2, 3, 4])
+    self.assertEqual(context.byte_size, 16)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(b'\x12\x34\x56')
+
+    element_data_type_definition = (
+        data_type_definition.element_data_type_definition)
+    element_data_type_definition.byte_order = (
+        definitions.BYTE_ORDER_BIG_ENDIAN)
+
+    data_type_map = runtime.SequenceMap(
+        data_type_definition,
+        result_type=definitions.SEQUENCE_RESULT_TYPE_ARRAY)
+
+    sequence_value = data_type_map.MapByteStream(
+        b'\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x04')
+    self.assertEqual(sequence_value.tolist(), [1, 2, 3, 4])
+
+  def testMapByteStreamWithMemoryView(self):
+    """Tests the MapByteStream function with a memoryview result type."""
+    definitions_file = self._GetTestFilePath([u'sequence.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    data_type_definition = definitions_registry.GetDefinitionByName(u'vector4')
+
+    element_data_type_definition = (
+        data_type_definition.element_data_type_definition)
+    element_data_type_definition.byte_order = definitions.BYTE_ORDER_NATIVE
+
+    if not hasattr(memoryview, u'cast'):
+      with self.assertRaises(errors.FormatError):
+        runtime.SequenceMap(
+            data_type_definition,
+            result_type=definitions.SEQUENCE_RESULT_TYPE_MEMORYVIEW)
+      return
+
+    data_type_map = runtime.SequenceMap(
+        data_type_definition,
+        result_type=definitions.SEQUENCE_RESULT_TYPE_MEMORYVIEW)
+
+    byte_stream = bytearray(struct.pack(u'=4i', 1, 2, 3, 4))
+    sequence_value = data_type_map.MapByteStream(byte_stream)
+    self.assertIsInstance(sequence_value, memoryview)
+    self.assertEqual(sequence_value.tolist(), [1, 2, 3, 4])
+
+    # The memoryview does not copy the byte stream.
+    byte_stream[0:4] = struct.pack(u'=i', 5)
+    self.assertEqual(sequence_value[0], 5)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testMapByteStreamWithBytes(self):
+    """Tests the MapByteStream function with byte elements."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    element_data_type_definition = definitions_registry.GetDefinitionByName(
+        u'byte')
+
+    data_type_definition = data_types.SequenceDefinition(
+        u'byte_sequence', element_data_type_definition, data_type=u'byte')
+    data_type_definition.number_of_elements = 4
+
+    data_type_map = runtime.SequenceMap(data_type_definition)
+
+    byte_stream = bytearray(b'\xff\x01\x02\x03\x04')
+
+    context = runtime.DataTypeMapContext()
+    sequence_value = data_type_map.MapByteStream(
+        byte_stream, byte_offset=1, context=context)
+    self.assertEqual(sequence_value, b'\x01\x02\x03\x04')
+    self.assertEqual(context.byte_size, 4)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(byte_stream, byte_offset=2)
+
+    if hasattr(memoryview, u'cast'):
+      data_type_map = runtime.SequenceMap(
+          data_type_definition,
+          result_type=definitions.SEQUENCE_RESULT_TYPE_MEMORYVIEW)
+
+      sequence_value = data_type_map.MapByteStream(byte_stream, byte_offset=1)
+      self.assertIsInstance(sequence_value, memoryview)
+      self.assertEqual(sequence_value.tobytes(), b'\x01\x02\x03\x04')
+
+    data_type_map = runtime.SequenceMap(
+        data_type_definition,
+        result_type=definitions.SEQUENCE_RESULT_TYPE_TUPLE)
+
+    sequence_value = data_type_map.MapByteStream(byte_stream, byte_offset=1)
+    self.assertEqual(sequence_value, (1, 2, 3, 4))
+
+    definitions_file = self._GetTestFilePath([u'sequence.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    data_type_definition = definitions_registry.GetDefinitionByName(u'vector4')
+
+    with self.assertRaises(errors.FormatError):
+      runtime.SequenceMap(
+          data_type_definition,
+          result_type=definitions.SEQUENCE_RESULT_TYPE_BYTES)
+
+  def testMapByteStreamArray(self):
+    """Tests the MapByteStreamArray function."""
+    definitions_file = self._GetTestFilePath([u'sequence.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+    data_type_definition = definitions_registry.GetDefinitionByName(u'vector4')
+
+    data_type_map = runtime.SequenceMap(data_type_definition)
+
+    byte_values = []
+    for value in range(1, 9):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    context = runtime.DataTypeMapContext()
+    sequence_values = data_type_map.MapByteStreamArray(
+        byte_stream, context=context)
+    self.assertEqual(sequence_values, [(1, 2, 3, 4), (5, 6, 7, 8)])
+    self.assertEqual(context.byte_size, 32)
+
+    sequence_values = data_type_map.MapByteStreamArray(
+        byte_stream, byte_offset=16, number_of_elements=1)
+    self.assertEqual(sequence_values, [(5, 6, 7, 8)])
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamArray(byte_stream, number_of_elements=3)
+
 
 class StructureMapTest(test_lib.BaseTestCase):
   """Structure map tests."""
@@ -582,6 +1655,74 @@ class StructureMapTest(test_lib.BaseTestCase):
       data_type_map._GetByteStreamOperation(data_type_definition)
 
   @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream and FoldInto functions."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    expected_byte_stream = struct.pack(u'<iii', 1, 2, 3)
+
+    point3d = data_type_map.MapByteStream(expected_byte_stream)
+    byte_stream = data_type_map.FoldByteStream(point3d)
+    self.assertEqual(byte_stream, expected_byte_stream)
+
+    byte_stream = bytearray(14)
+    byte_size = data_type_map.FoldInto(byte_stream, 2, point3d)
+    self.assertEqual(byte_size, 12)
+    self.assertEqual(byte_stream[2:], expected_byte_stream)
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldInto(bytearray(8), 0, point3d)
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldByteStream(None)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [struct.pack(u'<i', 2)]
+    for value in range(2 * 9):
+      byte_values.append(struct.pack(u'<i', value))
+
+    expected_byte_stream = b''.join(byte_values)
+
+    sphere = data_type_map.MapByteStream(expected_byte_stream)
+    byte_stream = data_type_map.FoldByteStream(sphere)
+    self.assertEqual(byte_stream, expected_byte_stream)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testFoldByteStreamWithMixedByteOrder(self):
+    """Tests the FoldByteStream function with mixed byte-order."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'chunk_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    expected_byte_stream = b''.join([
+        struct.pack(u'>I', 0x52494646), struct.pack(u'<II', 32, 64)])
+
+    chunk_header = data_type_map.MapByteStream(expected_byte_stream)
+    byte_stream = data_type_map.FoldByteStream(chunk_header)
+    self.assertEqual(byte_stream, expected_byte_stream)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'file_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    expected_byte_stream = b''.join([
+        b'DTFB', struct.pack(u'<III', 1, 32, 64)])
+
+    file_header = data_type_map.MapByteStream(expected_byte_stream)
+    byte_stream = data_type_map.FoldByteStream(file_header)
+    self.assertEqual(byte_stream, expected_byte_stream)
+
   def testGetMemberDataTypeMaps(self):
     """Tests the _GetMemberDataTypeMaps function."""
     definitions_file = self._GetTestFilePath([u'structure.yaml'])
@@ -624,6 +1765,122 @@ class StructureMapTest(test_lib.BaseTestCase):
     self.assertEqual(named_tuple.y, 2)
     self.assertEqual(named_tuple.z, 3)
 
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapByteStreamArray(self):
+    """Tests the MapByteStreamArray function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [0xff, 0xff, 0xff, 0xff]
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    context = runtime.DataTypeMapContext()
+    points = data_type_map.MapByteStreamArray(
+        byte_stream, byte_offset=4, context=context)
+    self.assertEqual(len(points), 3)
+    self.assertEqual(points[0].x, 1)
+    self.assertEqual(points[2].z, 9)
+    self.assertEqual(context.byte_size, 36)
+
+    points = data_type_map.MapByteStreamArray(
+        byte_stream, byte_offset=16, number_of_elements=1)
+    self.assertEqual(len(points), 1)
+    self.assertEqual(points[0].x, 4)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamArray(byte_stream, number_of_elements=4)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    triangles = data_type_map.MapByteStreamArray(byte_stream, byte_offset=4)
+    self.assertEqual(len(triangles), 1)
+    self.assertEqual(triangles[0].a.x, 1)
+    self.assertEqual(triangles[0].c.z, 9)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamArray(byte_stream)
+
+  @unittest.skipUnless(runtime.numpy, u'missing NumPy support')
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapByteStreamNumPyArray(self):
+    """Tests the MapByteStreamNumPyArray function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [0xff, 0xff, 0xff, 0xff]
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    context = runtime.DataTypeMapContext()
+    points = data_type_map.MapByteStreamNumPyArray(
+        byte_stream, byte_offset=4, context=context)
+    self.assertEqual(len(points), 3)
+    self.assertEqual(points[u'x'].tolist(), [1, 4, 7])
+    self.assertEqual(points[2][u'z'], 9)
+    self.assertEqual(context.byte_size, 36)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamNumPyArray(
+          byte_stream, number_of_elements=4)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamNumPyArray(byte_stream)
+
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapByteStreamWithNamedTuple(self):
+    """Tests the MapByteStream function with named tuple-based values."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition, named_tuple=True)
+
+    byte_stream = b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+
+    point3d = data_type_map.MapByteStream(byte_stream)
+    self.assertEqual(point3d, (1, 2, 3))
+    self.assertEqual(point3d.y, 2)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition, named_tuple=True)
+
+    byte_values = [1, 0, 0, 0]
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    sphere = data_type_map.MapByteStream(byte_stream)
+    self.assertIsInstance(sphere, tuple)
+    self.assertEqual(sphere.number_of_triangles, 1)
+    self.assertEqual(len(sphere.triangles), 1)
+    self.assertEqual(sphere.triangles[0].c.z, 9)
+
   @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
   def testMapByteStreamWithSequence(self):
     """Tests the MapByteStream function with a sequence."""
@@ -646,6 +1903,15 @@ class StructureMapTest(test_lib.BaseTestCase):
     self.assertEqual(box.triangles[0].a.y, 2)
     self.assertEqual(box.triangles[0].a.z, 3)
 
+    context = runtime.DataTypeMapContext()
+    byte_stream = memoryview(b''.join([b'\xff' * 8, byte_stream]))
+
+    box = data_type_map.MapByteStream(
+        byte_stream, byte_offset=8, context=context)
+    self.assertEqual(box.triangles[0].a.x, 1)
+    self.assertEqual(box.triangles[11].c.z, 108)
+    self.assertEqual(context.byte_size, 432)
+
   @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
   def testMapByteStreamWithSequenceWithExpression(self):
     """Tests the MapByteStream function with a sequence with expression."""
@@ -677,6 +1943,148 @@ class StructureMapTest(test_lib.BaseTestCase):
     self.assertEqual(sphere.triangles[0].c.y, 8)
     self.assertEqual(sphere.triangles[0].c.z, 9)
 
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testIterateRecords(self):
+    """Tests the IterateRecords function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = []
+    for number_of_triangles in range(4):
+      byte_values.append(struct.pack(u'<i', number_of_triangles))
+      for value in range(number_of_triangles * 9):
+        byte_values.append(struct.pack(u'<i', value))
+
+    byte_stream = b''.join(byte_values)
+
+    spheres = list(data_type_map.IterateRecords(byte_stream))
+    self.assertEqual(len(spheres), 4)
+    self.assertEqual(
+        [sphere.number_of_triangles for sphere in spheres], [0, 1, 2, 3])
+    self.assertEqual(spheres[3].triangles[2].c.z, 26)
+
+    file_object = io.BytesIO(byte_stream)
+    spheres = list(data_type_map.IterateRecords(
+        file_object, byte_offset=4, number_of_records=2))
+    self.assertEqual(len(spheres), 2)
+    self.assertEqual(spheres[1].number_of_triangles, 2)
+
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapFileObject(self):
+    """Tests the MapFileObject function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    # 4 + 64 * 36 bytes does not fit in the minimum read size.
+    byte_values = [b'\xff\xff', struct.pack(u'<i', 64)]
+    for value in range(64 * 9):
+      byte_values.append(struct.pack(u'<i', value))
+    byte_values.append(b'\xff' * 128)
+
+    file_object = io.BytesIO(b''.join(byte_values))
+    read_ahead_buffer = buffers.ReadAheadBuffer(
+        file_object, read_ahead_size=16)
+
+    context = runtime.DataTypeMapContext()
+    sphere = data_type_map.MapFileObject(
+        None, byte_offset=2, context=context,
+        read_ahead_buffer=read_ahead_buffer)
+    self.assertEqual(sphere.number_of_triangles, 64)
+    self.assertEqual(len(sphere.triangles), 64)
+    self.assertEqual(sphere.triangles[63].c.z, 64 * 9 - 1)
+    self.assertEqual(context.byte_size, 4 + 64 * 36)
+
+    file_object = io.BytesIO(b''.join(byte_values[:-2]))
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapFileObject(file_object, byte_offset=2)
+
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapFileObjectWithCorruptData(self):
+    """Tests the MapFileObject function with corrupt data."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    read_sizes = []
+
+    def _ReadAt(byte_offset, byte_size):
+      """Reads data at a specific offset and tracks the size."""
+      read_sizes.append(byte_size)
+      return read_at(byte_offset, byte_size)
+
+    # More bytes are not read if the number of triangles is invalid or if
+    # the triangles exceed the maximum read size.
+    for number_of_triangles in (-1, 0x7fffffff):
+      byte_stream = b''.join([
+          struct.pack(u'<i', number_of_triangles), b'\x00' * 65536])
+
+      read_ahead_buffer = buffers.ReadAheadBuffer(
+          io.BytesIO(byte_stream), read_ahead_size=1)
+      read_at = read_ahead_buffer.ReadAt
+      read_ahead_buffer.ReadAt = _ReadAt
+
+      with self.assertRaises(errors.MappingError):
+        data_type_map.MapFileObject(None, read_ahead_buffer=read_ahead_buffer)
+
+    self.assertEqual(read_sizes, [4, 4])
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testMapFileObjectWithRequiredByteSize(self):
+    """Tests the MapFileObject function with a required byte size."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'extension_block')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_stream = b''.join([struct.pack(u'<I', 65540), b'\x01' * 65536])
+
+    read_sizes = []
+    read_ahead_buffer = buffers.ReadAheadBuffer(
+        io.BytesIO(byte_stream), read_ahead_size=1)
+    read_at = read_ahead_buffer.ReadAt
+
+    def _ReadAt(byte_offset, byte_size):
+      """Reads data at a specific offset and tracks the size."""
+      read_sizes.append(byte_size)
+      return read_at(byte_offset, byte_size)
+
+    read_ahead_buffer.ReadAt = _ReadAt
+
+    extension_block = data_type_map.MapFileObject(
+        None, read_ahead_buffer=read_ahead_buffer)
+    self.assertEqual(extension_block.size, 65540)
+    self.assertEqual(len(extension_block.data), 65536)
+
+    # The byte size is determined from the size member instead of doubling
+    # the read size until the extension block fits.
+    self.assertEqual(read_sizes, [4, 65540])
+
+    context = runtime.DataTypeMapContext()
+    byte_size = data_type_map._GetRequiredByteSize(byte_stream[:4], 0, context)
+    self.assertEqual(byte_size, 65540)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'point2d_pair')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_size = data_type_map._GetRequiredByteSize(b'', 0, context)
+    self.assertEqual(byte_size, 20)
+
   @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
   def testMapByteStreamWithSequenceWithExpression2(self):
     """Tests the MapByteStream function with a sequence with expression."""
@@ -696,8 +2104,8 @@ class StructureMapTest(test_lib.BaseTestCase):
 
     extension_block = data_type_map.MapByteStream(byte_stream)
     self.assertEqual(extension_block.size, 260)
-    self.assertEqual(extension_block.data[0], 0)
-    self.assertEqual(extension_block.data[-1], 255)
+    self.assertIsInstance(extension_block.data, py2to3.BYTES_TYPE)
+    self.assertEqual(extension_block.data, byte_stream[4:])
 
     byte_values = [3, 0, 0, 0]
     for byte_value in range(0, 256):
@@ -708,11 +2116,261 @@ class StructureMapTest(test_lib.BaseTestCase):
     with self.assertRaises(errors.MappingError):
       data_type_map.MapByteStream(byte_stream)
 
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapByteStreamWithLazy(self):
+    """Tests the MapByteStream function with lazy mapping."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [1, 0, 0, 0]
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    context = runtime.DataTypeMapContext()
+    sphere = data_type_map.MapByteStream(
+        byte_stream, context=context, lazy=True)
+    self.assertIsInstance(sphere, runtime.LazyStructureValues)
+    self.assertIsNone(context.byte_size)
+
+    self.assertEqual(sphere.number_of_triangles, 1)
+    self.assertEqual(len(sphere.triangles), 1)
+    self.assertEqual(sphere.triangles[0].a.x, 1)
+
+    # Members are only mapped when accessed.
+    sphere = data_type_map.MapByteStream(byte_stream[:4], lazy=True)
+    self.assertEqual(sphere.number_of_triangles, 1)
+
+    with self.assertRaises(errors.MappingError):
+      getattr(sphere, u'triangles')
+
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapByteStreamWithMembers(self):
+    """Tests the MapByteStream function with members."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = []
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    context = runtime.DataTypeMapContext()
+    triangle = data_type_map.MapByteStream(
+        byte_stream, context=context, members=[u'c'])
+    self.assertIsNone(triangle.a)
+    self.assertIsNone(triangle.b)
+    self.assertEqual(triangle.c.x, 7)
+    self.assertEqual(triangle.c.z, 9)
+    self.assertEqual(context.byte_size, 36)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(byte_stream, members=[u'bogus'])
+
+    # Members that precede a member with a variable size are always mapped.
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [1, 0, 0, 0]
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    sphere = data_type_map.MapByteStream(
+        byte_stream, members=[u'number_of_triangles'])
+    self.assertEqual(sphere.number_of_triangles, 1)
+    self.assertEqual(len(sphere.triangles), 1)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testMapByteStreamWithMembersAfterComposite(self):
+    """Tests the MapByteStream function with members after composites."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'identified_point')
+
+    byte_stream = struct.pack(u'<3i16si', 1, 2, 3, b'\x00' * 16, 9)
+
+    for named_tuple in (False, True):
+      data_type_map = runtime.StructureMap(
+          data_type_definition, named_tuple=named_tuple)
+
+      identified_point = data_type_map.MapByteStream(
+          byte_stream, members=[u'flags'])
+      self.assertIsNone(identified_point.index)
+      self.assertIsNone(identified_point.point)
+      self.assertIsNone(identified_point.identifier)
+      self.assertEqual(identified_point.flags, 9)
+
+      identified_point = data_type_map.MapByteStream(
+          byte_stream, members=[u'index', u'flags'])
+      self.assertEqual(identified_point.index, 1)
+      self.assertIsNone(identified_point.point)
+      self.assertIsNone(identified_point.identifier)
+      self.assertEqual(identified_point.flags, 9)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'point2d_pair')
+
+    byte_stream = struct.pack(u'<5i', 1, 2, 3, 4, 9)
+
+    for named_tuple in (False, True):
+      data_type_map = runtime.StructureMap(
+          data_type_definition, named_tuple=named_tuple)
+
+      point2d_pair = data_type_map.MapByteStream(
+          byte_stream, members=[u'flags'])
+      self.assertIsNone(point2d_pair.points)
+      self.assertEqual(point2d_pair.flags, 9)
+
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testMapMember(self):
+    """Tests the MapMember function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'triangle3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [0xff] * 4
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    context = runtime.DataTypeMapContext()
+    point = data_type_map.MapMember(
+        byte_stream, u'b', byte_offset=4, context=context)
+    self.assertEqual(point.x, 4)
+    self.assertEqual(point.y, 5)
+    self.assertEqual(point.z, 6)
+    self.assertEqual(context.byte_size, 12)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapMember(byte_stream, u'bogus')
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapMember(byte_stream[:20], u'c')
+
+    # A member with a variable size is mapped together with the members
+    # that precede it.
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = [1, 0, 0, 0]
+    for value in range(1, 10):
+      byte_values.extend([value, 0, 0, 0])
+
+    byte_stream = bytes(bytearray(byte_values))
+
+    triangles = data_type_map.MapMember(byte_stream, u'triangles')
+    self.assertEqual(len(triangles), 1)
+    self.assertEqual(triangles[0].c.z, 9)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testMapByteStreamWithMixedByteOrder(self):
+    """Tests the MapByteStream function with mixed byte-order."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'chunk_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+    self.assertIsNone(data_type_map._operation)
+
+    byte_stream = b''.join([
+        struct.pack(u'>I', 0x52494646), struct.pack(u'<II', 32, 64)])
+
+    chunk_header = data_type_map.MapByteStream(byte_stream)
+    self.assertEqual(chunk_header.signature, 0x52494646)
+    self.assertEqual(chunk_header.size, 32)
+    self.assertEqual(chunk_header.offset, 64)
+
+    chunk_headers = data_type_map.MapByteStreamArray(byte_stream * 2)
+    self.assertEqual(len(chunk_headers), 2)
+    self.assertEqual(chunk_headers[1].signature, 0x52494646)
+
+  @test_lib.skipUnlessHasTestFile([u'structure2.yaml'])
+  def testMapByteStreamWithSequenceWithFixedNumberOfElements(self):
+    """Tests the MapByteStream function with fixed-size sequences."""
+    definitions_file = self._GetTestFilePath([u'structure2.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(
+        u'file_header')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_stream = b''.join([b'MDMP', struct.pack(u'=III', 1, 32, 64)])
+
+    context = runtime.DataTypeMapContext()
+    file_header = data_type_map.MapByteStream(byte_stream, context=context)
+    self.assertEqual(file_header.signature, b'MDMP')
+    self.assertEqual(file_header.format_version, 1)
+    self.assertEqual(file_header.offsets, (32, 64))
+    self.assertEqual(context.byte_size, 16)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(byte_stream[:-1])
+
 
 @test_lib.skipUnlessHasTestFile([u'uuid.yaml'])
 class UUIDMapTest(test_lib.BaseTestCase):
   """UUID map tests."""
 
+  def testFoldByteStream(self):
+    """Tests the FoldByteStream and FoldInto functions."""
+    definitions_file = self._GetTestFilePath([u'uuid.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'uuid')
+    data_type_definition.byte_order = definitions.BYTE_ORDER_LITTLE_ENDIAN
+    data_type_map = runtime.UUIDMap(data_type_definition)
+
+    uuid_value = uuid.UUID(u'{00021401-0000-0000-c000-000000000046}')
+
+    byte_stream = data_type_map.FoldByteStream(uuid_value)
+    self.assertEqual(
+        byte_stream,
+        b'\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46')
+
+    byte_stream = bytearray(17)
+    byte_size = data_type_map.FoldInto(byte_stream, 1, uuid_value)
+    self.assertEqual(byte_size, 16)
+    self.assertEqual(data_type_map.MapByteStream(byte_stream, 1), uuid_value)
+
+    with self.assertRaises(errors.FoldingError):
+      data_type_map.FoldInto(byte_stream, 2, uuid_value)
+
+    data_type_definition.byte_order = definitions.BYTE_ORDER_BIG_ENDIAN
+    data_type_map = runtime.UUIDMap(data_type_definition)
+
+    byte_stream = data_type_map.FoldByteStream(uuid_value)
+    self.assertEqual(
+        byte_stream,
+        b'\x00\x02\x14\x01\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46')
+
   def testMapByteStream(self):
     """Tests the MapByteStream function."""
     definitions_file = self._GetTestFilePath([u'uuid.yaml'])
@@ -728,11 +2386,57 @@ class UUIDMapTest(test_lib.BaseTestCase):
         b'\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46')
     self.assertEqual(uuid_value, expected_uuid_value)
 
+    uuid_value = data_type_map.MapByteStream(
+        b'\xff\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46',
+        byte_offset=1)
+    self.assertEqual(uuid_value, expected_uuid_value)
+
+    data_type_definition.byte_order = definitions.BYTE_ORDER_BIG_ENDIAN
+    data_type_map = runtime.UUIDMap(data_type_definition)
+
+    uuid_value = data_type_map.MapByteStream(
+        b'\x00\x02\x14\x01\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46')
+    self.assertEqual(uuid_value, expected_uuid_value)
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStream(b'\x00\x02\x14\x01')
+
+  def testMapByteStreamArray(self):
+    """Tests the MapByteStreamArray function."""
+    definitions_file = self._GetTestFilePath([u'uuid.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'uuid')
+    data_type_definition.byte_order = definitions.BYTE_ORDER_LITTLE_ENDIAN
+    data_type_map = runtime.UUIDMap(data_type_definition)
+
+    expected_uuid_values = [
+        uuid.UUID(u'{00021401-0000-0000-c000-000000000046}'),
+        uuid.UUID(u'{00021401-0000-0000-c000-000000000047}')]
+    byte_stream = b''.join([
+        uuid_value.bytes_le for uuid_value in expected_uuid_values])
+
+    context = runtime.DataTypeMapContext()
+    uuid_values = data_type_map.MapByteStreamArray(
+        b'\xff' + byte_stream, byte_offset=1, context=context)
+    self.assertEqual(uuid_values, expected_uuid_values)
+    self.assertEqual(context.byte_size, 32)
+
+    uuid_values = data_type_map.MapByteStreamArray(
+        byte_stream, number_of_elements=1)
+    self.assertEqual(uuid_values, expected_uuid_values[:1])
+
+    with self.assertRaises(errors.MappingError):
+      data_type_map.MapByteStreamArray(byte_stream, number_of_elements=3)
+
 
 @test_lib.skipUnlessHasTestFile([u'integer.yaml'])
 class DataTypeMapFactoryTest(test_lib.BaseTestCase):
   """Data type map factory tests."""
 
+  # pylint: disable=protected-access
+
   def testCreateDataTypeMap(self):
     """Tests the CreateDataTypeMap function."""
     definitions_file = self._GetTestFilePath([u'integer.yaml'])
@@ -753,6 +2457,33 @@ class DataTypeMapFactoryTest(test_lib.BaseTestCase):
     data_type_map = factory.CreateDataTypeMap(u'bogus')
     self.assertIsNone(data_type_map)
 
+  @test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+  def testCreateDataTypeMapWithCache(self):
+    """Tests the CreateDataTypeMap function with cached data type maps."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    factory = runtime.DataTypeMapFactory(definitions_registry)
+
+    point3d_map = factory.CreateDataTypeMap(u'point3d')
+    self.assertIsNotNone(point3d_map)
+
+    data_type_map = factory.CreateDataTypeMap(u'point3d')
+    self.assertIs(data_type_map, point3d_map)
+
+    # The member data type maps are shared between structures.
+    triangle3d_map = factory.CreateDataTypeMap(u'triangle3d')
+    for member_data_type_map in triangle3d_map._data_type_maps:
+      self.assertIs(member_data_type_map, point3d_map)
+
+    # Registering a data type definition invalidates the cache.
+    data_type_definition = EmptyDataTypeDefinition(u'empty')
+    definitions_registry.RegisterDefinition(data_type_definition)
+
+    data_type_map = factory.CreateDataTypeMap(u'point3d')
+    self.assertIsNot(data_type_map, point3d_map)
+
   def testCreateDataTypeMapByType(self):
     """Tests the CreateDataTypeMapByType function."""
     definitions_file = self._GetTestFilePath([u'integer.yaml'])
@@ -769,6 +2500,18 @@ class DataTypeMapFactoryTest(test_lib.BaseTestCase):
         data_type_definition)
     self.assertIsNone(data_type_map)
 
+  @test_lib.skipUnlessHasTestFile([u'enumeration.yaml'])
+  def testCreateDataTypeMapWithEnumeration(self):
+    """Tests the CreateDataTypeMap function with an enumeration."""
+    definitions_file = self._GetTestFilePath([u'enumeration.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    factory = runtime.DataTypeMapFactory(definitions_registry)
+
+    data_type_map = factory.CreateDataTypeMap(u'object_information_type')
+    self.assertIsInstance(data_type_map, runtime.EnumerationMap)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Tests for the writers to fold records into files or memory maps."""
+
+import io
+import struct
+import unittest
+
+from dtfabric import errors
+from dtfabric import runtime
+from dtfabric import writers
+
+from tests import test_lib
+
+
+@test_lib.skipUnlessHasTestFile([u'structure.yaml'])
+class RecordWriterTest(test_lib.BaseTestCase):
+  """Record writer tests."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    record_writer = writers.RecordWriter(data_type_map, io.BytesIO())
+    self.assertIsNotNone(record_writer)
+
+    with self.assertRaises(ValueError):
+      writers.RecordWriter(data_type_map, io.BytesIO(), chunk_size=0)
+
+  def testWriteRecords(self):
+    """Tests the WriteRecords function."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'point3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    expected_byte_stream = struct.pack(u'<9i', 1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+    point3d = data_type_map.MapByteStream(expected_byte_stream, byte_offset=24)
+    records = [(1, 2, 3), {u'x': 4, u'y': 5, u'z': 6}, point3d]
+
+    file_object = io.BytesIO()
+    record_writer = writers.RecordWriter(
+        data_type_map, file_object, chunk_size=30)
+
+    number_of_records = record_writer.WriteRecords(records)
+    self.assertEqual(number_of_records, 3)
+
+    # Chunks contain complete records only, hence 2 records of 12 bytes.
+    self.assertEqual(file_object.getvalue(), expected_byte_stream[:24])
+
+    record_writer.Close()
+    self.assertEqual(file_object.getvalue(), expected_byte_stream)
+
+    with self.assertRaises(errors.FoldingError):
+      record_writer = writers.RecordWriter(data_type_map, io.BytesIO())
+      record_writer.WriteRecords([{u'x': 1, u'y': 2}])
+
+    byte_stream = bytearray(40)
+    record_writer = writers.RecordWriter(
+        data_type_map, byte_stream, byte_offset=4)
+
+    number_of_records = record_writer.WriteRecords(records)
+    self.assertEqual(number_of_records, 3)
+    self.assertEqual(byte_stream[4:], expected_byte_stream)
+
+    with self.assertRaises(errors.FoldingError):
+      record_writer.WriteRecords(records)
+
+    record_writer.Close()
+
+  def testWriteRecordsWithVariableSize(self):
+    """Tests the WriteRecords function with records with a variable size."""
+    definitions_file = self._GetTestFilePath([u'structure.yaml'])
+    definitions_registry = self._CreateDefinitionRegistryFromFile(
+        definitions_file)
+
+    data_type_definition = definitions_registry.GetDefinitionByName(u'sphere3d')
+    data_type_map = runtime.StructureMap(data_type_definition)
+
+    byte_values = []
+    for number_of_triangles in range(4):
+      byte_values.append(struct.pack(u'<i', number_of_triangles))
+      for value in range(number_of_triangles * 9):
+        byte_values.append(struct.pack(u'<i', value))
+
+    expected_byte_stream = b''.join(byte_values)
+
+    records = list(data_type_map.IterateRecords(expected_byte_stream))
+
+    file_object = io.BytesIO()
+    record_writer = writers.RecordWriter(
+        data_type_map, file_object, chunk_size=64)
+
+    number_of_records = record_writer.WriteRecords(records)
+    self.assertEqual(number_of_records, 4)
+
+    record_writer.Close()
+    self.assertEqual(file_object.getvalue(), expected_byte_stream)
+
+
+if __name__ == '__main__':
+  unittest.main()